@@ -0,0 +1,146 @@
+"""
+Shared fixtures for the test suite
+
+The application code lives in web/ and imports itself as `utils.*`, so
+web/ is put on sys.path here, the same way test_latex_capabilities.py does.
+"""
+
+import csv
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+WEB_DIR = Path(__file__).parent.parent / "web"
+sys.path.insert(0, str(WEB_DIR))
+
+from utils.csv_manager import SCHEMAS  # noqa: E402
+
+
+def write_table(data_dir: Path, schema_name: str, rows, subdir: str = None) -> Path:
+    """Write rows (dicts or value lists) to a v2 data directory with the schema header"""
+    if subdir is None:
+        subdir = "core" if schema_name in ("sessions", "answer_keys", "students", "exams") else "transactions"
+    file_path = data_dir / subdir / f"{schema_name}.csv"
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    columns = SCHEMAS[schema_name].columns
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([row.get(col, "") for col in columns] if isinstance(row, dict) else row)
+    return file_path
+
+
+def session_row(session_id: str, question_count: int = 1) -> dict:
+    return {
+        "session_id": session_id, "content_hash": "abc", "question_count": str(question_count),
+        "created_at": "2025-01-01 00:00:00", "expires_at": "2026-12-31 23:59:59",
+        "status": "active", "exam_duration_minutes": "25", "created_by": "test", "version": "2.0",
+    }
+
+
+def answer_key_row(answer_key_id: str, session_id: str, question_index: int) -> dict:
+    return {
+        "answer_key_id": answer_key_id, "session_id": session_id,
+        "question_index": str(question_index), "correct_option": "1", "marks": "1",
+        "created_at": "2025-01-01 00:00:00", "version": "2.0",
+    }
+
+
+def attempt_row(attempt_id: str, session_id: str, student_id: str = "STU1") -> dict:
+    return {
+        "attempt_id": attempt_id, "student_id": student_id, "session_id": session_id,
+        "exam_id": "MIGRATED", "start_time": "2025-01-01 09:00:00", "submit_time": "",
+        "time_taken_seconds": "", "status": "submitted", "ip_address": "unknown",
+        "user_agent": "unknown", "version": "2.0",
+    }
+
+
+def answer_row(answer_id: str, attempt_id: str, question_index: int, selected_option: str = "1") -> dict:
+    return {
+        "answer_id": answer_id, "attempt_id": attempt_id, "question_index": str(question_index),
+        "selected_option": selected_option, "is_correct": "true", "marks_awarded": "1",
+        "answered_at": "2025-01-01 10:00:00", "version": "2.0",
+    }
+
+
+def student_row(student_id: str) -> dict:
+    return {
+        "student_id": student_id, "name": f"Student {student_id}",
+        "email": f"{student_id}@placeholder.com", "institution": "Unknown", "batch": "Unknown",
+        "registration_date": "2025-01-01", "status": "active", "version": "2.0",
+    }
+
+
+@pytest.fixture
+def v2_data(tmp_path) -> Path:
+    """
+    A small v2 data directory with known problems: a duplicate primary key,
+    a bad enum value, a multi-line quoted field, an orphan foreign key and an
+    answer pointing at a question index its session doesn't have
+    """
+    data_dir = tmp_path / "data"
+    (data_dir / "audit").mkdir(parents=True)
+    (data_dir / "schema_version.txt").write_text("2.0")
+
+    write_table(data_dir, "sessions", [session_row(f"session_{i}", 3) for i in range(4)])
+    write_table(data_dir, "answer_keys", [
+        answer_key_row(f"AK{s * 3 + q:06d}", f"session_{s}", q) for s in range(4) for q in range(3)
+    ])
+    write_table(data_dir, "students", [student_row(f"STU{i}") for i in range(20)])
+
+    attempts = [attempt_row(f"ATT{i:06d}", f"session_{i % 4}", f"STU{i % 20}") for i in range(60)]
+    attempts[7]["user_agent"] = "Mozilla/5.0\n(multi-line, \"quoted\")"
+    attempts[12]["status"] = "finished"                      # not an allowed status
+    attempts.append(dict(attempts[3]))                       # duplicate attempt_id
+    attempts.append(attempt_row("ATT999999", "session_9"))   # unknown session
+    write_table(data_dir, "student_sessions", attempts)
+
+    answers = [answer_row(f"ANS{i:08d}", f"ATT{i % 60:06d}", i % 3) for i in range(600)]
+    answers[50]["question_index"] = "7"                      # not in the answer keys
+    answers[51]["selected_option"] = "9"                     # not an allowed option
+    write_table(data_dir, "answers", answers)
+    return data_dir
+
+
+def build_old_layout(web_dir: Path, sessions: int = 3, students: int = 30, questions: int = 10,
+                     generated: bool = True):
+    """
+    Write an old-format (pre-v2) answers/answer_keys/sessions tree under
+    web_dir, plus one question snippet PDF per question in the sibling
+    generated/ directory (unless generated is False)
+    """
+    rng = random.Random(1)
+    options = ["ক", "খ", "গ", "ঘ", "", "x"]
+    for name in ("answers", "answer_keys", "sessions"):
+        (web_dir / name).mkdir(parents=True, exist_ok=True)
+
+    session_rows = []
+    for s in range(sessions):
+        session_id = f"session_{s}"
+        if generated:
+            pdf_dir = web_dir.parent / "generated" / session_id / "pdfs"
+            pdf_dir.mkdir(parents=True, exist_ok=True)
+            for q in range(questions):
+                (pdf_dir / f"snippet_{q}.pdf").write_bytes(b"%PDF-1.4\n")
+        with open(web_dir / "answer_keys" / f"answer_key_{session_id}.csv", 'w',
+                  newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Session_ID", "Answer_Key"])
+            writer.writerow([session_id, "".join(rng.choice("1234") for _ in range(questions))])
+        with open(web_dir / "answers" / f"answers_{session_id}.csv", 'w',
+                  newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Student_ID", "Timestamp"] + [f"Q{i + 1}" for i in range(questions)])
+            for st in range(students):
+                writer.writerow([f"STU{st}", "2025-01-01 10:00:00"]
+                                + [rng.choice(options) for _ in range(questions)])
+                if st % 3:
+                    session_rows.append([f"STU{st}", session_id, "2025-01-01 09:00:00"])
+
+    with open(web_dir / "sessions" / "exam_sessions.csv", 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Student_ID", "Session_ID", "Start_Time"])
+        writer.writerows(session_rows)
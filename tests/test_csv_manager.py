@@ -0,0 +1,398 @@
+"""Tests for web/utils/csv_manager.py"""
+
+import gc
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import weakref
+
+import pytest
+
+from conftest import answer_row, attempt_row, student_row
+
+import utils.csv_manager as csv_manager
+from utils.csv_manager import SCHEMAS, CSVManager, CSVSchema, CSVValidationError
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = CSVManager(tmp_path / "data")
+    yield manager
+    manager.flush_audit()
+
+
+def audit_rows(manager):
+    manager.flush_audit()
+    return manager.read("audit_log")
+
+
+def before_write_backups(manager):
+    return sorted((manager.data_dir / "backups" / "before_write").iterdir())
+
+
+def _try_lock(manager, file_path, results):
+    try:
+        with manager._lock_file(file_path, 'w'):
+            results.put("acquired")
+    except csv_manager.CSVLockError:
+        results.put("locked")
+
+
+def _hold_lock(manager, file_path, held, release):
+    with manager._lock_file(file_path, 'w'):
+        held.set()
+        release.wait(10)
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="needs fork")
+def test_forked_child_does_not_share_the_parents_lock(manager):
+    context = multiprocessing.get_context("fork")
+    file_path = manager.data_dir / "core" / "students.csv"
+    results = context.Queue()
+    manager.lock_timeout = 0.2
+
+    with manager._lock_file(file_path, 'w'):
+        for _ in range(2):  # The first child's unlock must not drop ours
+            child = context.Process(target=_try_lock, args=(manager, file_path, results))
+            child.start()
+            child.join(10)
+            assert results.get(timeout=5) == "locked"
+
+    # The handle opened above is inherited too; the child's lock still excludes us
+    held, release = context.Event(), context.Event()
+    child = context.Process(target=_hold_lock, args=(manager, file_path, held, release))
+    child.start()
+    try:
+        assert held.wait(10)
+        with pytest.raises(csv_manager.CSVLockError):
+            with manager._lock_file(file_path, 'w'):
+                pass
+    finally:
+        release.set()
+        child.join(10)
+
+    with manager._lock_file(file_path, 'w'):
+        pass
+
+
+def test_idle_manager_is_released(tmp_path, monkeypatch):
+    monkeypatch.setattr(CSVManager, "AUDIT_IDLE_TIMEOUT", 0.05)
+    manager = CSVManager(tmp_path / "data")
+    manager.write("students", [student_row("STU1")])
+    assert manager in csv_manager._audit_managers
+
+    thread = manager._audit_thread
+    ref = weakref.ref(manager)
+    del manager
+    thread.join(5)
+    gc.collect()
+
+    assert ref() is None
+    assert len(list(tmp_path.glob("data/audit/audit_log_*.csv"))) == 1
+
+
+def test_exit_hook_flushes_live_managers(tmp_path, monkeypatch):
+    monkeypatch.setattr(CSVManager, "AUDIT_FLUSH_INTERVAL", 5)
+    manager = CSVManager(tmp_path / "data")
+    for i in range(3):
+        manager.write("students", [student_row(f"STU{i}")])
+
+    started = time.monotonic()
+    csv_manager._flush_audit_logs()
+    assert time.monotonic() - started < 4
+    assert [row["entity_id"] for row in manager.read("audit_log")] == ["STU0", "STU1", "STU2"]
+
+
+_forked_manager = None  # Inherited by forked pool workers
+
+
+def _generate_ids(n):
+    manager = _forked_manager
+    ids = [manager.generate_id("SUB") for _ in range(n)] + manager.generate_id_batch("SUB", n)
+    return os.getpid(), ids
+
+
+def test_generated_ids_are_unique_and_ordered(manager):
+    first = manager.generate_id("SUB")
+    batch = manager.generate_id_batch("SUB", 1000)
+    after = manager.generate_id("SUB")
+
+    ids = [first] + batch + [after]
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+    assert all(i.startswith("SUB") and len(i) == len(first) for i in ids)
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="needs fork")
+def test_generated_ids_differ_across_processes(manager, monkeypatch):
+    manager.generate_id("SUB")  # Seed the parent's counter before forking
+    monkeypatch.setattr(sys.modules[__name__], "_forked_manager", manager)
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        results = pool.map(_generate_ids, [500] * 8, chunksize=1)
+
+    ids = [i for _, chunk in results for i in chunk]
+    assert len(set(ids)) == len(ids)
+    # Each process tags its IDs with its own PID
+    for pid, chunk in results:
+        assert {i[-6:] for i in chunk} == {f"{pid:06X}"}
+
+
+def test_read_arrow_matches_read(manager):
+    pa = pytest.importorskip("pyarrow")
+    rows = [answer_row(f"ANS{i}", f"ATT{i % 3}", i % 5) for i in range(20)]
+    manager.write("answers", rows)
+    manager.update_append("answers", "ANS3", {"marks_awarded": "0"})
+
+    table = manager.read_arrow("answers")
+    assert table.column_names == SCHEMAS["answers"].columns
+    assert table.schema.field("question_index").type == pa.int64()
+    assert [row["answer_id"] for row in table.to_pylist()] == [row["answer_id"] for row in rows]
+    assert table.to_pylist()[3]["marks_awarded"] == 0
+
+    subset = manager.read_arrow("answers", columns=["answer_id", "attempt_id"])
+    assert subset.column_names == ["answer_id", "attempt_id"]
+    with pytest.raises(ValueError):
+        manager.read_arrow("answers", columns=["nope"])
+
+
+def test_read_arrow_without_audit_shards(manager):
+    pytest.importorskip("pyarrow")
+    table = manager.read_arrow("audit_log")
+    assert table.num_rows == 0
+    assert table.column_names == SCHEMAS["audit_log"].columns
+
+
+def test_write_and_read_round_trip(manager):
+    rows = [student_row(f"STU{i}") for i in range(5)]
+    assert manager.write("students", rows) == 5
+    assert manager.read("students") == rows
+    assert manager.read_by_id("students", "STU3") == rows[3]
+    assert manager.count("students", lambda row: row["student_id"] > "STU2") == 2
+
+
+def test_write_rejects_invalid_rows(manager):
+    with pytest.raises(CSVValidationError, match="Row 1 validation failed"):
+        manager.write("students", [student_row("STU1"), dict(student_row("STU2"), status="gone")])
+    assert manager.read("students") == []
+
+
+def test_append_stream_writes_and_audits(manager):
+    manager.write("student_sessions", [attempt_row("ATT000000", "s1")])
+
+    with manager.append_stream("student_sessions") as out:
+        out(attempt_row("ATT000001", "s1"))
+        out.write_rows(attempt_row(f"ATT{i:06d}", "s1") for i in range(2, 12000))
+
+    assert out.count == 11999
+    assert manager.count("student_sessions") == 12000
+    assert manager.read_by_id("student_sessions", "ATT011999")["session_id"] == "s1"
+
+    entry = audit_rows(manager)[-1]
+    assert (entry["entity_type"], entry["action"], entry["new_value"]) == (
+        "student_sessions", "create", "11999 rows")
+    assert entry["entity_id"] == "ATT000001,ATT000002,ATT000003"
+
+    # The file as it was before the stream is kept in backups/
+    assert len(before_write_backups(manager)) == 1
+
+
+def test_append_stream_validates(manager):
+    with pytest.raises(CSVValidationError, match="Row 2 validation failed"):
+        with manager.append_stream("student_sessions") as out:
+            out.write_rows([attempt_row("ATT1", "s1"), attempt_row("ATT2", "s1"),
+                            dict(attempt_row("ATT3", "s1"), status="lost")])
+
+
+def test_append_stream_holds_the_file_lock(manager):
+    manager.lock_timeout = 0.2
+    entered = threading.Event()
+    release = threading.Event()
+
+    def stream():
+        with manager.append_stream("students") as out:
+            out(student_row("STU1"))
+            entered.set()
+            release.wait(5)
+
+    writer = threading.Thread(target=stream)
+    writer.start()
+    try:
+        assert entered.wait(5)
+        with pytest.raises(csv_manager.CSVLockError):
+            manager.write("students", [student_row("STU2")])
+    finally:
+        release.set()
+        writer.join()
+
+    manager.write("students", [student_row("STU2")])
+    assert [row["student_id"] for row in manager.read("students")] == ["STU1", "STU2"]
+
+
+def test_backups_are_named_by_content(manager):
+    rows = [student_row("STU1")]
+    manager.write("students", rows)
+    for _ in range(3):
+        manager.write("students", rows, mode='replace')
+
+    # Three replaces of identical content: one backup
+    assert len(before_write_backups(manager)) == 1
+
+    for i in range(2, 20):
+        manager.write("students", [student_row(f"STU{i}")])
+    backups = before_write_backups(manager)
+    assert len(backups) == 10
+
+    # The newest backup holds the content just before the last write
+    newest = max(backups, key=lambda path: path.stat().st_mtime_ns)
+    assert newest.read_text().count("\n") == 1 + 18
+
+
+def test_pk_index_is_validated_json(manager):
+    manager.write("students", [student_row(f"STU{i}") for i in range(50)])
+    assert manager.read_by_id("students", "STU10")["student_id"] == "STU10"
+
+    index_path = manager.data_dir / "core" / ".students.csv.pkidx"
+    data = json.loads(index_path.read_text())
+    assert set(data) == {"header", "pk_pos", "offsets", "end", "tail", "ino", "size", "mtime_ns"}
+    assert CSVManager._load_pk_index(index_path)["offsets"] == data["offsets"]
+
+    # Offsets past the indexed end, wrong types, or non-JSON are all rejected
+    for bad in (dict(data, offsets={"STU1": data["end"] + 1}), dict(data, pk_pos="0"),
+                dict(data, header="student_id")):
+        index_path.write_text(json.dumps(bad))
+        assert CSVManager._load_pk_index(index_path) is None
+    index_path.write_bytes(b"\x80\x04\x95 not json")
+    assert CSVManager._load_pk_index(index_path) is None
+
+    # A rejected index is rebuilt from the file
+    fresh = CSVManager(manager.data_dir)
+    assert fresh.read_by_id("students", "STU49")["student_id"] == "STU49"
+    assert CSVManager._load_pk_index(index_path) is not None
+
+
+def test_pk_index_extends_on_append(manager):
+    manager.write("students", [student_row("STU1")])
+    assert manager.read_by_id("students", "STU1")
+    manager.write("students", [student_row("STU2")])
+    assert manager.read_by_id("students", "STU2")["student_id"] == "STU2"
+
+
+def test_parquet_append_replaces_the_file(tmp_path, monkeypatch):
+    pytest.importorskip("polars")
+    students = SCHEMAS["students"]
+    monkeypatch.setitem(SCHEMAS, "students", CSVSchema(
+        students.name, students.columns, students.primary_key,
+        validators=students.validators, storage_format="parquet"))
+
+    manager = CSVManager(tmp_path / "data")
+    manager.write("students", [student_row("STU1")])
+    file_path = manager.data_dir / "core" / "students.parquet"
+    inode = os.stat(file_path).st_ino
+
+    manager.write("students", [student_row("STU2"), student_row("STU3")])
+
+    assert os.stat(file_path).st_ino != inode
+    assert [row["student_id"] for row in manager.read("students")] == ["STU1", "STU2", "STU3"]
+    assert not list(file_path.parent.glob("*.tmp"))
+    manager.flush_audit()
+
+
+def test_update_and_delete_append_leave_the_main_file(manager):
+    manager.write("students", [student_row(f"STU{i}") for i in range(5)])
+    file_path = manager.data_dir / "core" / "students.csv"
+    original = file_path.read_bytes()
+
+    assert manager.update_append("students", "STU1", {"name": "Renamed"})
+    assert manager.delete_append("students", "STU2")
+    assert not manager.update_append("students", "STU9", {"name": "x"})
+    assert not manager.delete_append("students", "STU2")
+    with pytest.raises(CSVValidationError):
+        manager.update_append("students", "STU3", {"status": "gone"})
+
+    assert file_path.read_bytes() == original
+    assert manager.read_by_id("students", "STU1")["name"] == "Renamed"
+    assert manager.read_by_id("students", "STU2") is None
+    live = manager.read("students")
+    assert [row["student_id"] for row in live] == ["STU0", "STU1", "STU3", "STU4"]
+
+    actions = [(row["entity_id"], row["action"]) for row in audit_rows(manager)]
+    assert actions[-2:] == [("STU1", "update"), ("STU2", "delete")]
+
+    assert manager.compact("students") == 2
+    assert not CSVManager._delta_path(file_path).exists()
+    assert manager.read("students") == live
+    assert b"Renamed" in file_path.read_bytes()
+    assert manager.compact("students") == 0
+
+
+def test_delta_log_compacts_at_threshold(manager):
+    manager.COMPACT_AFTER_DELTAS = 3
+    manager.write("students", [student_row(f"STU{i}") for i in range(5)])
+    delta_path = CSVManager._delta_path(manager.data_dir / "core" / "students.csv")
+
+    manager.update_append("students", "STU0", {"batch": "A"})
+    manager.update_append("students", "STU1", {"batch": "B"})
+    assert delta_path.exists()
+    manager.delete_append("students", "STU4")
+
+    assert not delta_path.exists()
+    assert [row["batch"] for row in manager.read("students")] == ["A", "B", "Unknown", "Unknown"]
+
+
+def test_read_iter_streams_live_rows(manager):
+    manager.write("students", [student_row(f"STU{i}") for i in range(6)])
+    manager.delete_append("students", "STU0")
+
+    rows = manager.read_iter("students", lambda row: row["student_id"] != "STU3")
+    assert next(rows)["student_id"] == "STU1"
+    assert [row["student_id"] for row in rows] == ["STU2", "STU4", "STU5"]
+    assert list(manager.read_iter("students")) == manager.read("students")
+
+
+def test_read_iter_holds_the_read_lock_until_closed(manager):
+    manager.write("students", [student_row("STU1"), student_row("STU2")])
+    manager.lock_timeout = 0.2
+    rows = manager.read_iter("students")
+    next(rows)
+
+    # Another thread can't write while the generator is suspended
+    outcome = []
+
+    def write():
+        try:
+            manager.write("students", [student_row("STU3")])
+            outcome.append("written")
+        except csv_manager.CSVLockError:
+            outcome.append("locked")
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    writer.join(5)
+    assert outcome == ["locked"]
+
+    rows.close()
+    manager.write("students", [student_row("STU3")])
+    assert manager.count("students") == 3
+
+
+def test_export_parquet_mirrors_live_rows(manager):
+    pl = pytest.importorskip("polars")
+    manager.write("students", [student_row(f"STU{i}") for i in range(4)])
+    manager.update_append("students", "STU1", {"name": "Renamed"})
+
+    mirror = manager.export_parquet("students")
+    assert mirror == manager.data_dir / "analytics" / "students.parquet"
+    assert pl.read_parquet(mirror).to_dicts() == manager.read("students")
+
+    # Unchanged sources: the mirror is reused as is
+    mtime = mirror.stat().st_mtime_ns
+    inode = mirror.stat().st_ino
+    assert manager.export_parquet("students") == mirror
+    assert (mirror.stat().st_mtime_ns, mirror.stat().st_ino) == (mtime, inode)
+
+    manager.delete_append("students", "STU0")
+    assert [row["student_id"] for row in pl.read_parquet(manager.export_parquet("students")).to_dicts()] == [
+        "STU1", "STU2", "STU3"]
@@ -0,0 +1,139 @@
+"""Tests for web/utils/csv_normalized.py"""
+
+import csv
+import multiprocessing
+import sys
+import threading
+
+import pytest
+
+import utils.csv_normalized as csv_normalized
+from utils.csv_normalized import NormalizedCSVDB, _Index, _allocate_ids, _load_index
+
+
+def write_submissions(file_path, rows, mode='w'):
+    with open(file_path, mode, newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        if mode == 'w':
+            writer.writerow(csv_normalized.SUBMISSIONS_FIELDS)
+        for submission_id, exam_id, student_id in rows:
+            writer.writerow([submission_id, exam_id, student_id, "t", "1", "1", "", "", "", "completed"])
+
+
+def students(rows):
+    return [row["student_id"] for row in rows]
+
+
+def test_index_extends_on_append(tmp_path):
+    file_path = tmp_path / "submissions.csv"
+    write_submissions(file_path, [("1", "EX1", "STU1"), ("2", "EX2", "STU2")])
+    index = _Index(file_path, {"exam_id": ("exam_id",)}, id_column="submission_id")
+    assert students(index.find("exam_id", "EX1")) == ["STU1"]
+    end = index.end
+
+    write_submissions(file_path, [("3", "EX1", "STU3")], mode='a')
+    assert students(index.find("exam_id", "EX1")) == ["STU1", "STU3"]
+    assert index.max_id == 3
+    # Only the appended bytes were scanned; rows parsed before are kept
+    assert min(index.offsets["exam_id"][("EX1",)][1:]) >= end
+    assert len(index.rows) == 2
+
+
+def test_index_rebuilds_after_rewrite_in_place(tmp_path):
+    file_path = tmp_path / "submissions.csv"
+    write_submissions(file_path, [("1", "EX1", "STU1")])
+    index = _Index(file_path, {"exam_id": ("exam_id",)}, id_column="submission_id")
+    assert students(index.find("exam_id", "EX1")) == ["STU1"]
+
+    # Same inode, larger file, different bytes under the indexed range
+    write_submissions(file_path, [("7", "EX2", "STU2"), ("8", "EX2", "STU3")])
+    assert index.find("exam_id", "EX1") == []
+    assert students(index.find("exam_id", "EX2")) == ["STU2", "STU3"]
+    assert index.max_id == 8
+
+
+def submissions_index(file_path):
+    return _load_index(file_path, {"exam_id": ("exam_id",)}, id_column="submission_id")
+
+
+def allocate_many(file_path, rounds):
+    """Allocate 1-3 IDs `rounds` times; returns the IDs handed out"""
+    index = submissions_index(file_path)
+    ids = []
+    for i in range(rounds):
+        count = i % 3 + 1
+        first = _allocate_ids(index, count)
+        ids.extend(range(first, first + count))
+    return ids
+
+
+def test_allocate_ids_continues_from_the_file(tmp_path):
+    file_path = tmp_path / "submissions.csv"
+    file_path.write_text(",".join(csv_normalized.SUBMISSIONS_FIELDS) + "\n"
+                         "41,EX1,STU1,t,1,1,,,,completed\n")
+    index = submissions_index(file_path)
+
+    assert _allocate_ids(index, 3) == 42
+    assert _allocate_ids(index, 1) == 45
+    assert (tmp_path / ".submissions.csv.nextid").read_text() == "45"
+
+
+def test_allocate_ids_is_unique_across_threads(tmp_path):
+    file_path = tmp_path / "submissions.csv"
+    results = []
+
+    def worker():
+        results.append(allocate_many(file_path, 50))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ids = [i for chunk in results for i in chunk]
+    assert sorted(ids) == list(range(1, len(ids) + 1))
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="needs fork")
+def test_allocate_ids_is_unique_across_processes(tmp_path):
+    file_path = tmp_path / "submissions.csv"
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        results = pool.starmap(allocate_many, [(file_path, 40)] * 8)
+
+    ids = [i for chunk in results for i in chunk]
+    assert sorted(ids) == list(range(1, len(ids) + 1))
+
+
+@pytest.fixture
+def normalized_files(tmp_path, monkeypatch):
+    """Point the module's four CSV files at tmp_path"""
+    for name in ("EXAMS_FILE", "QUESTIONS_FILE", "SUBMISSIONS_FILE", "STUDENT_ANSWERS_FILE"):
+        monkeypatch.setattr(csv_normalized, name, tmp_path / getattr(csv_normalized, name).name)
+    monkeypatch.setattr(csv_normalized, "_initialized", False)
+    return tmp_path
+
+
+def test_create_submission_rejects_duplicates_under_concurrency(normalized_files, capsys):
+    answers = [{"question_order": "1", "selected_option": "2", "is_correct": "true",
+                "time_spent_seconds": ""}]
+    outcomes = []
+
+    def submit(student_id):
+        outcomes.append(NormalizedCSVDB.create_submission(
+            {"exam_id": "EX1", "student_id": student_id, "submitted_at": "t", "score": "1",
+             "total_marks": "1", "time_taken_seconds": "", "ip_address": "", "device_info": "",
+             "status": "completed"},
+            [dict(answer) for answer in answers]))
+
+    threads = [threading.Thread(target=submit, args=(f"STU{i % 4}",)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes.count(True) == 4
+    submissions = NormalizedCSVDB.get_exam_submissions("EX1")
+    assert sorted(s["submission_id"] for s in submissions) == ["1", "2", "3", "4"]
+    for submission in submissions:
+        assert len(NormalizedCSVDB.get_student_answers(submission["submission_id"])) == 1
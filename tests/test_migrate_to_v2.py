@@ -0,0 +1,146 @@
+"""Tests for web/utils/migrate_to_v2.py"""
+
+import contextlib
+import csv
+import hashlib
+import io
+
+import pytest
+
+from conftest import build_old_layout
+
+import utils.migrate_to_v2 as migrate_to_v2
+from utils.csv_manager import SCHEMAS
+from utils.migrate_to_v2 import Migrator
+from utils.validate_csv import CSVValidator
+
+MIGRATED_TABLES = {
+    "answer_keys": "core/answer_keys.csv",
+    "student_sessions": "transactions/student_sessions.csv",
+    "answers": "transactions/answers.csv",
+    "students": "core/students.csv",
+}
+
+# Stamped with the migration time, so they differ between runs
+_RUN_TIME_COLUMNS = {"created_at", "registration_date"}
+
+
+def migrate(tmp_path, name="run", **kwargs):
+    """Migrate a fresh copy of the old-layout fixture; returns (migrator, dest_dir)"""
+    web_dir = tmp_path / name / "web"
+    build_old_layout(web_dir)
+    migrator = Migrator(web_dir, web_dir / "data", **kwargs)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert migrator.run()
+    migrator.csv_manager.flush_audit()
+    return migrator, web_dir / "data"
+
+
+def table_rows(dest_dir, schema_name):
+    with open(dest_dir / MIGRATED_TABLES[schema_name], newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        assert reader.fieldnames == SCHEMAS[schema_name].columns
+        return [{k: v for k, v in row.items() if k not in _RUN_TIME_COLUMNS} for row in reader]
+
+
+def snapshot(dest_dir):
+    return {name: table_rows(dest_dir, name) for name in MIGRATED_TABLES}
+
+
+def test_migrated_rows_are_schema_valid(tmp_path):
+    migrator, dest_dir = migrate(tmp_path, debug=True, workers=1)
+
+    stats = migrator.stats
+    assert stats.errors == []
+    assert stats.student_sessions_migrated == 60
+    for name in MIGRATED_TABLES:
+        for row in table_rows(dest_dir, name):
+            full_row = dict(row, **{col: "x" for col in _RUN_TIME_COLUMNS & set(SCHEMAS[name].columns)})
+            assert SCHEMAS[name].validate_row(full_row) == (True, None)
+
+
+def test_migrated_data_passes_validate_csv(tmp_path):
+    _, dest_dir = migrate(tmp_path, workers=1)
+    validator = CSVValidator(dest_dir, workers=1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        validator.validate_all()
+    assert [e for e in validator.report.errors if " row " in e] == []
+
+
+def test_debug_and_worker_runs_match(tmp_path, monkeypatch):
+    monkeypatch.setattr(migrate_to_v2, "POLARS_AVAILABLE", False)
+    _, serial = migrate(tmp_path, "serial", workers=1)
+    _, parallel = migrate(tmp_path, "parallel", workers=3)
+    _, debug = migrate(tmp_path, "debug", debug=True, workers=1)
+
+    expected = snapshot(serial)
+    assert len(expected["answers"]) > 0
+    assert snapshot(parallel) == expected
+    assert snapshot(debug) == expected
+
+
+def test_ordered_results_bounds_in_flight_jobs():
+    from concurrent.futures import ThreadPoolExecutor
+
+    submitted = []
+    consumed = []
+
+    def job(i):
+        return i * i
+
+    class CountingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, *args):
+            submitted.append(args[0])
+            # The window, plus the next job submitted as one is handed out
+            assert len(submitted) - len(consumed) <= 3 + 1
+            return super().submit(fn, *args)
+
+    with CountingExecutor(2) as executor:
+        for get in migrate_to_v2._ordered_results(executor, job, [(i,) for i in range(20)], 3):
+            consumed.append(get())
+
+    assert consumed == [i * i for i in range(20)]
+
+
+def test_polars_grading_matches_csv_path(tmp_path, monkeypatch):
+    pytest.importorskip("polars")
+    _, with_polars = migrate(tmp_path, "polars", workers=1)
+    monkeypatch.setattr(migrate_to_v2, "POLARS_AVAILABLE", False)
+    _, without = migrate(tmp_path, "csv", workers=1)
+
+    assert snapshot(with_polars) == snapshot(without)
+
+
+def test_writes_go_through_csv_manager(tmp_path):
+    migrator, dest_dir = migrate(tmp_path, workers=1)
+
+    audited = {row["entity_type"]: row for row in migrator.csv_manager.read("audit_log")}
+    for name in MIGRATED_TABLES:
+        assert audited[name]["new_value"] == f"{len(table_rows(dest_dir, name))} rows"
+    assert audited["answers"]["entity_id"] == "ANS00000001,ANS00000002,ANS00000003"
+
+
+def test_dry_run_writes_nothing(tmp_path):
+    migrator, dest_dir = migrate(tmp_path, dry_run=True, workers=1)
+    assert migrator.stats.answers_migrated > 0
+    assert not any(path.is_file() for path in (dest_dir / "core").iterdir())
+    assert not any(path.is_file() for path in (dest_dir / "transactions").iterdir())
+
+
+def test_session_content_hash_is_md5_of_pdf_names(tmp_path):
+    web_dir = tmp_path / "web"
+    build_old_layout(web_dir, sessions=1, generated=False)
+    pdf_dir = tmp_path / "generated" / "session_0" / "pdfs"
+    pdf_dir.mkdir(parents=True)
+    names = ["snippet_2.pdf", "full.pdf", "snippet_1.pdf"]
+    for name in names:
+        (pdf_dir / name).write_bytes(b"%PDF")
+
+    migrator = Migrator(web_dir, web_dir / "data", workers=1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        migrator.migrate_sessions_from_generated()
+    migrator.csv_manager.flush_audit()
+
+    [session] = migrator.csv_manager.read("sessions")
+    assert session["question_count"] == "2"
+    assert session["content_hash"] == hashlib.md5("".join(sorted(names)).encode()).hexdigest()[:16]
@@ -0,0 +1,187 @@
+"""Tests for web/utils/robust_latex_compiler.py (log parsing; no TeX install needed)"""
+
+import dataclasses
+import multiprocessing
+import os
+import random
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import utils.robust_latex_compiler as rlc
+from utils.robust_latex_compiler import CompilationResult, RobustLaTeXCompiler
+
+
+@pytest.fixture
+def compiler():
+    return RobustLaTeXCompiler(cache_dir=None)
+
+
+# The error patterns searched one at a time over the whole log, most
+# specific first: the order _extract_error_from_log must reproduce
+_REFERENCE_PATTERNS = [
+    (re.compile(r'! LaTeX Error: (.+)'), 'LaTeX Error: {}'),
+    (re.compile(r'! (.+)'), 'Error: {}'),
+    (re.compile(r'ERROR: (.+)'), 'Compilation Error: {}'),
+    (re.compile(r'Fatal error: (.+)'), 'Fatal Error: {}'),
+    (re.compile(r'Runaway argument\?(.+)'), 'Runaway Argument: {}'),
+    (re.compile(r'Undefined control sequence(.+)'), 'Undefined Command: {}'),
+    (re.compile(r'Missing (.+)'), 'Missing: {}'),
+]
+_REFERENCE_LINE = re.compile(r'l\.(\d+)\s+(.+)')
+
+
+def reference_error(log):
+    for pattern, template in _REFERENCE_PATTERNS:
+        match = pattern.search(log)
+        if match:
+            return template.format(match.group(1).strip()[:200])
+    match = _REFERENCE_LINE.search(log)
+    if match:
+        return f"Error at line {match.group(1)}: {match.group(2)[:100]}"
+    return None
+
+
+def test_missing_packages_in_order_without_duplicates(compiler):
+    log = ("! LaTeX Error: File `tikz.sty' not found.\n"
+           "! LaTeX Error: File `foo.cls' not found.\n"
+           "Package babel Error: x\n"
+           "! Package amsmath not found\n"
+           "! LaTeX Error: File `tikz.sty' not found.\n")
+    assert compiler.detect_missing_packages(log) == ["tikz", "foo", "babel", "amsmath"]
+    assert compiler._extract_error_from_log(log).startswith("Missing LaTeX packages: tikz, foo, babel.")
+
+
+@pytest.mark.parametrize("log, expected", [
+    ("! Undefined control sequence.\nl.12 \\foo\n", "Error: Undefined control sequence."),
+    ("ERROR: something bad\nFatal error: ouch\n", "Compilation Error: something bad"),
+    ("Runaway argument? {abc\nMissing $ inserted\n", "Runaway Argument: {abc"),
+    ("l.42 \\bar baz\nUnderfull \\vbox\n", "Error at line 42: \\bar baz"),
+    ("Overfull \\hbox\n", "Formatting issues detected. The document may still be usable."),
+])
+def test_error_message(compiler, log, expected):
+    assert compiler._extract_error_from_log(log) == expected
+
+
+def test_specific_error_later_on_the_same_line_wins(compiler):
+    # "Missing ..." matches first and runs to the end of the line
+    log = "Missing $ inserted. ! LaTeX Error: boom\n"
+    assert compiler._extract_error_from_log(log) == "LaTeX Error: boom"
+
+
+def test_error_ranking_matches_per_pattern_search(compiler):
+    fragments = ["Missing $ inserted. ", "! LaTeX Error: boom ", "! bad ", "ERROR: e ",
+                 "Fatal error: f ", "Runaway argument? r ", "Undefined control sequence x ",
+                 "l.12 \\foo ", "text ", "\n", "\n"]
+    rng = random.Random(0)
+    for _ in range(3000):
+        log = "".join(rng.choice(fragments) for _ in range(rng.randint(0, 12)))
+        expected = reference_error(log)
+        if expected is not None:
+            assert compiler._extract_error_from_log(log) == expected, log
+
+
+def test_warnings_deduplicated_and_capped(compiler):
+    log = ("LaTeX Warning: Reference `a' undefined\n"
+           "Package hyperref Warning: Token not allowed\n"
+           "LaTeX Warning: Reference `a' undefined\n")
+    assert compiler._extract_warnings_from_log(log) == [
+        "Reference `a' undefined", "Token not allowed"]
+
+    many = "\n".join(f"Warning: w{i}" for i in range(20))
+    assert compiler._extract_warnings_from_log(many) == [f"w{i}" for i in range(rlc.MAX_WARNINGS)]
+
+
+def test_compilation_result_is_a_dataclass():
+    assert dataclasses.is_dataclass(CompilationResult)
+    result = CompilationResult(success=True)
+    assert result.warnings == [] and result.error_message is None
+    assert CompilationResult(True, warnings=["a"]) == CompilationResult(True, warnings=["a"])
+    assert "_log_parser" not in repr(result)
+
+
+def test_compilation_result_parses_lazily(compiler, monkeypatch):
+    calls = []
+    parse = compiler._extract_warnings_from_log
+    monkeypatch.setattr(compiler, "_extract_warnings_from_log",
+                        lambda log: calls.append(log) or parse(log))
+
+    result = CompilationResult(success=True, log_content="LaTeX Warning: late\n",
+                               _log_parser=compiler)
+    result.add_warnings(["Missing recommended package: amsmath"])
+    assert calls == []
+
+    assert result.warnings == ["late", "Missing recommended package: amsmath"]
+    assert result.warnings == ["late", "Missing recommended package: amsmath"]
+    assert len(calls) == 1
+
+
+def test_failed_result_error_message_is_lazy(compiler):
+    result = CompilationResult(success=False, log_content="! Undefined control sequence.\n",
+                               _log_parser=compiler, _error_prefix="Strategy 'x' failed: ")
+    assert result._error_message is None
+    assert result.error_message == "Strategy 'x' failed: Error: Undefined control sequence."
+
+    result.error_message = "replaced"
+    assert result.error_message == "replaced"
+
+
+def _scratch_path(_):
+    return str(rlc._scratch_root())
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="POSIX start methods")
+@pytest.mark.parametrize("method", ["fork", "spawn"])
+def test_pool_workers_remove_their_scratch_dirs(method):
+    context = multiprocessing.get_context(method)
+    with ProcessPoolExecutor(2, mp_context=context, initializer=rlc._init_pool_worker) as executor:
+        paths = set(executor.map(_scratch_path, range(6)))
+
+    assert paths
+    assert not any(os.path.exists(path) for path in paths)
+
+
+def _python_strategy(name, code):
+    """A strategy whose engine is a Python snippet; argv[1] is the .tex file"""
+    return {'name': name, 'command': sys.executable, 'args': ['-c', code],
+            'passes': 1, 'timeout': 60}
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="POSIX signals")
+def test_race_kills_the_losing_engine(tmp_path):
+    pid_file = tmp_path / "loser.pid"
+    loser = _python_strategy("slow", (
+        "import os, sys, time\n"
+        f"open({str(pid_file)!r}, 'w').write(str(os.getpid()))\n"
+        "time.sleep(60)\n"))
+    winner = _python_strategy("fast", (
+        "import sys, time\n"
+        "time.sleep(1)\n"
+        "open(sys.argv[1][:-4] + '.pdf', 'wb').write(b'%PDF-1.4')\n"))
+
+    compiler = RobustLaTeXCompiler(cache_dir=None, parallel_strategies=2)
+    started = time.monotonic()
+    result = compiler._race_strategies("x", tmp_path, "doc", [loser, winner])
+
+    assert result.success and result.pdf_path == tmp_path / "doc.pdf"
+    assert time.monotonic() - started < 30
+    pid = int(pid_file.read_text())
+    deadline = time.monotonic() + 5
+    while _pid_alive(pid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _pid_alive(pid)
+
+
+def test_timeout_error_is_kept_for_callers():
+    assert issubclass(rlc.TimeoutError, Exception)
@@ -0,0 +1,124 @@
+"""Tests for web/utils/validate_csv.py"""
+
+import contextlib
+import io
+import random
+
+import pytest
+
+from conftest import answer_key_row, answer_row, attempt_row, session_row, write_table
+
+import utils.validate_csv as validate_csv
+from utils.csv_manager import SCHEMAS
+from utils.validate_csv import CSVValidator, _split_ranges
+
+
+def run_validator(data_dir, **kwargs):
+    """Run validate_all quietly; returns the validator"""
+    validator = CSVValidator(data_dir, **kwargs)
+    with contextlib.redirect_stdout(io.StringIO()):
+        validator.validate_all()
+    return validator
+
+
+def messages(validator):
+    report = validator.report
+    return report.errors, report.warnings, report.info
+
+
+def test_reports_known_problems(v2_data):
+    errors, _, _ = messages(run_validator(v2_data, workers=1))
+
+    assert "ERROR: student_sessions row 61: Duplicate primary key: ATT000003" in errors
+    assert any("student_sessions row 13" in e and "finished" in e for e in errors)
+    assert any("answers row 52" in e and "selected_option" in e for e in errors)
+    assert any("student_sessions.session_id" in e and "session_9" in e for e in errors)
+    assert any("Question index 7 not found" in e for e in errors)
+
+
+def test_multiline_field_is_one_row(v2_data):
+    _, _, info = messages(run_validator(v2_data, workers=1))
+    assert "INFO: student_sessions: Validated 62 rows" in info
+
+
+@pytest.mark.parametrize("workers", [2, 3])
+def test_byte_range_chunks_match_single_pass(v2_data, monkeypatch, workers):
+    expected = messages(run_validator(v2_data, workers=1))
+
+    # Every file is split into byte ranges
+    monkeypatch.setattr(validate_csv, "CHUNK_MIN_BYTES", 0)
+    assert messages(run_validator(v2_data, workers=workers)) == expected
+
+
+def test_split_ranges_start_on_rows(v2_data):
+    file_path = v2_data / "transactions" / "student_sessions.csv"
+    columns = SCHEMAS["student_sessions"].columns
+    data = file_path.read_bytes()
+
+    bounds = _split_ranges(file_path, columns, 8)
+    assert bounds[-1] == len(data)
+    assert bounds == sorted(bounds)
+    for start in bounds[:-1]:
+        # Each range begins at a line start outside any quoted field
+        assert data[start - 1:start] == b"\n"
+        assert data[:start].count(b'"') % 2 == 0
+
+    assert _split_ranges(file_path, columns[::-1], 8) is None
+
+
+def test_max_errors_keeps_the_earliest(v2_data):
+    full, _, _ = messages(run_validator(v2_data, workers=1))
+    limited, warnings, _ = messages(run_validator(v2_data, workers=1, max_errors=2))
+
+    assert limited == full[:2]
+    assert any("Error limit (2) reached" in w for w in warnings)
+
+
+@pytest.mark.parametrize("max_errors", [0, -1])
+def test_max_errors_must_be_positive(tmp_path, max_errors):
+    with pytest.raises(ValueError):
+        CSVValidator(tmp_path, max_errors=max_errors)
+
+
+def test_pyarrow_engine_matches_csv_engine(v2_data):
+    pytest.importorskip("pyarrow")
+    expected = messages(run_validator(v2_data, workers=1))
+    assert messages(run_validator(v2_data, workers=1, engine="pyarrow")) == expected
+
+
+def test_every_audit_shard_is_validated(tmp_path):
+    data_dir = tmp_path / "data"
+    audit = SCHEMAS["audit_log"]
+    # Same log_id in two daily shards; the older shard's row is invalid
+    for day, action in (("20250101", "explode"), ("20250102", "create")):
+        row = ["LOG1", "t", "answers", "A1", action, "system", "NULL", "NULL", "127.0.0.1", "2.0"]
+        shard = data_dir / "audit" / f"audit_log_{day}.csv"
+        shard.parent.mkdir(parents=True, exist_ok=True)
+        shard.write_text(",".join(audit.columns) + "\n" + ",".join(row) + "\n")
+
+    errors, _, _ = messages(run_validator(data_dir, workers=1))
+
+    assert any("action" in e and "explode" in e for e in errors)
+    assert "ERROR: audit_log: Duplicate primary key across files: LOG1" in errors
+
+
+def test_first_duplicate_attempt_decides_the_session(tmp_path):
+    data_dir = tmp_path / "data"
+    write_table(data_dir, "sessions", [session_row("s1"), session_row("s2")])
+    write_table(data_dir, "answer_keys", [answer_key_row("AK1", "s1", 0), answer_key_row("AK2", "s2", 5)])
+    write_table(data_dir, "student_sessions", [attempt_row("ATT1", "s1"), attempt_row("ATT1", "s2")])
+    write_table(data_dir, "answers", [answer_row("ANS1", "ATT1", 0)])
+
+    errors, _, _ = messages(run_validator(data_dir, workers=1))
+    assert not any("Question index" in e for e in errors)
+
+
+@pytest.mark.parametrize("schema_name", sorted(SCHEMAS))
+def test_generated_validator_matches_validate_row(schema_name):
+    schema = SCHEMAS[schema_name]
+    samples = ["", "   ", "1", "4", "9", "0", "-3", "NULL", "true", "false", "active",
+               "submitted", "create", "a@b.co", "not-an-email", "2.0", "x" * 40]
+    rng = random.Random(schema_name)
+    for _ in range(2000):
+        values = [rng.choice(samples) for _ in schema.columns]
+        assert schema.validate_values(values) == schema.validate_row(dict(zip(schema.columns, values)))
@@ -526,8 +526,11 @@ def run(cmd: List[str], cwd: Path | None = None) -> str:
     return proc.stdout
 
 
+DOCUMENT_BODY_RE = re.compile(r"\\begin\{document\}(.*?)\\end\{document\}", re.S)
+
+
 def extract_body(content: str) -> str:
-    m = re.search(r"\\begin\{document\}(.*?)\\end\{document\}", content, flags=re.S)
+    m = DOCUMENT_BODY_RE.search(content)
     if m:
         return m.group(1).strip()
     return content.strip()
@@ -4,15 +4,25 @@ Provides file locking, validation, backup, and CRUD operations for CSV files.
 Cross-platform compatible (Linux, macOS, Windows).
 """
 
+import atexit
 import csv
 import hashlib
+import io
+import itertools
 import json
+import os
+import queue
 import shutil
+import socket
+import stat
 import sys
+import threading
+import time
+import weakref
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Iterable, Iterator, Sequence
 import tempfile
 
 # Platform-specific imports for file locking
@@ -27,6 +37,77 @@ else:
         LOCK_AVAILABLE = False
         print("Warning: File locking not available on this platform")
 
+# Optional columnar backend for schemas with storage_format="parquet"
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+# Optional typed, multithreaded bulk reads (CSVManager.read_arrow)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+# Part of every generated ID, so hosts sharing data_dir don't collide
+_HOST_TAG = hashlib.blake2b(socket.gethostname().encode(), digest_size=2).hexdigest().upper()
+
+# Buffer for full-file CSV scans: far fewer read() syscalls than the 8 KiB default
+READ_BUFFER_SIZE = 1 << 20
+
+
+class _PathLock:
+    """In-process lock for one CSV file, fronting its OS-level lock file"""
+
+    def __init__(self):
+        self.pid = os.getpid()  # Owning process; a forked child gets its own
+        self.thread_lock = threading.RLock()
+        self.handle = None  # Lock file handle, opened once and reused
+        self.depth = 0      # Re-entrant acquisitions by the owning thread
+
+
+# Shared across CSVManager instances so all threads in a process agree
+_path_locks: Dict[str, _PathLock] = {}
+_path_locks_guard = threading.Lock()
+
+
+def _get_path_lock(lock_file: Path) -> _PathLock:
+    """
+    Get (or create) the in-process lock for a lock file
+
+    A lock inherited through fork() is replaced: the child's copy of the
+    handle shares the parent's open file description, so flock() on it
+    would neither exclude the parent nor leave the parent's lock alone.
+    """
+    key = str(lock_file)
+    pid = os.getpid()
+    path_lock = _path_locks.get(key)
+    if path_lock is None or path_lock.pid != pid:
+        with _path_locks_guard:
+            path_lock = _path_locks.get(key)
+            if path_lock is None or path_lock.pid != pid:
+                if path_lock is not None and path_lock.handle is not None:
+                    path_lock.handle.close()  # Only drops this process's descriptor
+                path_lock = _path_locks[key] = _PathLock()
+    return path_lock
+
+
+# Managers with an audit writer; their queued entries are written at exit
+_audit_managers: "weakref.WeakSet[CSVManager]" = weakref.WeakSet()
+
+
+def _flush_audit_logs():
+    """Write out every live manager's queued audit entries"""
+    for manager in list(_audit_managers):
+        manager.flush_audit()
+
+
+atexit.register(_flush_audit_logs)
+
 
 class CSVValidationError(Exception):
     """Raised when CSV data validation fails"""
@@ -44,12 +125,39 @@ class CSVSchema:
     def __init__(self, name: str, columns: List[str],
                  primary_key: str,
                  required_columns: Optional[List[str]] = None,
-                 validators: Optional[Dict[str, Callable]] = None):
+                 validators: Optional[Dict[str, Callable]] = None,
+                 storage_format: str = "csv",
+                 column_types: Optional[Dict[str, type]] = None):
+        if storage_format not in ("csv", "parquet"):
+            raise ValueError(f"Unknown storage format: {storage_format}")
         self.name = name
-        self.columns = columns
+        # Interned so rows keyed by these names share one string object per
+        # column (and match string literals by identity in lookups)
+        self.columns = [sys.intern(col) for col in columns]
         self.primary_key = primary_key
         self.required_columns = required_columns or columns
         self.validators = validators or {}
+        # (column, predicate) pairs, flattened once for validate_row
+        self._compiled_validators = tuple(self.validators.items())
+        self._has_validators = bool(self._compiled_validators)
+        self._columns_set = frozenset(self.columns)
+        # Same checks keyed by position, for validate_values
+        position = {col: i for i, col in enumerate(self.columns)}
+        self._required_positions = tuple(
+            (position.get(col), col) for col in self.required_columns
+        )
+        self._validator_positions = tuple(
+            (position[col], col, validator)
+            for col, validator in self._compiled_validators if col in position
+        )
+        # validate_values specialized to this schema, see _compile_values_validator
+        self._validate_compiled = self._compile_values_validator()
+        # "parquet" stores the table column-wise (requires polars); all
+        # values are still kept as strings so rows look the same to callers
+        self.storage_format = storage_format
+        # int/float for numeric columns; only read_arrow uses these, rows
+        # returned by read() are always strings
+        self.column_types = column_types or {}
 
     def validate_row(self, row: Dict[str, Any]) -> tuple[bool, Optional[str]]:
         """Validate a single row against schema. Returns (is_valid, error_message)"""
@@ -59,12 +167,16 @@ class CSVSchema:
                 return False, f"Missing required column: {col}"
 
         # Check extra columns
-        for col in row.keys():
-            if col not in self.columns:
-                return False, f"Unknown column: {col}"
+        if not self._columns_set.issuperset(row):
+            for col in row.keys():
+                if col not in self._columns_set:
+                    return False, f"Unknown column: {col}"
+
+        if not self._has_validators:
+            return True, None
 
         # Run custom validators
-        for col, validator in self.validators.items():
+        for col, validator in self._compiled_validators:
             if col in row:
                 try:
                     if not validator(row[col]):
@@ -74,6 +186,52 @@ class CSVSchema:
 
         return True, None
 
+    def validate_values(self, values: Sequence[str]) -> tuple[bool, Optional[str]]:
+        """
+        Validate a row given as values in schema column order (e.g. a
+        csv.reader row). Returns (is_valid, error_message) exactly like
+        validate_row; the row must have one value per column.
+        """
+        return self._validate_compiled(values)
+
+    def _compile_values_validator(self) -> Callable:
+        """
+        Generate validate_values' body for this schema as straight-line code.
+
+        Column positions and messages become literals and enum validators
+        (frozenset.__contains__) become inline "not in" tests, so a row is
+        checked without loops, tuple unpacking or attribute lookups.
+        """
+        lines = ["def validate_values(values):"]
+        namespace: Dict[str, Any] = {}
+
+        for i, col in self._required_positions:
+            message = repr(f"Missing required column: {col}")
+            if i is None:
+                lines.append(f"    return False, {message}")
+                break
+            lines.append(f"    if not values[{i}]:")
+            lines.append(f"        return False, {message}")
+
+        for n, (i, col, validator) in enumerate(self._validator_positions):
+            failed = repr(f"Validation failed for {col}: ")
+            allowed = getattr(validator, "__self__", None)
+            if isinstance(allowed, frozenset):
+                namespace[f"_allowed_{n}"] = allowed
+                lines.append(f"    if values[{i}] not in _allowed_{n}:")
+                lines.append(f"        return False, {failed} + str(values[{i}])")
+            else:
+                namespace[f"_check_{n}"] = validator
+                lines.append("    try:")
+                lines.append(f"        if not _check_{n}(values[{i}]):")
+                lines.append(f"            return False, {failed} + str(values[{i}])")
+                lines.append("    except Exception as e:")
+                lines.append(f"        return False, {repr(f'Validator error for {col}: ')} + str(e)")
+
+        lines.append("    return True, None")
+        exec(compile("\n".join(lines), f"<validate_values:{self.name}>", "exec"), namespace)
+        return namespace["validate_values"]
+
 
 # Define schemas for all CSV files
 SCHEMAS = {
@@ -84,9 +242,10 @@ SCHEMAS = {
         primary_key="session_id",
         validators={
             "question_count": lambda x: str(x).isdigit() and int(x) > 0,
-            "status": lambda x: x in ["active", "archived", "deleted"],
+            "status": frozenset({"active", "archived", "deleted"}).__contains__,
             "exam_duration_minutes": lambda x: str(x).isdigit() and int(x) > 0,
-        }
+        },
+        column_types={"question_count": int, "exam_duration_minutes": int}
     ),
     "answer_keys": CSVSchema(
         name="answer_keys",
@@ -95,9 +254,10 @@ SCHEMAS = {
         primary_key="answer_key_id",
         validators={
             "question_index": lambda x: str(x).isdigit() and int(x) >= 0,
-            "correct_option": lambda x: x in ["1", "2", "3", "4"],
+            "correct_option": frozenset({"1", "2", "3", "4"}).__contains__,
             "marks": lambda x: str(x).replace(".", "").isdigit(),
-        }
+        },
+        column_types={"question_index": int, "marks": float}
     ),
     "students": CSVSchema(
         name="students",
@@ -105,7 +265,7 @@ SCHEMAS = {
                  "batch", "registration_date", "status", "version"],
         primary_key="student_id",
         validators={
-            "status": lambda x: x in ["active", "inactive", "suspended"],
+            "status": frozenset({"active", "inactive", "suspended"}).__contains__,
             "email": lambda x: "@" in x,
         }
     ),
@@ -115,9 +275,13 @@ SCHEMAS = {
                  "start_time", "submit_time", "time_taken_seconds",
                  "status", "ip_address", "user_agent", "version"],
         primary_key="attempt_id",
+        # submit_time/time_taken_seconds stay empty until an attempt is submitted
+        required_columns=["attempt_id", "student_id", "session_id", "exam_id",
+                          "start_time", "status", "ip_address", "user_agent", "version"],
         validators={
-            "status": lambda x: x in ["in_progress", "submitted", "time_expired", "abandoned"],
-        }
+            "status": frozenset({"in_progress", "submitted", "time_expired", "abandoned"}).__contains__,
+        },
+        column_types={"time_taken_seconds": int}
     ),
     "answers": CSVSchema(
         name="answers",
@@ -125,10 +289,14 @@ SCHEMAS = {
                  "selected_option", "is_correct", "marks_awarded",
                  "answered_at", "version"],
         primary_key="answer_id",
+        # An unrecognised mark migrates as an empty selected_option
+        required_columns=["answer_id", "attempt_id", "question_index",
+                          "marks_awarded", "answered_at", "version"],
         validators={
-            "selected_option": lambda x: x in ["1", "2", "3", "4", "NULL", ""],
-            "is_correct": lambda x: x in ["true", "false", ""],
-        }
+            "selected_option": frozenset({"1", "2", "3", "4", "NULL", ""}).__contains__,
+            "is_correct": frozenset({"true", "false", ""}).__contains__,
+        },
+        column_types={"question_index": int, "marks_awarded": float}
     ),
     "submissions": CSVSchema(
         name="submissions",
@@ -137,8 +305,9 @@ SCHEMAS = {
                  "submitted_at", "graded_at", "graded_by", "version"],
         primary_key="submission_id",
         validators={
-            "result": lambda x: x in ["pass", "fail", "pending"],
-        }
+            "result": frozenset({"pass", "fail", "pending"}).__contains__,
+        },
+        column_types={"total_marks": float, "marks_obtained": float, "percentage": float}
     ),
     "audit_log": CSVSchema(
         name="audit_log",
@@ -147,21 +316,147 @@ SCHEMAS = {
                  "ip_address", "version"],
         primary_key="log_id",
         validators={
-            "action": lambda x: x in ["create", "update", "delete", "view"],
+            "action": frozenset({"create", "update", "delete", "view"}).__contains__,
         }
     ),
 }
 
 
+def _require_polars(schema: CSVSchema):
+    """Fail clearly when a parquet-backed schema is used without polars"""
+    if not POLARS_AVAILABLE:
+        raise RuntimeError(
+            f"Schema '{schema.name}' uses parquet storage, which requires polars "
+            f"(pip install polars)"
+        )
+
+
+def _to_frame(schema: CSVSchema, rows: List[Dict[str, Any]]) -> "pl.DataFrame":
+    """Build an all-string DataFrame in schema column order (like csv.DictWriter)"""
+    return pl.DataFrame(
+        {col: ["" if r.get(col) is None else str(r.get(col)) for r in rows]
+         for col in schema.columns},
+        schema={col: pl.Utf8 for col in schema.columns},
+    )
+
+
+def _arrow_column_types(schema: CSVSchema) -> Dict[str, "pa.DataType"]:
+    """Arrow types for read_arrow: declared numerics, dictionary-encoded enums, else strings"""
+    numeric = {int: pa.int64(), float: pa.float64()}
+    types = {}
+    for col in schema.columns:
+        if col in schema.column_types:
+            types[col] = numeric[schema.column_types[col]]
+        elif isinstance(getattr(schema.validators.get(col), "__self__", None), frozenset):
+            types[col] = pa.dictionary(pa.int32(), pa.string())
+        else:
+            types[col] = pa.string()
+    return types
+
+
+class RowAppender:
+    """Writes rows into a file opened by CSVManager.append_stream"""
+
+    # write_rows validates and writes generators in batches of this size
+    BATCH_SIZE = 5000
+
+    def __init__(self, manager: "CSVManager", schema: CSVSchema, handle, validate: bool):
+        self.manager = manager
+        self.schema = schema
+        self.handle = handle
+        self.writer = csv.DictWriter(handle, fieldnames=schema.columns)
+        self.validate = validate
+        self.count = 0
+        self.first_ids: List[str] = []  # Primary keys of the first rows, for the audit log
+
+    def _note(self, rows: List[Dict[str, Any]]):
+        """Record written rows"""
+        if len(self.first_ids) < 3:
+            self.first_ids.extend(r.get(self.schema.primary_key, "?")
+                                  for r in rows[:3 - len(self.first_ids)])
+        self.count += len(rows)
+
+    def __call__(self, row: Dict[str, Any]):
+        """Write one row"""
+        if self.validate:
+            self.manager._validate_rows(self.schema, [row], start=self.count)
+        self.writer.writerow(row)
+        self._note([row])
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]]):
+        """Write rows from any iterable (typically a generator) in bounded batches"""
+        rows = iter(rows)
+        while True:
+            batch = list(itertools.islice(rows, self.BATCH_SIZE))
+            if not batch:
+                break
+            if self.validate:
+                self.manager._validate_rows(self.schema, batch, start=self.count)
+            self.writer.writerows(batch)
+            self._note(batch)
+
+    def write_frame(self, frame: "pl.DataFrame"):
+        """Write a polars frame holding the schema's columns, formatted as csv.DictWriter would"""
+        if self.validate:
+            # Validation is per row: go through write_rows
+            self.write_rows(frame.select(self.schema.columns).iter_rows(named=True))
+            return
+        if len(self.first_ids) < 3:
+            self.first_ids.extend(frame[self.schema.primary_key].head(3 - len(self.first_ids)).to_list())
+        # polars quotes empty strings, csv leaves them bare: write them as nulls
+        frame = frame.select([
+            pl.when(pl.col(name) != "").then(pl.col(name)).alias(name)
+            for name in self.schema.columns
+        ])
+        self.handle.write(frame.write_csv(None, include_header=False, line_terminator="\r\n"))
+        self.count += frame.height
+
+
 class CSVManager:
     """Thread-safe CSV file manager with locking, validation, and backup"""
 
+    # Audit rows are buffered and written by a background thread in batches
+    AUDIT_BATCH_SIZE = 50
+    AUDIT_FLUSH_INTERVAL = 0.1  # seconds
+    # An idle writer thread exits, so it doesn't keep its manager alive
+    AUDIT_IDLE_TIMEOUT = 2.0  # seconds
+
+    # update_append/delete_append fold their delta log into the main file
+    # once it holds this many entries
+    COMPACT_AFTER_DELTAS = 500
+
     def __init__(self, data_dir: Path, auto_backup: bool = True,
-                 lock_timeout: int = 5, schema_version: str = "2.0"):
+                 lock_timeout: int = 5, schema_version: str = "2.0",
+                 process_lock: bool = True):
         self.data_dir = Path(data_dir)
         self.auto_backup = auto_backup
         self.lock_timeout = lock_timeout
         self.schema_version = schema_version
+        # Set to False when only one process touches data_dir; threads are
+        # then serialized by the in-process lock alone (no flock syscalls)
+        self.process_lock = process_lock and LOCK_AVAILABLE
+
+        # Primary-key row cache: schema_name -> ((mtime_ns, size), {pk: row})
+        self._row_cache: Dict[str, tuple] = {}
+
+        # Primary-key -> byte offset index per CSV schema, persisted next to
+        # the CSV as .<name>.csv.pkidx and extended incrementally on append
+        self._pk_index: Dict[str, Dict[str, Any]] = {}
+
+        # Parsed delta logs: delta path -> ((mtime_ns, size), {pk: row or None})
+        self._delta_cache: Dict[str, tuple] = {}
+
+        # Background audit writer (started lazily on first audit entry)
+        self._audit_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._audit_thread: Optional[threading.Thread] = None
+        self._audit_thread_guard = threading.Lock()
+        self._audit_header_ensured: set = set()  # Shards known to have a header
+
+        # ID generator state, (re)seeded per process in generate_id
+        self._id_pid: Optional[int] = None
+        self._id_node = ""
+        self._id_counter = None
+
         self._ensure_structure()
 
     def _ensure_structure(self):
@@ -183,72 +478,307 @@ class CSVManager:
         """
         Context manager for file locking (cross-platform)
         Works on Linux, macOS, and Windows
-        """
-        if not LOCK_AVAILABLE:
-            # No locking available - proceed without lock (not thread-safe)
-            yield
-            return
 
+        Threads are serialized by a per-file in-process RLock; the OS-level
+        lock (shared for 'r', exclusive otherwise) is only taken by the
+        outermost holder and only when process_lock is enabled.
+        """
         lock_file = file_path.parent / f".{file_path.name}.lock"
-        lock_file.touch(exist_ok=True)
+        path_lock = _get_path_lock(lock_file)
+
+        if not path_lock.thread_lock.acquire(timeout=self.lock_timeout):
+            raise CSVLockError(f"Could not acquire lock for {file_path}: timed out")
+
+        try:
+            if not self.process_lock or path_lock.depth > 0:
+                path_lock.depth += 1
+                try:
+                    yield
+                finally:
+                    path_lock.depth -= 1
+                return
 
-        with open(lock_file, 'w') as lock_handle:
             try:
+                if path_lock.handle is None:
+                    path_lock.handle = open(lock_file, 'a')
+
                 if sys.platform == 'win32':
                     # Windows file locking using msvcrt
-                    msvcrt.locking(lock_handle.fileno(), msvcrt.LK_NBLCK, 1)
+                    msvcrt.locking(path_lock.handle.fileno(), msvcrt.LK_NBLCK, 1)
                 else:
                     # Unix/Linux/macOS file locking using fcntl
-                    fcntl.flock(lock_handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-
-                yield
-
+                    lock_type = fcntl.LOCK_SH if mode == 'r' else fcntl.LOCK_EX
+                    fcntl.flock(path_lock.handle.fileno(), lock_type | fcntl.LOCK_NB)
             except (IOError, OSError) as e:
                 raise CSVLockError(f"Could not acquire lock for {file_path}: {e}")
+
+            path_lock.depth += 1
+            try:
+                yield
             finally:
+                path_lock.depth -= 1
                 try:
                     if sys.platform == 'win32':
                         # Unlock on Windows
-                        msvcrt.locking(lock_handle.fileno(), msvcrt.LK_UNLCK, 1)
+                        msvcrt.locking(path_lock.handle.fileno(), msvcrt.LK_UNLCK, 1)
                     else:
                         # Unlock on Unix/Linux/macOS
-                        fcntl.flock(lock_handle.fileno(), fcntl.LOCK_UN)
+                        fcntl.flock(path_lock.handle.fileno(), fcntl.LOCK_UN)
                 except:
                     pass  # Ignore unlock errors
+        finally:
+            path_lock.thread_lock.release()
+
+    def _backup_file(self, file_path: Path, backup_type: str = "before_write",
+                     link: bool = False):
+        """
+        Create backup of CSV file (caller holds the lock)
+
+        Backups are named by a digest of their content, so a file that is
+        already backed up unchanged is not stored again.
 
-    def _backup_file(self, file_path: Path, backup_type: str = "before_write"):
-        """Create backup of CSV file"""
+        With link=True the backup is a hard link (no data copied). Only pass
+        it when the caller is about to replace the file via _atomic_write: the
+        old inode then lives on unchanged in backups/. In-place appends must
+        use a real copy.
+        """
         if not file_path.exists():
             return
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(READ_BUFFER_SIZE), b""):
+                hasher.update(block)
         backup_dir = self.data_dir / "backups" / backup_type
-        backup_file = backup_dir / f"{file_path.stem}_{timestamp}.csv"
-
-        shutil.copy2(file_path, backup_file)
+        backup_file = backup_dir / f"{file_path.stem}_{hasher.hexdigest()}{file_path.suffix}"
+        if backup_file.exists():
+            return
 
-        # Keep only last 10 backups per file
-        backups = sorted(backup_dir.glob(f"{file_path.stem}_*.csv"))
+        try:
+            if not link:
+                raise OSError("copy requested")
+            os.link(file_path, backup_file)
+        except OSError:
+            # Cross-device, unsupported filesystem, or in-place write ahead
+            shutil.copy2(file_path, backup_file)
+
+        # Keep only last 10 backups per file (oldest content first; links
+        # and copy2 both keep the backed-up file's mtime)
+        backups = sorted(backup_dir.glob(f"{file_path.stem}_*{file_path.suffix}"),
+                         key=lambda path: (path.stat().st_mtime_ns, path.name))
         for old_backup in backups[:-10]:
             old_backup.unlink()
 
     def _get_file_path(self, schema_name: str) -> Path:
         """Get file path for a schema"""
+        schema = SCHEMAS.get(schema_name)
+        ext = schema.storage_format if schema else "csv"
         if schema_name in ["sessions", "answer_keys", "students", "exams"]:
-            return self.data_dir / "core" / f"{schema_name}.csv"
+            return self.data_dir / "core" / f"{schema_name}.{ext}"
         elif schema_name in ["student_sessions", "answers", "submissions"]:
-            return self.data_dir / "transactions" / f"{schema_name}.csv"
+            return self.data_dir / "transactions" / f"{schema_name}.{ext}"
         elif schema_name == "audit_log":
-            return self.data_dir / "audit" / f"{schema_name}.csv"
+            return self._get_audit_file()
         else:
             raise ValueError(f"Unknown schema: {schema_name}")
 
+    def _get_audit_file(self) -> Path:
+        """Get today's audit log shard (audit_log_YYYYMMDD.csv, UTC)"""
+        shard = datetime.utcnow().strftime("%Y%m%d")
+        return self.data_dir / "audit" / f"audit_log_{shard}.csv"
+
+    def _get_read_paths(self, schema_name: str, schema: CSVSchema,
+                        create: bool = True) -> List[Path]:
+        """
+        Get all files holding rows for a schema.
+
+        The audit log is sharded by day, so reads union every shard
+        (including a legacy unsharded audit_log.csv, if present).
+
+        Args:
+            schema_name: Name of the schema
+            schema: Its CSVSchema
+            create: Create a missing (unsharded) file with its header; with
+                False the path is returned whether or not it exists
+        """
+        if schema_name == "audit_log":
+            self.flush_audit()
+            return sorted((self.data_dir / "audit").glob("audit_log*.csv"))
+
+        file_path = self._get_file_path(schema_name)
+        if create:
+            self._ensure_file_exists(file_path, schema)
+        return [file_path]
+
     def _ensure_file_exists(self, file_path: Path, schema: CSVSchema):
         """Create CSV file with headers if it doesn't exist"""
         if not file_path.exists():
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=schema.columns)
+            self._atomic_write(file_path, schema, [])
+
+    def _iter_rows(self, file_path: Path, schema: CSVSchema) -> Iterator[Dict[str, Any]]:
+        """Iterate over the rows stored in a schema file (caller holds the lock)"""
+        if schema.storage_format == "parquet":
+            _require_polars(schema)
+            yield from pl.read_parquet(file_path).to_dicts()
+            return
+
+        # csv.reader + zip is noticeably cheaper per row than csv.DictReader
+        with open(file_path, 'r', newline='', encoding='utf-8',
+                  buffering=READ_BUFFER_SIZE) as f:
+            reader = csv.reader(f)
+            fields = next(reader, None)
+            if fields is None:
+                return
+            fields = [sys.intern(field) for field in fields]
+            n_fields = len(fields)
+            for values in reader:
+                if not values:
+                    continue  # Skip blank lines, like DictReader
+                if len(values) < n_fields:
+                    values += [None] * (n_fields - len(values))
+                yield dict(zip(fields, values))
+
+    def _atomic_write(self, file_path: Path, schema: CSVSchema, rows: List[Dict[str, Any]]):
+        """
+        Overwrite a schema file with the given rows (caller holds the lock)
+
+        Rows are written and fsynced to a temporary file that then replaces
+        the original with os.replace(). Readers see either the old or the new
+        file, never a truncated one, a crash mid-write leaves the original
+        intact, and the previous inode (possibly hard-linked into backups/)
+        is never modified. Parquet-backed schemas also accept the rows as a
+        polars DataFrame.
+        """
+        fd, tmp_name = tempfile.mkstemp(dir=file_path.parent,
+                                        prefix=f".{file_path.name}.", suffix=".tmp")
+        tmp_path = Path(tmp_name)
+        try:
+            if schema.storage_format == "parquet":
+                os.close(fd)
+                _require_polars(schema)
+                frame = rows if isinstance(rows, pl.DataFrame) else _to_frame(schema, rows)
+                frame.write_parquet(tmp_path, compression="zstd")
+                with open(tmp_path, 'rb') as f:
+                    os.fsync(f.fileno())
+            else:
+                with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.DictWriter(f, fieldnames=schema.columns)
+                    writer.writeheader()
+                    writer.writerows(rows)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            # mkstemp creates files as 0600; keep the original permissions
+            try:
+                mode = stat.S_IMODE(file_path.stat().st_mode)
+            except FileNotFoundError:
+                mode = 0o644
+            os.chmod(tmp_path, mode)
+
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        self._fsync_dir(file_path.parent)
+
+    @staticmethod
+    def _fsync_dir(dir_path: Path):
+        """Persist a rename in dir_path (no-op where directories can't be opened)"""
+        try:
+            fd = os.open(dir_path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def _append_rows(self, file_path: Path, schema: CSVSchema, rows: List[Dict[str, Any]]):
+        """Append rows to a schema file (caller holds the lock)"""
+        self._ensure_file_exists(file_path, schema)
+
+        if schema.storage_format == "parquet":
+            # Parquet files are immutable: swap in a rewrite with the new rows added
+            _require_polars(schema)
+            combined = pl.concat([pl.read_parquet(file_path), _to_frame(schema, rows)])
+            self._atomic_write(file_path, schema, combined)
+            return
+
+        with open(file_path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=schema.columns)
+            writer.writerows(rows)
+
+    @staticmethod
+    def _delta_path(file_path: Path) -> Path:
+        """Get the delta log written by update_append/delete_append"""
+        return file_path.parent / f".{file_path.name}.delta"
+
+    def _load_delta(self, file_path: Path, schema: CSVSchema) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get pending delta entries as {pk: latest row}, with None marking a
+        deleted row (caller holds the lock)
+        """
+        delta_path = self._delta_path(file_path)
+        try:
+            st = os.stat(delta_path)
+        except FileNotFoundError:
+            return {}
+
+        file_key = (st.st_mtime_ns, st.st_size)
+        cached = self._delta_cache.get(str(delta_path))
+        if cached is not None and cached[0] == file_key:
+            return cached[1]
+
+        delta = {}
+        with open(delta_path, 'r', newline='', encoding='utf-8',
+                  buffering=READ_BUFFER_SIZE) as f:
+            reader = csv.reader(f)
+            fields = next(reader, None) or []
+            for values in reader:
+                if not values:
+                    continue
+                entry = dict(zip(fields, values))
+                op = entry.pop("_op", "update")
+                delta[entry.get(schema.primary_key)] = None if op == "delete" else entry
+
+        self._delta_cache[str(delta_path)] = (file_key, delta)
+        return delta
+
+    def _append_delta(self, file_path: Path, schema: CSVSchema, op: str, row: Dict[str, Any]):
+        """Append one update/delete entry to the delta log (caller holds the lock)"""
+        delta_path = self._delta_path(file_path)
+        write_header = not delta_path.exists()
+        with open(delta_path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=["_op"] + schema.columns)
+            if write_header:
                 writer.writeheader()
+            writer.writerow({"_op": op, **row})
+
+    def _drop_delta(self, file_path: Path):
+        """Remove the delta log once the main file includes it (caller holds the lock)"""
+        delta_path = self._delta_path(file_path)
+        delta_path.unlink(missing_ok=True)
+        self._delta_cache.pop(str(delta_path), None)
+
+    def _iter_live_rows(self, file_path: Path, schema: CSVSchema) -> Iterator[Dict[str, Any]]:
+        """Iterate over rows with pending delta entries applied (caller holds the lock)"""
+        delta = self._load_delta(file_path, schema)
+        if not delta:
+            yield from self._iter_rows(file_path, schema)
+            return
+
+        pk = schema.primary_key
+        for row in self._iter_rows(file_path, schema):
+            key = row.get(pk)
+            if key in delta:
+                latest = delta[key]
+                if latest is None:
+                    continue  # Deleted
+                row = dict(latest)
+            yield row
 
     def read(self, schema_name: str, filter_fn: Optional[Callable] = None) -> List[Dict[str, Any]]:
         """
@@ -261,32 +791,353 @@ class CSVManager:
         Returns:
             List of dictionaries, each representing a row
         """
+        return list(self.read_iter(schema_name, filter_fn=filter_fn))
+
+    def read_iter(self, schema_name: str,
+                  filter_fn: Optional[Callable] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over rows without building the whole list (see read)
+
+        The file's read lock is held while the generator is suspended, so
+        consume it promptly (or close it) rather than keeping it around.
+
+        Args:
+            schema_name: Name of the schema (e.g., 'sessions', 'answers')
+            filter_fn: Optional function to filter rows. Should return True to include row.
+
+        Yields:
+            One dictionary per row
+        """
         schema = SCHEMAS.get(schema_name)
         if not schema:
             raise ValueError(f"Unknown schema: {schema_name}")
 
-        file_path = self._get_file_path(schema_name)
-        self._ensure_file_exists(file_path, schema)
-
-        rows = []
-        with self._lock_file(file_path, 'r'):
-            with open(file_path, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
+        for file_path in self._get_read_paths(schema_name, schema):
+            with self._lock_file(file_path, 'r'):
+                for row in self._iter_live_rows(file_path, schema):
                     if filter_fn is None or filter_fn(row):
-                        rows.append(row)
+                        yield row
 
-        return rows
+    def read_arrow(self, schema_name: str,
+                   columns: Optional[List[str]] = None) -> "pa.Table":
+        """
+        Read a whole table into a pyarrow Table (requires pyarrow)
+
+        CSV files are parsed by Arrow's multithreaded reader straight into
+        typed columns, without building a dict per row. Meant for bulk
+        analytics; call .to_pylist() on a filtered table if dicts are needed.
+
+        Args:
+            schema_name: Name of the schema (e.g., 'answers')
+            columns: Optional subset of columns to load (default: all)
+
+        Returns:
+            pyarrow.Table with numeric columns from schema.column_types typed,
+            enum columns dictionary-encoded and the rest as strings
+        """
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("read_arrow requires pyarrow (pip install pyarrow)")
+
+        schema = SCHEMAS.get(schema_name)
+        if not schema:
+            raise ValueError(f"Unknown schema: {schema_name}")
+
+        columns = list(columns) if columns else list(schema.columns)
+        for col in columns:
+            if col not in schema._columns_set:
+                raise ValueError(f"Unknown column for {schema_name}: {col}")
+
+        column_types = _arrow_column_types(schema)
+        read_options = pa_csv.ReadOptions(use_threads=True, block_size=1 << 20)
+        convert_options = pa_csv.ConvertOptions(
+            column_types={col: column_types[col] for col in columns},
+            include_columns=columns,
+            strings_can_be_null=False,
+        )
+
+        tables = []
+        for file_path in self._get_read_paths(schema_name, schema):
+            with self._lock_file(file_path, 'r'):
+                if schema.storage_format == "csv" and not self._delta_path(file_path).exists():
+                    source = file_path
+                else:
+                    # Parquet files and pending delta entries: go through the
+                    # live rows so the result matches read()
+                    buffer = io.StringIO()
+                    writer = csv.DictWriter(buffer, fieldnames=schema.columns)
+                    writer.writeheader()
+                    writer.writerows(self._iter_live_rows(file_path, schema))
+                    source = io.BytesIO(buffer.getvalue().encode('utf-8'))
+
+                tables.append(pa_csv.read_csv(source, read_options=read_options,
+                                              convert_options=convert_options))
+
+        if not tables:
+            # No audit shard written yet
+            return pa.schema([(col, column_types[col]) for col in columns]).empty_table()
+        if len(tables) == 1:
+            return tables[0]
+        return pa.concat_tables(tables)
+
+    def export_parquet(self, schema_name: str) -> Path:
+        """
+        Write a Parquet mirror of a schema for analytics (requires polars)
+
+        CSV stays the canonical format. The mirror in analytics/ is only
+        rebuilt when the source files changed since the last export, so it
+        is cheap to call before every report. Query it with
+        pl.scan_parquet() to read just the columns a report needs.
+
+        Args:
+            schema_name: Name of the schema (e.g., 'answers')
+
+        Returns:
+            Path to the .parquet file (all columns stored as strings)
+        """
+        if not POLARS_AVAILABLE:
+            raise RuntimeError("export_parquet requires polars (pip install polars)")
+
+        schema = SCHEMAS.get(schema_name)
+        if not schema:
+            raise ValueError(f"Unknown schema: {schema_name}")
+
+        sources = self._get_read_paths(schema_name, schema)
+        sources += [self._delta_path(p) for p in sources if self._delta_path(p).exists()]
+        latest = max((p.stat().st_mtime_ns for p in sources), default=0)
+
+        mirror = self.data_dir / "analytics" / f"{schema_name}.parquet"
+        if mirror.exists() and mirror.stat().st_mtime_ns == latest:
+            return mirror
+
+        rows = self.read(schema_name)
+
+        mirror.parent.mkdir(exist_ok=True)
+        tmp_path = mirror.with_name(f".{mirror.name}.{os.getpid()}.tmp")
+        _to_frame(schema, rows).write_parquet(tmp_path, compression="zstd")
+        # Stamp the mirror with the source mtime seen before reading: a write
+        # that lands during the export leaves the source newer, so the next
+        # call rebuilds
+        os.utime(tmp_path, ns=(latest, latest))
+        os.replace(tmp_path, mirror)
+        return mirror
 
     def read_by_id(self, schema_name: str, entity_id: str) -> Optional[Dict[str, Any]]:
-        """Read a single row by primary key"""
+        """
+        Read a single row by primary key
+
+        CSV schemas look the key up in a persisted {pk: byte offset} index
+        and parse only the matching row. Other schemas (parquet, the sharded
+        audit log) use an in-memory {pk: row} index that is rebuilt only when
+        a file's mtime or size changes.
+        """
         schema = SCHEMAS.get(schema_name)
         if not schema:
             raise ValueError(f"Unknown schema: {schema_name}")
 
-        pk = schema.primary_key
-        rows = self.read(schema_name, filter_fn=lambda r: r.get(pk) == entity_id)
-        return rows[0] if rows else None
+        if schema.storage_format == "csv" and schema_name != "audit_log":
+            return self._read_by_offset(schema_name, schema, entity_id)
+
+        file_key = tuple(
+            (p.stat().st_mtime_ns, p.stat().st_size) if p.exists() else None
+            for file_path in self._get_read_paths(schema_name, schema)
+            for p in (file_path, self._delta_path(file_path))
+        )
+
+        cached = self._row_cache.get(schema_name)
+        if cached is None or cached[0] != file_key:
+            pk = schema.primary_key
+            index = {}
+            for row in self.read(schema_name):
+                index.setdefault(row.get(pk), row)
+            self._row_cache[schema_name] = (file_key, index)
+        else:
+            index = cached[1]
+
+        row = index.get(entity_id)
+        return dict(row) if row is not None else None
+
+    def _read_by_offset(self, schema_name: str, schema: CSVSchema,
+                        entity_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a row through the primary-key offset index"""
+        file_path = self._get_file_path(schema_name)
+        self._ensure_file_exists(file_path, schema)
+
+        with self._lock_file(file_path, 'r'):
+            delta = self._load_delta(file_path, schema)
+            if entity_id in delta:
+                latest = delta[entity_id]
+                return dict(latest) if latest is not None else None
+
+            index = self._get_pk_index(schema_name, schema, file_path)
+            offset = index["offsets"].get(entity_id)
+            if offset is None:
+                return None
+
+            with open(file_path, 'rb') as raw:
+                raw.seek(offset)
+                text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+                values = next(csv.reader(text), None)
+
+        if values is None:
+            return None
+        return dict(zip(index["header"], values))
+
+    def _get_pk_index(self, schema_name: str, schema: CSVSchema,
+                      file_path: Path) -> Dict[str, Any]:
+        """
+        Get the up-to-date offset index for a CSV file (caller holds the lock).
+
+        The index is reused while the file is unchanged, extended from its
+        last indexed offset when rows were only appended, and rebuilt
+        otherwise.
+        """
+        st = os.stat(file_path)
+        index_path = file_path.parent / f".{file_path.name}.pkidx"
+
+        index = self._pk_index.get(schema_name)
+        if index is None:
+            index = self._load_pk_index(index_path)
+
+        if index is not None and index["ino"] == st.st_ino:
+            if index["size"] == st.st_size and index["mtime_ns"] == st.st_mtime_ns:
+                self._pk_index[schema_name] = index
+                return index
+            appended = st.st_size > index["end"] and self._tail_matches(file_path, index)
+        else:
+            appended = False
+
+        with open(file_path, 'rb') as f:
+            if appended:
+                f.seek(index["end"])
+            else:
+                header_line = f.readline()
+                header = next(csv.reader([header_line.decode('utf-8')]), [])
+                pk_pos = header.index(schema.primary_key) if schema.primary_key in header else 0
+                index = {"header": header, "pk_pos": pk_pos, "offsets": {}}
+
+            index["end"] = self._scan_offsets(f, index["pk_pos"], index["offsets"])
+            f.seek(max(0, index["end"] - 32))
+            index["tail"] = f.read(min(32, index["end"]))
+
+        index.update(ino=st.st_ino, size=st.st_size, mtime_ns=st.st_mtime_ns)
+        self._pk_index[schema_name] = index
+        self._save_pk_index(index_path, index)
+        return index
+
+    @staticmethod
+    def _scan_offsets(f, pk_pos: int, offsets: Dict[str, int]) -> int:
+        """Record the byte offset of each record's primary key; returns end offset"""
+        end = f.tell()
+        while True:
+            start = f.tell()
+            record = f.readline()
+            if not record.endswith(b"\n"):
+                break  # EOF, or a partially written last row
+            # Quoted fields may contain newlines: a record is only complete
+            # once its double quotes are balanced
+            while record.count(b'"') % 2:
+                more = f.readline()
+                if not more.endswith(b"\n"):
+                    return end
+                record += more
+            end = f.tell()
+
+            if not record.strip():
+                continue
+            if pk_pos == 0 and not record.startswith(b'"'):
+                pk = record.split(b",", 1)[0].rstrip(b"\r\n").decode('utf-8')
+            else:
+                values = next(csv.reader(io.StringIO(record.decode('utf-8'))), [])
+                pk = values[pk_pos] if pk_pos < len(values) else ""
+            offsets.setdefault(pk, start)
+        return end
+
+    @staticmethod
+    def _tail_matches(file_path: Path, index: Dict[str, Any]) -> bool:
+        """Check that the bytes before the last indexed offset are unchanged"""
+        tail = index.get("tail", b"")
+        with open(file_path, 'rb') as f:
+            f.seek(index["end"] - len(tail))
+            return f.read(len(tail)) == tail
+
+    @staticmethod
+    def _load_pk_index(index_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Load a persisted offset index
+
+        The file lives in the shared data directory, so it is plain JSON and
+        is checked field by field: a missing, unreadable or malformed index
+        gives None (and is rebuilt from the CSV).
+        """
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            index = {
+                "header": data["header"],
+                "pk_pos": data["pk_pos"],
+                "offsets": data["offsets"],
+                "end": data["end"],
+                "tail": bytes.fromhex(data["tail"]),
+                "ino": data["ino"],
+                "size": data["size"],
+                "mtime_ns": data["mtime_ns"],
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        def is_int(value):
+            return type(value) is int and value >= 0
+
+        header, offsets, end = index["header"], index["offsets"], index["end"]
+        if not (isinstance(header, list) and all(isinstance(col, str) for col in header)):
+            return None
+        if not all(is_int(index[key]) for key in ("pk_pos", "end", "ino", "size", "mtime_ns")):
+            return None
+        if index["pk_pos"] >= max(len(header), 1) or end > index["size"] or len(index["tail"]) > end:
+            return None
+        if not (isinstance(offsets, dict)
+                and all(is_int(offset) and offset < end for offset in offsets.values())):
+            return None
+        return index
+
+    @staticmethod
+    def _save_pk_index(index_path: Path, index: Dict[str, Any]):
+        """Persist an offset index as JSON (best effort)"""
+        data = dict(index, tail=index["tail"].hex())
+        try:
+            tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, index_path)
+        except OSError:
+            pass
+
+    def _invalidate_cache(self, schema_name: str, rewritten: bool = True):
+        """
+        Drop cached rows for a schema after it has been modified.
+
+        Appends keep the offset index, which is extended on next lookup;
+        rewrites discard it.
+        """
+        self._row_cache.pop(schema_name, None)
+        if rewritten:
+            self._pk_index.pop(schema_name, None)
+            file_path = self._get_file_path(schema_name)
+            (file_path.parent / f".{file_path.name}.pkidx").unlink(missing_ok=True)
+
+    def _validate_rows(self, schema: CSVSchema, rows: List[Dict[str, Any]], start: int = 0):
+        """
+        Raise CSVValidationError for the first invalid row
+
+        Args:
+            schema: Schema the rows must satisfy
+            rows: Rows to check
+            start: Number of the first row, used in the error message
+        """
+        for i, row in enumerate(rows):
+            is_valid, error = schema.validate_row(row)
+            if not is_valid:
+                raise CSVValidationError(f"Row {start + i} validation failed: {error}")
 
     def write(self, schema_name: str, rows: List[Dict[str, Any]],
               mode: str = 'append', validate: bool = True) -> int:
@@ -306,32 +1157,31 @@ class CSVManager:
         if not schema:
             raise ValueError(f"Unknown schema: {schema_name}")
 
-        # Validate all rows
         if validate:
-            for i, row in enumerate(rows):
-                is_valid, error = schema.validate_row(row)
-                if not is_valid:
-                    raise CSVValidationError(f"Row {i} validation failed: {error}")
+            self._validate_rows(schema, rows)
 
         file_path = self._get_file_path(schema_name)
 
-        # Backup before write
-        if self.auto_backup and file_path.exists():
-            self._backup_file(file_path)
-
         with self._lock_file(file_path, 'w'):
+            # Backup before write (replace swaps in a new file, so a hard link
+            # is a safe snapshot; appends write in place and need a copy)
+            if self.auto_backup and file_path.exists():
+                self._backup_file(file_path, link=(mode == 'replace'))
+
             if mode == 'replace':
                 # Replace entire file
-                with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=schema.columns)
-                    writer.writeheader()
-                    writer.writerows(rows)
+                self._atomic_write(file_path, schema, rows)
+                self._drop_delta(file_path)
             else:
+                # Pending deletes/updates for these keys would shadow the new rows
+                delta = self._load_delta(file_path, schema)
+                if delta and any(r.get(schema.primary_key) in delta for r in rows):
+                    self.compact(schema_name)
+
                 # Append to file
-                self._ensure_file_exists(file_path, schema)
-                with open(file_path, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=schema.columns)
-                    writer.writerows(rows)
+                self._append_rows(file_path, schema, rows)
+
+        self._invalidate_cache(schema_name, rewritten=(mode == 'replace'))
 
         # Log to audit
         self._log_audit(
@@ -344,6 +1194,63 @@ class CSVManager:
 
         return len(rows)
 
+    @contextmanager
+    def append_stream(self, schema_name: str, validate: bool = True,
+                      user_id: str = "system"):
+        """
+        Append rows to a schema file as they are produced
+
+        Like write(mode='append') for data too large to collect in a list:
+        the file lock is held (and the before_write backup taken) for the
+        whole block, and a single audit entry covering every row is logged
+        when it ends. Only CSV-backed schemas can be streamed.
+
+        Example:
+            with manager.append_stream("answers") as out:
+                out.write_rows(row_generator())
+
+        Args:
+            schema_name: Name of the schema
+            validate: Whether to validate rows before writing
+            user_id: User recorded in the audit entry
+
+        Yields:
+            A RowAppender
+        """
+        schema = SCHEMAS.get(schema_name)
+        if not schema:
+            raise ValueError(f"Unknown schema: {schema_name}")
+        if schema.storage_format != "csv":
+            raise ValueError(f"Schema '{schema_name}' uses {schema.storage_format} storage, "
+                             f"which cannot be appended to in place")
+
+        file_path = self._get_file_path(schema_name)
+
+        with self._lock_file(file_path, 'w'):
+            if self.auto_backup and file_path.exists():
+                self._backup_file(file_path)
+
+            # Pending deletes/updates could shadow rows not yet seen: fold them in
+            if self._delta_path(file_path).exists():
+                self.compact(schema_name)
+
+            self._ensure_file_exists(file_path, schema)
+            try:
+                with open(file_path, 'a', newline='', encoding='utf-8',
+                          buffering=READ_BUFFER_SIZE) as f:
+                    appender = RowAppender(self, schema, f, validate)
+                    yield appender
+            finally:
+                self._invalidate_cache(schema_name, rewritten=False)
+
+        self._log_audit(
+            entity_type=schema_name,
+            entity_id=",".join(appender.first_ids),
+            action="create",
+            user_id=user_id,
+            new_value=f"{appender.count} rows"
+        )
+
     def update(self, schema_name: str, entity_id: str,
                updates: Dict[str, Any], user_id: str = "system") -> bool:
         """
@@ -368,40 +1275,39 @@ class CSVManager:
         if not file_path.exists():
             return False
 
-        # Read all rows
-        all_rows = []
-        old_row = None
-        found = False
-
-        with self._lock_file(file_path, 'r'):
-            with open(file_path, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row.get(pk) == entity_id:
-                        old_row = row.copy()
-                        row.update(updates)
-                        found = True
-                    all_rows.append(row)
-
-        if not found:
-            return False
+        # Hold the exclusive lock across read-modify-write so concurrent
+        # updates cannot overwrite each other
+        with self._lock_file(file_path, 'w'):
+            # Read all rows
+            all_rows = []
+            old_row = None
+            found = False
+
+            for row in self._iter_live_rows(file_path, schema):
+                if row.get(pk) == entity_id:
+                    old_row = row.copy()
+                    row.update(updates)
+                    found = True
+                all_rows.append(row)
+
+            if not found:
+                return False
+
+            # Validate updated row
+            updated_row = next((r for r in all_rows if r.get(pk) == entity_id), None)
+            if updated_row:
+                is_valid, error = schema.validate_row(updated_row)
+                if not is_valid:
+                    raise CSVValidationError(f"Update validation failed: {error}")
 
-        # Validate updated row
-        updated_row = next((r for r in all_rows if r.get(pk) == entity_id), None)
-        if updated_row:
-            is_valid, error = schema.validate_row(updated_row)
-            if not is_valid:
-                raise CSVValidationError(f"Update validation failed: {error}")
+            # Backup and write
+            if self.auto_backup:
+                self._backup_file(file_path, link=True)
 
-        # Backup and write
-        if self.auto_backup:
-            self._backup_file(file_path)
+            self._atomic_write(file_path, schema, all_rows)
+            self._drop_delta(file_path)
 
-        with self._lock_file(file_path, 'w'):
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=schema.columns)
-                writer.writeheader()
-                writer.writerows(all_rows)
+        self._invalidate_cache(schema_name)
 
         # Log to audit
         self._log_audit(
@@ -409,8 +1315,9 @@ class CSVManager:
             entity_id=entity_id,
             action="update",
             user_id=user_id,
-            old_value=json.dumps(old_row),
-            new_value=json.dumps(updated_row)
+            # Only the changed columns are recorded
+            old_value=json.dumps({k: old_row.get(k) for k in updates}, separators=(',', ':')),
+            new_value=json.dumps(updates, separators=(',', ':'))
         )
 
         return True
@@ -437,31 +1344,122 @@ class CSVManager:
         if not file_path.exists():
             return False
 
-        # Read all rows except the one to delete
-        all_rows = []
-        deleted_row = None
+        with self._lock_file(file_path, 'w'):
+            # Read all rows except the one to delete
+            all_rows = []
+            deleted_row = None
 
-        with self._lock_file(file_path, 'r'):
-            with open(file_path, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row.get(pk) == entity_id:
-                        deleted_row = row.copy()
-                    else:
-                        all_rows.append(row)
+            for row in self._iter_live_rows(file_path, schema):
+                if row.get(pk) == entity_id:
+                    deleted_row = row.copy()
+                else:
+                    all_rows.append(row)
+
+            if not deleted_row:
+                return False
+
+            # Backup and write
+            if self.auto_backup:
+                self._backup_file(file_path, link=True)
+
+            self._atomic_write(file_path, schema, all_rows)
+            self._drop_delta(file_path)
+
+        self._invalidate_cache(schema_name)
+
+        # Log to audit
+        self._log_audit(
+            entity_type=schema_name,
+            entity_id=entity_id,
+            action="delete",
+            user_id=user_id,
+            old_value=json.dumps(deleted_row, separators=(',', ':')),
+            new_value="NULL"
+        )
 
-        if not deleted_row:
+        return True
+
+    def update_append(self, schema_name: str, entity_id: str,
+                      updates: Dict[str, Any], user_id: str = "system") -> bool:
+        """
+        Update a single row by appending to the table's delta log
+
+        Unlike update(), the main file is not rewritten: reads apply the
+        delta log, and compact() folds it in once it reaches
+        COMPACT_AFTER_DELTAS entries. Tools that read the CSV files directly
+        only see these changes after compaction.
+
+        Returns:
+            True if row was found and updated, False otherwise
+        """
+        schema = SCHEMAS.get(schema_name)
+        if not schema:
+            raise ValueError(f"Unknown schema: {schema_name}")
+        if schema_name == "audit_log":
+            raise ValueError("audit_log is append-only")
+
+        file_path = self._get_file_path(schema_name)
+        if not file_path.exists():
             return False
 
-        # Backup and write
-        if self.auto_backup:
-            self._backup_file(file_path)
+        with self._lock_file(file_path, 'w'):
+            old_row = self.read_by_id(schema_name, entity_id)
+            if old_row is None:
+                return False
+
+            updated_row = {**old_row, **updates}
+            is_valid, error = schema.validate_row(updated_row)
+            if not is_valid:
+                raise CSVValidationError(f"Update validation failed: {error}")
+
+            self._append_delta(file_path, schema, "update", updated_row)
+            pending = len(self._load_delta(file_path, schema))
+
+        self._invalidate_cache(schema_name, rewritten=False)
+
+        # Log to audit
+        self._log_audit(
+            entity_type=schema_name,
+            entity_id=entity_id,
+            action="update",
+            user_id=user_id,
+            old_value=json.dumps({k: old_row.get(k) for k in updates}, separators=(',', ':')),
+            new_value=json.dumps(updates, separators=(',', ':'))
+        )
+
+        if pending >= self.COMPACT_AFTER_DELTAS:
+            self.compact(schema_name)
+
+        return True
+
+    def delete_append(self, schema_name: str, entity_id: str, user_id: str = "system") -> bool:
+        """
+        Delete a row by appending a tombstone to the table's delta log
+
+        See update_append() for how the delta log is applied and compacted.
+
+        Returns:
+            True if row was found and deleted, False otherwise
+        """
+        schema = SCHEMAS.get(schema_name)
+        if not schema:
+            raise ValueError(f"Unknown schema: {schema_name}")
+        if schema_name == "audit_log":
+            raise ValueError("audit_log is append-only")
+
+        file_path = self._get_file_path(schema_name)
+        if not file_path.exists():
+            return False
 
         with self._lock_file(file_path, 'w'):
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=schema.columns)
-                writer.writeheader()
-                writer.writerows(all_rows)
+            deleted_row = self.read_by_id(schema_name, entity_id)
+            if deleted_row is None:
+                return False
+
+            self._append_delta(file_path, schema, "delete", {schema.primary_key: entity_id})
+            pending = len(self._load_delta(file_path, schema))
+
+        self._invalidate_cache(schema_name, rewritten=False)
 
         # Log to audit
         self._log_audit(
@@ -469,18 +1467,50 @@ class CSVManager:
             entity_id=entity_id,
             action="delete",
             user_id=user_id,
-            old_value=json.dumps(deleted_row),
+            old_value=json.dumps(deleted_row, separators=(',', ':')),
             new_value="NULL"
         )
 
+        if pending >= self.COMPACT_AFTER_DELTAS:
+            self.compact(schema_name)
+
         return True
 
+    def compact(self, schema_name: str) -> int:
+        """
+        Fold the delta log of a schema into its main file
+
+        Returns:
+            Number of rows the delta log changed (0 if there was none)
+        """
+        schema = SCHEMAS.get(schema_name)
+        if not schema:
+            raise ValueError(f"Unknown schema: {schema_name}")
+
+        file_path = self._get_file_path(schema_name)
+
+        with self._lock_file(file_path, 'w'):
+            delta = self._load_delta(file_path, schema)
+            if not self._delta_path(file_path).exists():
+                return 0
+
+            rows = list(self._iter_live_rows(file_path, schema))
+
+            if self.auto_backup:
+                self._backup_file(file_path, link=True)
+
+            self._atomic_write(file_path, schema, rows)
+            self._drop_delta(file_path)
+
+        self._invalidate_cache(schema_name)
+        return len(delta)
+
     def _log_audit(self, entity_type: str, entity_id: str, action: str,
                    user_id: str, old_value: str = "NULL",
                    new_value: str = "NULL", ip_address: str = "127.0.0.1"):
-        """Write to audit log (without triggering recursive logging)"""
+        """Queue an audit log entry (without triggering recursive logging)"""
         try:
-            audit_file = self.data_dir / "audit" / "audit_log.csv"
+            audit_file = self._get_audit_file()
 
             # Generate log ID
             log_id = f"LOG{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
@@ -492,30 +1522,153 @@ class CSVManager:
                 "entity_id": entity_id,
                 "action": action,
                 "user_id": user_id,
-                "old_value": old_value[:200],  # Truncate long values
-                "new_value": new_value[:200],
+                "old_value": old_value,
+                "new_value": new_value,
                 "ip_address": ip_address,
                 "version": self.schema_version
             }
 
-            # Ensure file exists
-            if not audit_file.exists():
-                with open(audit_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=SCHEMAS["audit_log"].columns)
-                    writer.writeheader()
+            # Queued before the writer check, so an exiting writer sees it
+            self._audit_queue.put((audit_file, row))
+            self._start_audit_writer()
+        except Exception as e:
+            print(f"Warning: Failed to write audit log: {e}")
 
-            # Append without triggering audit (avoid recursion)
-            with open(audit_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=SCHEMAS["audit_log"].columns)
-                writer.writerow(row)
+    def _start_audit_writer(self):
+        """Start the background audit writer if it is not running"""
+        if self._audit_thread is not None and self._audit_thread.is_alive():
+            return
+
+        with self._audit_thread_guard:
+            if self._audit_thread is not None and self._audit_thread.is_alive():
+                return
+            self._audit_thread = threading.Thread(
+                target=self._audit_writer_loop, name="csv-audit-writer", daemon=True
+            )
+            self._audit_thread.start()
+            _audit_managers.add(self)
+
+    def _audit_writer_loop(self):
+        """Drain queued audit rows, writing up to AUDIT_BATCH_SIZE per flush"""
+        while True:
+            try:
+                batch = [self._audit_queue.get(timeout=self.AUDIT_IDLE_TIMEOUT)]
+            except queue.Empty:
+                with self._audit_thread_guard:
+                    if self._audit_queue.empty():
+                        self._audit_thread = None
+                        return
+                continue
+            if isinstance(batch[0], threading.Event):
+                self._write_audit_batch(batch)
+                continue
+
+            deadline = time.monotonic() + self.AUDIT_FLUSH_INTERVAL
+
+            while len(batch) < self.AUDIT_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._audit_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                if isinstance(item, threading.Event):
+                    break  # Someone is waiting in flush_audit()
+
+            self._write_audit_batch(batch)
+
+    def _write_audit_batch(self, batch: List[Any]):
+        """Append a batch of (audit_file, row) entries; flush markers are signalled"""
+        rows_by_file: Dict[Path, List[Dict[str, Any]]] = {}
+        markers = []
+        for item in batch:
+            if isinstance(item, threading.Event):
+                markers.append(item)
+            else:
+                audit_file, row = item
+                rows_by_file.setdefault(audit_file, []).append(row)
+
+        try:
+            for audit_file, rows in rows_by_file.items():
+                with self._lock_file(audit_file, 'w'):
+                    # Ensure file exists (checked once per shard per process)
+                    if audit_file not in self._audit_header_ensured:
+                        if not audit_file.exists():
+                            with open(audit_file, 'w', newline='', encoding='utf-8') as f:
+                                writer = csv.DictWriter(f, fieldnames=SCHEMAS["audit_log"].columns)
+                                writer.writeheader()
+                        self._audit_header_ensured.add(audit_file)
+
+                    # Append without triggering audit (avoid recursion)
+                    with open(audit_file, 'a', newline='', encoding='utf-8') as f:
+                        writer = csv.DictWriter(f, fieldnames=SCHEMAS["audit_log"].columns)
+                        writer.writerows(rows)
         except Exception as e:
             print(f"Warning: Failed to write audit log: {e}")
+        finally:
+            for marker in markers:
+                marker.set()
+
+    def flush_audit(self, timeout: float = 5.0):
+        """Block until every audit entry queued so far has been written"""
+        with self._audit_thread_guard:
+            if self._audit_thread is None or not self._audit_thread.is_alive():
+                # No writer running: drain the queue in the calling thread
+                batch = []
+                while True:
+                    try:
+                        batch.append(self._audit_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if batch:
+                    self._write_audit_batch(batch)
+                return
+
+            # Queued under the guard, so the writer can't go idle before it
+            marker = threading.Event()
+            self._audit_queue.put(marker)
+        marker.wait(timeout)
 
     def generate_id(self, prefix: str) -> str:
-        """Generate a unique ID with prefix"""
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
-        random_part = hashlib.md5(timestamp.encode()).hexdigest()[:8]
-        return f"{prefix}{random_part.upper()}"
+        """
+        Generate a unique ID with prefix
+
+        IDs are a monotonic counter (seeded from the clock in microseconds)
+        followed by a tag for this host and process ID, so they never repeat
+        within a process and two processes running at once on one host can't
+        collide. A later process reusing a PID starts from the clock, past
+        the earlier counter unless that one ran a batch larger than the
+        microseconds in between.
+        """
+        counter = self._id_source()
+        return f"{prefix}{next(counter):013X}{self._id_node}"
+
+    def generate_id_batch(self, prefix: str, n: int) -> List[str]:
+        """
+        Generate n unique IDs with prefix in one call
+
+        Args:
+            prefix: ID prefix, as for generate_id
+            n: Number of IDs to generate
+
+        Returns:
+            List of IDs in ascending order
+        """
+        counter = self._id_source()
+        node = self._id_node
+        return [f"{prefix}{value:013X}{node}"
+                for value in itertools.islice(counter, n)]
+
+    def _id_source(self):
+        """Return this process's ID counter, reseeding it after a fork"""
+        pid = os.getpid()
+        if pid != self._id_pid:  # First call, or first call after a fork
+            self._id_node = f"{_HOST_TAG}{pid & 0xFFFFFF:06X}"
+            self._id_counter = itertools.count(time.time_ns() // 1000)
+            self._id_pid = pid
+        return self._id_counter
 
     def backup_all(self, backup_name: str = None):
         """Create a complete backup of all CSV files"""
@@ -525,8 +1678,9 @@ class CSVManager:
         backup_dir = self.data_dir / "backups" / backup_name
         backup_dir.mkdir(parents=True, exist_ok=True)
 
-        # Backup all CSV files
-        for csv_file in self.data_dir.rglob("*.csv"):
+        # Backup all CSV files (and any uncompacted delta logs)
+        for csv_file in itertools.chain(self.data_dir.rglob("*.csv"),
+                                        self.data_dir.rglob(".*.delta")):
             if "backups" not in str(csv_file):
                 rel_path = csv_file.relative_to(self.data_dir)
                 dest = backup_dir / rel_path
@@ -538,7 +1692,7 @@ class CSVManager:
 
     def count(self, schema_name: str, filter_fn: Optional[Callable] = None) -> int:
         """Count rows in a CSV file"""
-        return len(self.read(schema_name, filter_fn=filter_fn))
+        return sum(1 for _ in self.read_iter(schema_name, filter_fn=filter_fn))
 
     def exists(self, schema_name: str, entity_id: str) -> bool:
         """Check if a row exists by primary key"""
@@ -546,12 +1700,24 @@ class CSVManager:
 
 
 # Convenience functions
+# One manager per data directory, so repeated calls skip _ensure_structure
+# and share the row cache, primary-key index and audit writer
+_managers: Dict[str, CSVManager] = {}
+_managers_guard = threading.Lock()
+
+
 def get_csv_manager(data_dir: str = None) -> CSVManager:
-    """Get a CSV manager instance"""
+    """Get the shared CSV manager instance for a data directory"""
     if data_dir is None:
-        from pathlib import Path
         data_dir = Path(__file__).parent.parent / "data"
-    return CSVManager(Path(data_dir))
+    key = os.path.abspath(data_dir)
+    manager = _managers.get(key)
+    if manager is None:
+        with _managers_guard:
+            manager = _managers.get(key)
+            if manager is None:
+                manager = _managers[key] = CSVManager(Path(data_dir))
+    return manager
 
 
 # Example usage
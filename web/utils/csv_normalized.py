@@ -4,10 +4,36 @@ Provides clean API for reading/writing normalized CSV files
 """
 
 import csv
+import io
+import itertools
+import mmap
+import os
+import sys
+from operator import itemgetter
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Callable, List, Dict, Iterable, Optional, Tuple
 from datetime import datetime
 
+# Platform-specific imports for file locking
+if sys.platform == 'win32':
+    import msvcrt  # Windows file locking
+    LOCK_AVAILABLE = True
+else:
+    try:
+        import fcntl  # Unix/Linux/macOS file locking
+        LOCK_AVAILABLE = True
+    except ImportError:
+        LOCK_AVAILABLE = False
+
+# Optional: whole files are parsed by polars' parallel CSV reader
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
 
 # File paths
 WEB_DIR = Path(__file__).parent.parent
@@ -16,6 +42,437 @@ QUESTIONS_FILE = WEB_DIR / "questions.csv"
 SUBMISSIONS_FILE = WEB_DIR / "submissions.csv"
 STUDENT_ANSWERS_FILE = WEB_DIR / "student_answers.csv"
 
+# Column order for each file (immutable, shared by every header and writer)
+EXAMS_FIELDS = (
+    "exam_id", "exam_name", "subject", "duration_minutes",
+    "passing_percentage", "question_count", "created_at",
+    "created_by", "status", "allowed_students"
+)
+QUESTIONS_FIELDS = (
+    "question_id", "exam_id", "question_order",
+    "correct_option", "marks", "image_url"
+)
+SUBMISSIONS_FIELDS = (
+    "submission_id", "exam_id", "student_id", "submitted_at",
+    "score", "total_marks", "time_taken_seconds",
+    "ip_address", "device_info", "status"
+)
+STUDENT_ANSWERS_FIELDS = (
+    "submission_id", "question_order", "selected_option",
+    "is_correct", "time_spent_seconds"
+)
+
+
+# Files are created on first write rather than at import time
+_initialized = False
+
+
+def _ensure_initialized():
+    """Run NormalizedCSVDB.initialize_files() once per process"""
+    global _initialized
+    if not _initialized:
+        NormalizedCSVDB.initialize_files()
+        _initialized = True
+
+
+# Rows per writerows() call + flush in _append_rows
+APPEND_BATCH_SIZE = 100
+
+# Buffer for full-file CSV scans: far fewer read() syscalls than the 8 KiB default
+READ_BUFFER_SIZE = 1 << 20
+
+# Bytes before an index's end that must be unchanged for growth to count
+# as an append (files are also rewritten in place, larger)
+INDEX_TAIL_BYTES = 32
+
+
+def _append_rows(file_path: Path, fieldnames: Tuple[str, ...], rows: Iterable[Dict]):
+    """
+    Append rows to a CSV file, writing the header only if the file is new or empty
+
+    Rows are written and flushed APPEND_BATCH_SIZE at a time, so when rows is
+    a generator at most one batch is held in memory.
+    """
+    need_header = not file_path.exists() or file_path.stat().st_size == 0
+    rows = iter(rows)
+    with open(file_path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        if need_header:
+            writer.writeheader()
+        while True:
+            batch = list(itertools.islice(rows, APPEND_BATCH_SIZE))
+            if not batch:
+                break
+            writer.writerows(batch)
+            f.flush()
+
+
+def _read_record(f) -> bytes:
+    """Read one CSV record from a binary file or mmap (quoted fields may span lines)"""
+    record = f.readline()
+    while record.count(b'"') % 2:
+        more = f.readline()
+        if not more:
+            break
+        record += more
+    return record
+
+
+def _parse_record(record: bytes) -> List[str]:
+    """Split one raw CSV record into its fields"""
+    return next(csv.reader(io.StringIO(record.decode('utf-8'), newline='')), [])
+
+
+def _row_dict(header: List[str], values: List[str]) -> Dict:
+    """Map a record's fields to the header, padding short rows like csv.DictReader"""
+    if len(values) < len(header):
+        values = values + [None] * (len(header) - len(values))
+    return dict(zip(header, values))
+
+
+class _Index:
+    """
+    Byte offsets of the rows of one CSV file, grouped by key columns
+
+    Lookups seek straight to the matching rows instead of scanning the file.
+    The index follows the file's inode, size and mtime: appended rows are
+    indexed incrementally (when the bytes before the indexed end are
+    unchanged), any other change triggers a rebuild. With an
+    id_column it also tracks the largest integer ID, for generating the next.
+    """
+
+    def __init__(self, file_path: Path, keys: Dict[str, Tuple[str, ...]],
+                 id_column: Optional[str] = None):
+        self.file_path = file_path
+        self.keys = keys
+        self.id_column = id_column
+        self.id_position = -1
+        self.max_id = 0
+        self.lock = threading.Lock()
+        self.stamp = None
+        self.complete = True
+        self.end = 0
+        self.tail = b""  # The last bytes indexed, to tell appends from rewrites
+        self.header: List[str] = []
+        self.positions: Dict[str, Tuple[int, ...]] = {}
+        self.offsets: Dict[str, Dict[tuple, List[int]]] = {}
+        # Rows already parsed, by offset (offsets stay valid across appends)
+        self.rows: Dict[int, Dict] = {}
+        # Values derived from a key's rows (see memo); dropped on any change
+        self.derived: Dict[tuple, Any] = {}
+        self.key_positions = frozenset()
+
+    def _refresh(self):
+        """Bring the index up to date with the file (caller holds self.lock)"""
+        st = os.stat(self.file_path)
+        stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+        if stamp == self.stamp:
+            return
+
+        self.derived = {}
+
+        appended = (self.stamp is not None and self.complete
+                    and st.st_ino == self.stamp[0] and st.st_size > self.stamp[1]
+                    and self._tail_matches())
+
+        if not appended:
+            self.header = []
+            self.positions = {name: () for name in self.keys}
+            self.offsets = {name: {} for name in self.keys}
+            self.rows = {}
+            self.complete = True
+            self.end = 0
+            self.tail = b""
+            self.max_id = 0
+
+        if st.st_size > 0:
+            # mmap: readline() finds newlines with memchr over the mapped
+            # pages, without going through the buffered file layer
+            with open(self.file_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if appended:
+                    mm.seek(self.end)
+                else:
+                    self.header = _parse_record(_read_record(mm))
+                    columns = {col: i for i, col in enumerate(self.header)}
+                    self.positions = {name: tuple(columns.get(col, -1) for col in cols)
+                                      for name, cols in self.keys.items()}
+                    self.id_position = columns.get(self.id_column, -1)
+                    self.key_positions = frozenset(
+                        i for positions in self.positions.values() for i in positions if i >= 0
+                    ) | ({self.id_position} if self.id_position >= 0 else set())
+                self._scan(mm)
+                self.tail = mm[max(0, self.end - INDEX_TAIL_BYTES):self.end]
+
+        self.stamp = stamp
+
+    def _tail_matches(self) -> bool:
+        """Check that the bytes before the indexed end are unchanged"""
+        with open(self.file_path, 'rb') as f:
+            f.seek(self.end - len(self.tail))
+            return f.read(len(self.tail)) == self.tail
+
+    def _scan(self, f):
+        """Index every record from the current position to EOF"""
+        while True:
+            start = f.tell()
+            record = _read_record(f)
+            if not record:
+                break
+            # A last row without a newline may still be growing: rebuild
+            # rather than extend next time
+            self.complete = record.endswith(b"\n")
+            self.end = f.tell()
+
+            # Only key columns are needed here: split unquoted records
+            # directly instead of running them through csv.reader, and
+            # decode just the key fields
+            if b'"' in record:
+                fields = _parse_record(record)
+                if not fields:
+                    continue
+                values = {i: fields[i] for i in self.key_positions if i < len(fields)}
+            else:
+                line = record.rstrip(b"\r\n")
+                if not line:
+                    continue
+                fields = line.split(b',')
+                values = {i: fields[i].decode('utf-8')
+                          for i in self.key_positions if i < len(fields)}
+            for name, positions in self.positions.items():
+                key = tuple(values.get(i) for i in positions)
+                self.offsets[name].setdefault(key, []).append(start)
+
+            row_id = values.get(self.id_position)
+            if row_id and row_id.isdigit():
+                self.max_id = max(self.max_id, int(row_id))
+
+    def _row(self, values: List[str]) -> Dict:
+        """Map a record's fields to the header like csv.DictReader"""
+        return _row_dict(self.header, values)
+
+    def find(self, name: str, *key: str, limit: Optional[int] = None,
+             copy: bool = True) -> List[Dict]:
+        """
+        Rows whose key columns `name` equal `key`, in file order
+
+        copy=False returns the cached row dicts themselves; only for callers
+        that don't modify or hand them out.
+        """
+        if not self.file_path.exists():
+            return []
+
+        with self.lock:
+            self._refresh()
+            rows = self._rows_for(name, key, limit)
+            # Copies, so callers can't modify the cached rows
+            if not copy:
+                return rows
+            return [dict(row) for row in rows]
+
+    def _rows_for(self, name: str, key: tuple, limit: Optional[int] = None) -> List[Dict]:
+        """Cached rows for a key, parsing any not seen yet (caller holds self.lock)"""
+        offsets = self.offsets[name].get(key, [])[:limit]
+        missing = [offset for offset in offsets if offset not in self.rows]
+        if missing:
+            with open(self.file_path, 'rb') as f:
+                for offset in missing:
+                    f.seek(offset)
+                    self.rows[offset] = self._row(_parse_record(_read_record(f)))
+        return [self.rows[offset] for offset in offsets]
+
+    def memo(self, tag: str, name: str, key: tuple, build: Callable[[List[Dict]], Any]) -> Any:
+        """
+        build(rows) for the rows matching a key, cached until the file changes
+
+        Used to parse typed columns once per file version instead of on
+        every call. The result is shared: treat it as read-only.
+        """
+        if not self.file_path.exists():
+            return build([])
+
+        with self.lock:
+            self._refresh()
+            cache_key = (tag, name, key)
+            if cache_key not in self.derived:
+                self.derived[cache_key] = build(self._rows_for(name, key))
+            return self.derived[cache_key]
+
+    def contains(self, name: str, *key: str) -> bool:
+        """Whether any row has `key` in key columns `name`"""
+        if not self.file_path.exists():
+            return False
+
+        with self.lock:
+            self._refresh()
+            return key in self.offsets[name]
+
+    def last_id(self) -> int:
+        """Largest integer in id_column (0 if the file is missing or empty)"""
+        if not self.file_path.exists():
+            return 0
+
+        with self.lock:
+            self._refresh()
+            return self.max_id
+
+
+# Indexes are shared by all callers in the process, one per file
+_indexes: Dict[Path, _Index] = {}
+_indexes_guard = threading.Lock()
+
+
+def _load_index(file_path: Path, keys: Dict[str, Tuple[str, ...]],
+                id_column: Optional[str] = None) -> _Index:
+    """Get the shared index for a file"""
+    with _indexes_guard:
+        index = _indexes.get(file_path)
+        if index is None:
+            index = _indexes[file_path] = _Index(file_path, keys, id_column)
+    return index
+
+
+def _exams_index() -> _Index:
+    """Index of exams.csv by exam_id"""
+    return _load_index(EXAMS_FILE, {"exam_id": ("exam_id",)})
+
+
+def _questions_index() -> _Index:
+    """Index of questions.csv by exam_id, tracking question_id"""
+    return _load_index(QUESTIONS_FILE, {"exam_id": ("exam_id",)}, id_column="question_id")
+
+
+def _submissions_index() -> _Index:
+    """Index of submissions.csv by exam/student, tracking submission_id"""
+    return _load_index(SUBMISSIONS_FILE, {
+        "exam_student": ("exam_id", "student_id"),
+        "student_id": ("student_id",),
+        "exam_id": ("exam_id",),
+    }, id_column="submission_id")
+
+
+def _student_answers_index() -> _Index:
+    """Index of student_answers.csv by submission_id"""
+    return _load_index(STUDENT_ANSWERS_FILE, {"submission_id": ("submission_id",)})
+
+
+# Per-file locks for check-then-append sequences
+_write_locks: Dict[Path, threading.Lock] = {}
+_write_locks_guard = threading.Lock()
+
+
+@contextmanager
+def _write_lock(file_path: Path):
+    """
+    Hold an exclusive lock on a file for a uniqueness check plus append
+
+    Serializes threads with an in-process lock and worker processes with an
+    OS lock on a .<file>.lock sidecar (fcntl, or msvcrt on Windows), so two
+    writers can't both pass a duplicate check, reuse an ID or interleave
+    their rows.
+    """
+    with _write_locks_guard:
+        thread_lock = _write_locks.setdefault(file_path, threading.Lock())
+
+    lock_path = file_path.parent / f".{file_path.name}.lock"
+    with thread_lock, open(lock_path, 'a+') as f:
+        if LOCK_AVAILABLE:
+            if sys.platform == 'win32':
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            else:
+                fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if LOCK_AVAILABLE:
+                if sys.platform == 'win32':
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _allocate_ids(index: _Index, count: int) -> int:
+    """
+    Reserve `count` consecutive integer IDs for a file; returns the first
+
+    The last allocated ID is kept in a .<file>.nextid sidecar that is
+    updated under an exclusive lock, so concurrent workers never hand out
+    the same ID. It is reconciled with the largest ID in the file in case
+    rows were added some other way.
+    """
+    counter_path = index.file_path.parent / f".{index.file_path.name}.nextid"
+    with _write_lock(counter_path), open(counter_path, 'a+', encoding='utf-8') as f:
+        f.seek(0)
+        stored = f.read().strip()
+        last = max(int(stored) if stored.isdigit() else 0, index.last_id())
+        f.seek(0)
+        f.truncate()
+        f.write(str(last + count))
+    return last + 1
+
+
+def _by_question_order(rows: List[Dict]) -> List[Tuple[int, Dict]]:
+    """(int question_order, row) pairs sorted by order (decorate-sort, key parsed once)"""
+    keyed = [(int(row['question_order']), row) for row in rows]
+    keyed.sort(key=itemgetter(0))
+    return keyed
+
+
+def _question_orders(exam_id: str) -> List[Tuple[int, Dict]]:
+    """(question_order as int, row) for an exam's questions, sorted once per file version"""
+    return _questions_index().memo("orders", "exam_id", (exam_id,), _by_question_order)
+
+
+def _scoring_columns(exam_id: str) -> Tuple[List[int], List[int], List[str]]:
+    """(orders, marks, correct options) of an exam's questions in question order"""
+    def build(rows):
+        ordered = _by_question_order(rows)
+        return ([order for order, _ in ordered],
+                [int(q['marks']) for _, q in ordered],
+                [q['correct_option'] for _, q in ordered])
+
+    return _questions_index().memo("scoring", "exam_id", (exam_id,), build)
+
+
+# Parsed rows of whole files, reused until the file changes
+_csv_cache: Dict[Path, Tuple[tuple, List[Dict]]] = {}
+
+
+def _read_cached(file_path: Path) -> List[Dict]:
+    """
+    All rows of a CSV file, parsed once per version of the file
+
+    The cache is keyed by inode, size and mtime, so any write invalidates
+    it. The returned rows are shared: copy them before modifying.
+    """
+    st = os.stat(file_path)
+    stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+    cached = _csv_cache.get(file_path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    if st.st_size == 0:
+        rows = []
+    elif POLARS_AVAILABLE:
+        # Parallel parse; all columns stay strings like csv.DictReader
+        rows = (pl.read_csv(file_path, infer_schema_length=0, truncate_ragged_lines=True)
+                .with_columns(pl.all().fill_null(""))
+                .to_dicts())
+    else:
+        rows = []
+        with open(file_path, 'r', newline='', encoding='utf-8',
+                  buffering=READ_BUFFER_SIZE) as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            for values in reader:
+                if values:
+                    rows.append(_row_dict(header, values))
+
+    _csv_cache[file_path] = (stamp, rows)
+    return rows
+
 
 class NormalizedCSVDB:
     """Interface for normalized CSV database operations"""
@@ -28,59 +485,29 @@ class NormalizedCSVDB:
         if not EXAMS_FILE.exists():
             return []
 
-        exams = []
-        with open(EXAMS_FILE, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if status is None or row.get('status') == status:
-                    exams.append(row)
-        return exams
+        return [dict(row) for row in _read_cached(EXAMS_FILE)
+                if status is None or row.get('status') == status]
 
     @staticmethod
     def get_exam(exam_id: str) -> Optional[Dict]:
         """Get exam by ID"""
-        if not EXAMS_FILE.exists():
-            return None
-
-        with open(EXAMS_FILE, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row['exam_id'] == exam_id:
-                    return row
-        return None
+        rows = _exams_index().find("exam_id", exam_id, limit=1)
+        return rows[0] if rows else None
 
     @staticmethod
     def create_exam(exam_data: Dict) -> bool:
         """Create a new exam"""
         try:
-            # Check if file exists
-            file_exists = EXAMS_FILE.exists()
-
-            # Read existing exams
-            existing_exams = []
-            if file_exists:
-                with open(EXAMS_FILE, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    existing_exams = list(reader)
+            _ensure_initialized()
 
-            # Check for duplicate exam_id
-            if any(e['exam_id'] == exam_data['exam_id'] for e in existing_exams):
-                print(f"Error: Exam {exam_data['exam_id']} already exists")
-                return False
+            with _write_lock(EXAMS_FILE):
+                # Check for duplicate exam_id
+                if _exams_index().contains("exam_id", exam_data['exam_id']):
+                    print(f"Error: Exam {exam_data['exam_id']} already exists")
+                    return False
 
-            # Add new exam
-            existing_exams.append(exam_data)
-
-            # Write back
-            with open(EXAMS_FILE, 'w', newline='', encoding='utf-8') as f:
-                fieldnames = [
-                    "exam_id", "exam_name", "subject", "duration_minutes",
-                    "passing_percentage", "question_count", "created_at",
-                    "created_by", "status", "allowed_students"
-                ]
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(existing_exams)
+                # Append new exam
+                _append_rows(EXAMS_FILE, EXAMS_FIELDS, [exam_data])
 
             return True
         except Exception as e:
@@ -106,52 +533,25 @@ class NormalizedCSVDB:
     @staticmethod
     def get_questions(exam_id: str) -> List[Dict]:
         """Get all questions for an exam, ordered by question_order"""
-        if not QUESTIONS_FILE.exists():
-            return []
-
-        questions = []
-        with open(QUESTIONS_FILE, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row['exam_id'] == exam_id:
-                    questions.append(row)
-
-        # Sort by question_order
-        questions.sort(key=lambda q: int(q['question_order']))
-        return questions
+        # Sorted by question_order once per version of questions.csv
+        return [dict(q) for _, q in _question_orders(exam_id)]
 
     @staticmethod
     def create_questions(questions: List[Dict]) -> bool:
         """Create multiple questions (bulk insert)"""
         try:
-            # Read existing questions
-            existing_questions = []
-            if QUESTIONS_FILE.exists():
-                with open(QUESTIONS_FILE, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    existing_questions = list(reader)
+            _ensure_initialized()
 
             # Generate question IDs
-            max_id = 0
-            if existing_questions:
-                max_id = max(int(q['question_id']) for q in existing_questions)
+            first_id = _allocate_ids(_questions_index(), len(questions))
 
-            for i, q in enumerate(questions, start=1):
+            for i, q in enumerate(questions):
                 if 'question_id' not in q:
-                    q['question_id'] = str(max_id + i)
+                    q['question_id'] = str(first_id + i)
 
-            # Add new questions
-            existing_questions.extend(questions)
-
-            # Write back
-            with open(QUESTIONS_FILE, 'w', newline='', encoding='utf-8') as f:
-                fieldnames = [
-                    "question_id", "exam_id", "question_order",
-                    "correct_option", "marks", "image_url"
-                ]
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(existing_questions)
+            # Append new questions
+            with _write_lock(QUESTIONS_FILE):
+                _append_rows(QUESTIONS_FILE, QUESTIONS_FIELDS, questions)
 
             return True
         except Exception as e:
@@ -161,56 +561,33 @@ class NormalizedCSVDB:
     @staticmethod
     def get_correct_answers(exam_id: str) -> Dict[int, str]:
         """Get correct answers for an exam as {question_order: correct_option}"""
-        questions = NormalizedCSVDB.get_questions(exam_id)
-        return {int(q['question_order']): q['correct_option'] for q in questions}
+        # Keyed by question_order, so no need for get_questions' sort or copies
+        return {order: q['correct_option'] for order, q in _question_orders(exam_id)}
 
     # ========== SUBMISSIONS ==========
 
     @staticmethod
     def get_submission(exam_id: str, student_id: str) -> Optional[Dict]:
         """Get a specific submission"""
-        if not SUBMISSIONS_FILE.exists():
-            return None
-
-        with open(SUBMISSIONS_FILE, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row['exam_id'] == exam_id and row['student_id'] == student_id:
-                    return row
-        return None
+        rows = _submissions_index().find(
+            "exam_student", exam_id, student_id, limit=1)
+        return rows[0] if rows else None
 
     @staticmethod
     def has_submitted(exam_id: str, student_id: str) -> bool:
         """Check if student has already submitted this exam"""
-        return NormalizedCSVDB.get_submission(exam_id, student_id) is not None
+        return _submissions_index().contains(
+            "exam_student", exam_id, student_id)
 
     @staticmethod
     def get_student_submissions(student_id: str) -> List[Dict]:
         """Get all submissions for a student"""
-        if not SUBMISSIONS_FILE.exists():
-            return []
-
-        submissions = []
-        with open(SUBMISSIONS_FILE, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row['student_id'] == student_id:
-                    submissions.append(row)
-        return submissions
+        return _submissions_index().find("student_id", student_id)
 
     @staticmethod
     def get_exam_submissions(exam_id: str) -> List[Dict]:
         """Get all submissions for an exam"""
-        if not SUBMISSIONS_FILE.exists():
-            return []
-
-        submissions = []
-        with open(SUBMISSIONS_FILE, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row['exam_id'] == exam_id:
-                    submissions.append(row)
-        return submissions
+        return _submissions_index().find("exam_id", exam_id)
 
     @staticmethod
     def create_submission(submission_data: Dict, answers: List[Dict]) -> bool:
@@ -220,63 +597,29 @@ class NormalizedCSVDB:
         answers: [{question_order, selected_option, is_correct}, ...]
         """
         try:
-            # Check for duplicate
-            if NormalizedCSVDB.has_submitted(submission_data['exam_id'],
-                                             submission_data['student_id']):
-                print(f"Error: Student {submission_data['student_id']} already submitted {submission_data['exam_id']}")
-                return False
-
-            # Read existing submissions
-            existing_submissions = []
-            if SUBMISSIONS_FILE.exists():
-                with open(SUBMISSIONS_FILE, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    existing_submissions = list(reader)
-
-            # Generate submission ID
-            max_id = 0
-            if existing_submissions:
-                max_id = max(int(s['submission_id']) for s in existing_submissions)
-            submission_id = max_id + 1
-            submission_data['submission_id'] = str(submission_id)
-
-            # Add submission
-            existing_submissions.append(submission_data)
-
-            # Write submissions
-            with open(SUBMISSIONS_FILE, 'w', newline='', encoding='utf-8') as f:
-                fieldnames = [
-                    "submission_id", "exam_id", "student_id", "submitted_at",
-                    "score", "total_marks", "time_taken_seconds",
-                    "ip_address", "device_info", "status"
-                ]
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(existing_submissions)
+            _ensure_initialized()
+
+            with _write_lock(SUBMISSIONS_FILE):
+                # Check for duplicate
+                if NormalizedCSVDB.has_submitted(submission_data['exam_id'],
+                                                 submission_data['student_id']):
+                    print(f"Error: Student {submission_data['student_id']} already submitted {submission_data['exam_id']}")
+                    return False
+
+                # Generate submission ID
+                submission_id = _allocate_ids(_submissions_index(), 1)
+                submission_data['submission_id'] = str(submission_id)
+
+                # Append submission
+                _append_rows(SUBMISSIONS_FILE, SUBMISSIONS_FIELDS, [submission_data])
 
             # Add submission_id to answers
             for answer in answers:
                 answer['submission_id'] = str(submission_id)
 
-            # Read existing answers
-            existing_answers = []
-            if STUDENT_ANSWERS_FILE.exists():
-                with open(STUDENT_ANSWERS_FILE, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    existing_answers = list(reader)
-
-            # Add new answers
-            existing_answers.extend(answers)
-
-            # Write answers
-            with open(STUDENT_ANSWERS_FILE, 'w', newline='', encoding='utf-8') as f:
-                fieldnames = [
-                    "submission_id", "question_order", "selected_option",
-                    "is_correct", "time_spent_seconds"
-                ]
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(existing_answers)
+            # Append answers
+            with _write_lock(STUDENT_ANSWERS_FILE):
+                _append_rows(STUDENT_ANSWERS_FILE, STUDENT_ANSWERS_FIELDS, answers)
 
             return True
         except Exception as e:
@@ -286,19 +629,11 @@ class NormalizedCSVDB:
     @staticmethod
     def get_student_answers(submission_id: str) -> List[Dict]:
         """Get all answers for a submission"""
-        if not STUDENT_ANSWERS_FILE.exists():
-            return []
-
-        answers = []
-        with open(STUDENT_ANSWERS_FILE, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row['submission_id'] == submission_id:
-                    answers.append(row)
+        answers = _student_answers_index().find(
+            "submission_id", submission_id)
 
         # Sort by question_order
-        answers.sort(key=lambda a: int(a['question_order']))
-        return answers
+        return [answer for _, answer in _by_question_order(answers)]
 
     # ========== UTILITY FUNCTIONS ==========
 
@@ -312,30 +647,24 @@ class NormalizedCSVDB:
         Returns:
             (score, total_marks, answer_details)
         """
-        questions = NormalizedCSVDB.get_questions(exam_id)
-        correct_answers = {int(q['question_order']): q['correct_option'] for q in questions}
-
-        score = 0
-        total_marks = 0
-        answer_details = []
-
-        for question in questions:
-            q_order = int(question['question_order'])
-            correct = question['correct_option']
-            marks = int(question['marks'])
-            selected = student_answers.get(q_order, '0')
-
-            is_correct = (selected == correct)
-            if is_correct:
-                score += marks
-            total_marks += marks
-
-            answer_details.append({
-                'question_order': str(q_order),
-                'selected_option': selected,
-                'is_correct': 'true' if is_correct else 'false',
+        # Typed columns, parsed once per version of questions.csv
+        orders, marks, correct = _scoring_columns(exam_id)
+
+        selected = [student_answers.get(o, '0') for o in orders]
+        hits = [s == c for s, c in zip(selected, correct)]
+
+        score = sum(m for m, hit in zip(marks, hits) if hit)
+        total_marks = sum(marks)
+
+        answer_details = [
+            {
+                'question_order': str(o),
+                'selected_option': s,
+                'is_correct': 'true' if hit else 'false',
                 'time_spent_seconds': ''
-            })
+            }
+            for o, s, hit in zip(orders, selected, hits)
+        ]
 
         return score, total_marks, answer_details
 
@@ -346,40 +675,23 @@ class NormalizedCSVDB:
         if not EXAMS_FILE.exists():
             with open(EXAMS_FILE, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                writer.writerow([
-                    "exam_id", "exam_name", "subject", "duration_minutes",
-                    "passing_percentage", "question_count", "created_at",
-                    "created_by", "status", "allowed_students"
-                ])
+                writer.writerow(EXAMS_FIELDS)
 
         # Create questions.csv
         if not QUESTIONS_FILE.exists():
             with open(QUESTIONS_FILE, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                writer.writerow([
-                    "question_id", "exam_id", "question_order",
-                    "correct_option", "marks", "image_url"
-                ])
+                writer.writerow(QUESTIONS_FIELDS)
 
         # Create submissions.csv
         if not SUBMISSIONS_FILE.exists():
             with open(SUBMISSIONS_FILE, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                writer.writerow([
-                    "submission_id", "exam_id", "student_id", "submitted_at",
-                    "score", "total_marks", "time_taken_seconds",
-                    "ip_address", "device_info", "status"
-                ])
+                writer.writerow(SUBMISSIONS_FIELDS)
 
         # Create student_answers.csv
         if not STUDENT_ANSWERS_FILE.exists():
             with open(STUDENT_ANSWERS_FILE, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                writer.writerow([
-                    "submission_id", "question_order", "selected_option",
-                    "is_correct", "time_spent_seconds"
-                ])
-
+                writer.writerow(STUDENT_ANSWERS_FIELDS)
 
-# Initialize files on import
-NormalizedCSVDB.initialize_files()
@@ -12,7 +12,7 @@ import sys
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from utils.csv_manager import get_csv_manager
+from utils.csv_manager import get_csv_manager, POLARS_AVAILABLE
 
 
 def example_1_create_session():
@@ -167,9 +167,11 @@ def example_5_submit_answers(attempt_id: str):
     correct_answers = {int(key["question_index"]): key["correct_option"]
                        for key in answer_keys}
 
-    # Create answer records
+    # Create answer records (one ID batch and timestamp for the whole sheet)
     answer_records = []
     correct_count = 0
+    answer_ids = manager.generate_id_batch("ANS", len(student_answers))
+    answered_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
     for i, selected_option in enumerate(student_answers):
         is_correct = selected_option == correct_answers.get(i, "")
@@ -177,13 +179,13 @@ def example_5_submit_answers(attempt_id: str):
             correct_count += 1
 
         answer_data = {
-            "answer_id": manager.generate_id("ANS"),
+            "answer_id": answer_ids[i],
             "attempt_id": attempt_id,
             "question_index": str(i),
             "selected_option": selected_option,
             "is_correct": "true" if is_correct else "false",
             "marks_awarded": "1" if is_correct else "0",
-            "answered_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "answered_at": answered_at,
             "version": "2.0"
         }
         answer_records.append(answer_data)
@@ -277,27 +279,45 @@ def example_7_analytics():
     manager = get_csv_manager("web/data")
 
     # Question difficulty analysis: Which questions are hardest?
-    answers = manager.read("answers")
-
-    question_stats = {}
-    for answer in answers:
-        q_index = int(answer.get("question_index", 0))
-        is_correct = answer.get("is_correct") == "true"
-
-        if q_index not in question_stats:
-            question_stats[q_index] = {"correct": 0, "total": 0}
-
-        question_stats[q_index]["total"] += 1
-        if is_correct:
-            question_stats[q_index]["correct"] += 1
+    if POLARS_AVAILABLE:
+        # Columnar path: the Parquet mirror lets the scan read only the two
+        # columns this report needs, and the whole aggregate runs in polars
+        import polars as pl
+
+        stats = (
+            pl.scan_parquet(manager.export_parquet("answers"))
+            .group_by(pl.col("question_index").cast(pl.Int64))
+            .agg(
+                (pl.col("is_correct") == "true").sum().alias("correct"),
+                pl.len().alias("total"),
+            )
+            .with_columns((pl.col("correct") / pl.col("total") * 100).alias("pct"))
+            .sort("question_index")
+            .collect()
+        )
+        difficulty_by_question = stats.select("question_index", "pct").rows()
+    else:
+        question_stats = {}
+        for answer in manager.read("answers"):
+            q_index = int(answer.get("question_index", 0))
+            is_correct = answer.get("is_correct") == "true"
+
+            if q_index not in question_stats:
+                question_stats[q_index] = {"correct": 0, "total": 0}
+
+            question_stats[q_index]["total"] += 1
+            if is_correct:
+                question_stats[q_index]["correct"] += 1
+
+        difficulty_by_question = [
+            (q_index, (stats["correct"] / stats["total"]) * 100)
+            for q_index, stats in sorted(question_stats.items())
+        ]
 
     print("Question Difficulty (% correct):")
-    for q_index in sorted(question_stats.keys()):
-        stats = question_stats[q_index]
-        if stats["total"] > 0:
-            pct = (stats["correct"] / stats["total"]) * 100
-            difficulty = "Easy" if pct > 70 else "Medium" if pct > 40 else "Hard"
-            print(f"  Q{q_index + 1}: {pct:.1f}% ({difficulty})")
+    for q_index, pct in difficulty_by_question:
+        difficulty = "Easy" if pct > 70 else "Medium" if pct > 40 else "Hard"
+        print(f"  Q{q_index + 1}: {pct:.1f}% ({difficulty})")
 
     print()
 
@@ -3,7 +3,7 @@
 Migration script: Old CSV structure → New normalized structure (v2.0)
 
 Usage:
-    python3 migrate_to_v2.py --source web/ --dest web/data/ [--dry-run]
+    python3 migrate_to_v2.py --source web/ --dest web/data/ [--dry-run] [--debug] [--workers N]
 
 This script:
 1. Backs up all existing CSV files
@@ -15,16 +15,252 @@ This script:
 import argparse
 import csv
 import hashlib
+import itertools
+import os
+import re
 import shutil
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List, Tuple
 
 # Add parent directory to path to import csv_manager
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from utils.csv_manager import CSVManager, SCHEMAS
+from utils.csv_manager import CSVManager, CSVValidationError, SCHEMAS
+
+# Optional: vectorized grading of answer sheets
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+# Buffer for CSV reads: far fewer syscalls than the 8 KiB default
+IO_BUFFER_SIZE = 1 << 20
+
+# Bengali answer options in the old answer sheets: ক=1, খ=2, গ=3, ঘ=4
+_OPTION_MAP = {"ক": "1", "খ": "2", "গ": "3", "ঘ": "4"}
+
+# Answer columns in the old sheets: Q1, Q2, ... (no leading zeros)
+_QUESTION_COLUMN = re.compile(r"Q([1-9]\d*)$")
+
+
+def _question_columns(header) -> List[Tuple[int, str]]:
+    """(question_index, column) for every Qn column in a header, by question number"""
+    matches = ((_QUESTION_COLUMN.match(name), name) for name in header)
+    return sorted({int(m.group(1)) - 1: name for m, name in matches if m}.items())
+
+
+def _clone_file(src: str, dst: str) -> str:
+    """
+    copytree copy_function that copies without a round trip through Python
+
+    os.copy_file_range lets the kernel share extents on reflink-capable
+    filesystems (Btrfs, XFS) and copy in-kernel elsewhere. Hard links are
+    not an option: app.py appends to answers_*.csv in place, and those
+    writes would show up in a linked backup.
+    """
+    if not hasattr(os, "copy_file_range"):
+        return shutil.copy2(src, dst)
+
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except OSError:
+        # Cross-device on older kernels, or unsupported filesystem
+        return shutil.copy2(src, dst)
+
+    if remaining > 0:
+        # Some filesystems (FUSE, procfs-style sources) report EOF early
+        # instead of failing; never keep a truncated backup
+        return shutil.copy2(src, dst)
+
+    shutil.copystat(src, dst)
+    return dst
+
+
+def _ordered_results(executor: ProcessPoolExecutor, fn, jobs: Iterable[tuple], window: int):
+    """
+    Run fn(*job) for each job on executor, yielding each future's result
+    getter in job order
+
+    At most window jobs are submitted ahead of the one being consumed, so
+    finished results don't pile up in memory when the consumer is slower.
+    """
+    jobs = iter(jobs)
+    pending = deque(executor.submit(fn, *job) for job in itertools.islice(jobs, window))
+    while pending:
+        future = pending.popleft()
+        for job in itertools.islice(jobs, 1):
+            pending.append(executor.submit(fn, *job))
+        yield future.result
+
+
+def _parse_answers_file(answers_file: Path, answer_key: str) -> List[Tuple[str, str, List[Tuple[str, str, str, str]]]]:
+    """
+    Parse one old answers_<session>.csv sheet and grade it
+
+    Top-level so it can run in a worker process. IDs are not assigned
+    here: the caller numbers answers and attempts in file order.
+
+    Args:
+        answers_file: Old-format answer sheet
+        answer_key: Answer key string for the sheet's session ("" if none)
+
+    Returns:
+        One (student_id, timestamp, answers) tuple per student row, where
+        answers holds (question_index, selected_option, is_correct,
+        marks_awarded) for every answered question
+    """
+    parsed = []
+    with open(answers_file, 'r', newline='', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f:
+        # Plain lists indexed by header position: no per-row dict
+        reader = csv.reader(f)
+        header = next(reader, [])
+        n_fields = len(header)
+        positions = {name: i for i, name in enumerate(header)}
+        student_pos = positions.get("Student_ID")
+        timestamp_pos = positions.get("Timestamp")
+
+        # Answer columns, each with its question_index label and correct
+        # option (None past the key's end)
+        q_columns = [
+            (str(question_index), positions[name],
+             answer_key[question_index] if question_index < len(answer_key) else None)
+            for question_index, name in _question_columns(header)
+        ]
+
+        for values in reader:
+            if not values:
+                continue  # Skip blank lines, like DictReader
+            if len(values) < n_fields:
+                values += [""] * (n_fields - len(values))
+
+            student_id = values[student_pos].strip() if student_pos is not None else ""
+            timestamp = values[timestamp_pos].strip() if timestamp_pos is not None else ""
+
+            # Extract individual answers (Q1, Q2, ...); blank cells are common
+            # and are dropped before any per-question work
+            answered = [(label, values[q_pos], correct)
+                        for label, q_pos, correct in q_columns if values[q_pos]]
+            answers = []
+            for label, selected_answer, correct in answered:
+                selected_answer = selected_answer.strip()
+
+                if selected_answer:
+                    selected_option = _OPTION_MAP.get(selected_answer, "")
+
+                    # Check if correct
+                    if selected_option == correct:
+                        answers.append((label, selected_option, "true", "1"))
+                    else:
+                        answers.append((label, selected_option, "false", "0"))
+
+            parsed.append((student_id, timestamp, answers))
+
+    return parsed
+
+
+def _grade_answers_frame(answers_file: Path, answer_key: str):
+    """
+    Vectorized _parse_answers_file: parse and grade a whole sheet in polars
+
+    Args:
+        answers_file: Old-format answer sheet
+        answer_key: Answer key string for the sheet's session ("" if none)
+
+    Returns:
+        (student_ids, graded) where student_ids has one entry per sheet row
+        and graded is a frame of (row, question_index, selected_option,
+        is_correct, marks_awarded, answered_at), one row per answered
+        question, in sheet order
+    """
+    sheet = pl.read_csv(answers_file, infer_schema_length=0, truncate_ragged_lines=True)
+    # Blank lines come back as all-null rows; csv.reader skips them
+    if sheet.width:
+        sheet = sheet.filter(~pl.all_horizontal(pl.all().is_null()))
+    sheet = sheet.with_columns(pl.all().fill_null(""))
+
+    columns = set(sheet.columns)
+    q_cols = [name for _, name in _question_columns(sheet.columns)]
+
+    def stripped(name):
+        return pl.col(name).str.strip_chars() if name in columns else pl.lit("")
+
+    sheet = sheet.select(
+        pl.int_range(pl.len()).alias("row"),
+        stripped("Student_ID").alias("student_id"),
+        stripped("Timestamp").alias("answered_at"),
+        *q_cols,
+    )
+    student_ids = sheet["student_id"].to_list()
+
+    # One row per (sheet row, Q column)
+    if hasattr(sheet, "unpivot"):
+        long = sheet.unpivot(on=q_cols, index=["row", "answered_at"],
+                             variable_name="question", value_name="selected")
+    else:  # polars < 1.0
+        long = sheet.melt(id_vars=["row", "answered_at"], value_vars=q_cols,
+                          variable_name="question", value_name="selected")
+
+    # Bengali option → "1".."4", anything else → ""
+    selected = pl.col("selected")
+    option = pl.lit("")
+    for bengali, number in _OPTION_MAP.items():
+        option = pl.when(selected == bengali).then(pl.lit(number)).otherwise(option)
+
+    key = pl.DataFrame(
+        {"question_index": list(range(len(answer_key))), "correct": list(answer_key)},
+        schema={"question_index": pl.Int64, "correct": pl.Utf8},
+    )
+    hit = pl.col("selected_option") == pl.col("correct")
+
+    graded = (
+        long
+        .with_columns(selected.str.strip_chars())
+        .filter(selected != "")
+        .with_columns(
+            (pl.col("question").str.slice(1).cast(pl.Int64) - 1).alias("question_index"),
+            option.alias("selected_option"),
+        )
+        .join(key, on="question_index", how="left")
+        .sort("row", "question_index")
+        .select(
+            "row",
+            pl.col("question_index").cast(pl.Utf8),
+            "selected_option",
+            pl.when(hit).then(pl.lit("true")).otherwise(pl.lit("false")).alias("is_correct"),
+            pl.when(hit).then(pl.lit("1")).otherwise(pl.lit("0")).alias("marks_awarded"),
+            "answered_at",
+        )
+    )
+    return student_ids, graded
+
+
+class _DryRunSink:
+    """Stands in for CSVManager.append_stream in dry-run mode: counts rows, writes nothing"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, row: Dict[str, str]):
+        self.count += 1
+
+    def write_rows(self, rows: Iterable[Dict[str, str]]):
+        self.count += sum(1 for _ in rows)
+
+    def write_frame(self, frame):
+        self.count += frame.height
 
 
 class MigrationStats:
@@ -61,15 +297,51 @@ class MigrationStats:
 class Migrator:
     """Handles migration from old to new CSV structure"""
 
-    def __init__(self, source_dir: Path, dest_dir: Path, dry_run: bool = False):
+    def __init__(self, source_dir: Path, dest_dir: Path, dry_run: bool = False,
+                 debug: bool = False, workers: int = None):
         self.source_dir = Path(source_dir)
         self.dest_dir = Path(dest_dir)
         self.dry_run = dry_run
+        # Validate every row against SCHEMAS (slower). The row builders
+        # only emit schema-valid rows, which debug runs check
+        self.debug = debug
+        # Processes used to parse answer sheets (1 = parse in-process)
+        self.workers = workers or os.cpu_count() or 1
         self.stats = MigrationStats()
         self.csv_manager = CSVManager(dest_dir)
 
-        # Track unique students
-        self.students_map: Dict[str, Dict] = {}
+        # Track unique students (an insertion-ordered set; their records
+        # are only built when written)
+        self._seen_students: Dict[str, None] = {}
+
+        # session_id → answer key string, read once per session
+        self._answer_key_cache: Dict[str, str] = {}
+
+        # Migration time, stamped on every created_at / registration_date
+        started_at = datetime.now()
+        self._now_str = started_at.strftime("%Y-%m-%d %H:%M:%S")
+        self._today_str = started_at.strftime("%Y-%m-%d")
+
+    @contextmanager
+    def _row_sink(self, schema_name: str):
+        """
+        Open a destination table for streaming appends
+
+        Yields the CSVManager.append_stream appender (locked, backed up and
+        audited like any other write): call it with one row, or use
+        write_rows / write_frame, so a migration step never holds a whole
+        table in memory. Rows are checked against the schema only in debug
+        mode, and nothing is written in dry-run mode.
+
+        Args:
+            schema_name: Schema of the destination table
+        """
+        if self.dry_run:
+            yield _DryRunSink()
+            return
+
+        with self.csv_manager.append_stream(schema_name, validate=self.debug) as sink:
+            yield sink
 
     def backup_source(self):
         """Create backup of source directory"""
@@ -82,18 +354,21 @@ class Migrator:
             shutil.copytree(
                 self.source_dir / "answers",
                 backup_dir / "answers",
-                ignore=shutil.ignore_patterns("*.pyc", "__pycache__")
+                ignore=shutil.ignore_patterns("*.pyc", "__pycache__"),
+                copy_function=_clone_file
             )
             shutil.copytree(
                 self.source_dir / "answer_keys",
                 backup_dir / "answer_keys",
-                ignore=shutil.ignore_patterns("*.pyc", "__pycache__")
+                ignore=shutil.ignore_patterns("*.pyc", "__pycache__"),
+                copy_function=_clone_file
             )
             if (self.source_dir / "sessions").exists():
                 shutil.copytree(
                     self.source_dir / "sessions",
                     backup_dir / "sessions",
-                    ignore=shutil.ignore_patterns("*.pyc", "__pycache__")
+                    ignore=shutil.ignore_patterns("*.pyc", "__pycache__"),
+                    copy_function=_clone_file
                 )
 
         print(f"✓ Backup created: {backup_dir}\n")
@@ -120,15 +395,27 @@ class Migrator:
             if not pdf_dir.exists():
                 continue
 
-            # Count questions
-            question_count = len(list(pdf_dir.glob("snippet_*.pdf")))
+            # One directory pass: all PDF names for the hash, snippets counted
+            pdf_names = []
+            question_count = 0
+            with os.scandir(pdf_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if name.endswith(".pdf"):
+                        pdf_names.append(name)
+                        if name.startswith("snippet_"):
+                            question_count += 1
+
+            # Skip sessions without any question snippets
             if question_count == 0:
                 continue
 
-            # Generate content hash (for cache invalidation)
-            content_hash = hashlib.md5(
-                "".join([p.name for p in sorted(pdf_dir.glob("*.pdf"))]).encode()
-            ).hexdigest()[:16]
+            # Generate content hash (for cache invalidation); names are fed
+            # one at a time, giving the same digest as hashing them joined
+            hasher = hashlib.md5()
+            for name in sorted(pdf_names):
+                hasher.update(name.encode())
+            content_hash = hasher.hexdigest()[:16]
 
             # Get creation time
             try:
@@ -154,7 +441,7 @@ class Migrator:
 
         # Write all sessions
         if sessions_to_create and not self.dry_run:
-            self.csv_manager.write("sessions", sessions_to_create, mode='append', validate=True)
+            self.csv_manager.write("sessions", sessions_to_create, mode='append', validate=self.debug)
 
         print(f"  ✓ Migrated {len(sessions_to_create)} sessions\n")
 
@@ -167,68 +454,78 @@ class Migrator:
             print("  No answer_keys/ directory found, skipping...\n")
             return
 
-        all_answer_keys = []
         answer_key_id_counter = 1
 
-        for answer_key_file in answer_keys_dir.glob("answer_key_*.csv"):
-            try:
-                # Extract session_id from filename
-                session_id = answer_key_file.stem.replace("answer_key_", "")
-
-                with open(answer_key_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        answer_key_str = row.get("Answer_Key", "").strip()
-
-                        # Convert answer key string to individual rows
-                        # e.g., "1234" → 4 rows (one per question)
-                        for question_index, correct_option in enumerate(answer_key_str):
-                            if correct_option in "1234":
-                                answer_key_data = {
-                                    "answer_key_id": f"AK{answer_key_id_counter:06d}",
-                                    "session_id": session_id,
-                                    "question_index": str(question_index),
-                                    "correct_option": correct_option,
-                                    "marks": "1",  # Default 1 mark per question
-                                    "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                                    "version": "2.0"
-                                }
-                                all_answer_keys.append(answer_key_data)
-                                answer_key_id_counter += 1
-
-                self.stats.answer_keys_migrated += 1
-
-            except Exception as e:
-                error_msg = f"Error processing {answer_key_file.name}: {e}"
-                print(f"  ⚠ {error_msg}")
-                self.stats.errors.append(error_msg)
-
-        # Write all answer keys
-        if all_answer_keys and not self.dry_run:
-            self.csv_manager.write("answer_keys", all_answer_keys, mode='append', validate=True)
+        with self._row_sink("answer_keys") as emit:
+            for answer_key_file in answer_keys_dir.glob("answer_key_*.csv"):
+                try:
+                    # Extract session_id from filename
+                    session_id = answer_key_file.stem.replace("answer_key_", "")
+
+                    with open(answer_key_file, 'r', newline='', encoding='utf-8') as f:
+                        reader = csv.DictReader(f)
+                        for row in reader:
+                            answer_key_str = row.get("Answer_Key", "").strip()
+
+                            # Convert answer key string to individual rows
+                            # e.g., "1234" → 4 rows (one per question)
+                            for question_index, correct_option in enumerate(answer_key_str):
+                                if correct_option in "1234":
+                                    emit({
+                                        "answer_key_id": "AK" + str(answer_key_id_counter).zfill(6),
+                                        "session_id": session_id,
+                                        "question_index": str(question_index),
+                                        "correct_option": correct_option,
+                                        "marks": "1",  # Default 1 mark per question
+                                        "created_at": self._now_str,
+                                        "version": "2.0"
+                                    })
+                                    answer_key_id_counter += 1
+
+                    self.stats.answer_keys_migrated += 1
+
+                except CSVValidationError:
+                    raise
+                except Exception as e:
+                    error_msg = f"Error processing {answer_key_file.name}: {e}"
+                    print(f"  ⚠ {error_msg}")
+                    self.stats.errors.append(error_msg)
 
         print(f"  ✓ Migrated {self.stats.answer_keys_migrated} answer key files")
-        print(f"    ({len(all_answer_keys)} individual question answers)\n")
+        print(f"    ({answer_key_id_counter - 1} individual question answers)\n")
 
-    def migrate_student_sessions(self):
-        """Migrate exam_sessions.csv to student_sessions.csv"""
+    def migrate_student_sessions(self) -> Dict[str, Dict[str, str]]:
+        """
+        Migrate exam_sessions.csv to student_sessions.csv
+
+        Returns:
+            session_id → {student_id → attempt_id} for every migrated attempt
+        """
         print("Migrating student sessions...")
 
         sessions_file = self.source_dir / "sessions" / "exam_sessions.csv"
         if not sessions_file.exists():
             print("  No exam_sessions.csv found, skipping...\n")
-            return
+            return {}
 
-        student_sessions = []
+        attempts_by_session = {}
         attempt_id_counter = 1
 
-        with open(sessions_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
+        with open(sessions_file, 'r', newline='', encoding='utf-8', buffering=IO_BUFFER_SIZE) as f, \
+                self._row_sink("student_sessions") as emit:
+            # Plain lists indexed by header position: no per-row dict
+            reader = csv.reader(f)
+            positions = {name: i for i, name in enumerate(next(reader, []))}
+            wanted = [positions.get(name) for name in ("Student_ID", "Session_ID", "Start_Time")]
+
+            for values in reader:
+                if not values:
+                    continue  # Skip blank lines, like DictReader
                 try:
-                    student_id = row.get("Student_ID", "").strip()
-                    session_id = row.get("Session_ID", "").strip()
-                    start_time = row.get("Start_Time", "").strip()
+                    student_id, session_id, start_time = [
+                        values[pos].strip() if pos is not None and pos < len(values) else ""
+                        for pos in wanted
+                    ]
 
                     if not student_id or not session_id:
                         continue
@@ -238,7 +535,7 @@ class Migrator:
 
                     # Create student session record
                     session_data = {
-                        "attempt_id": f"ATT{attempt_id_counter:06d}",
+                        "attempt_id": "ATT" + str(attempt_id_counter).zfill(6),
                         "student_id": student_id,
                         "session_id": session_id,
                         "exam_id": "MIGRATED",  # We don't have exam_id in old structure
@@ -251,22 +548,21 @@ class Migrator:
                         "version": "2.0"
                     }
 
-                    student_sessions.append(session_data)
+                    emit(session_data)
+                    attempts_by_session.setdefault(session_id, {})[student_id] = session_data["attempt_id"]
                     attempt_id_counter += 1
                     self.stats.student_sessions_migrated += 1
 
+                except CSVValidationError:
+                    raise
                 except Exception as e:
                     error_msg = f"Error processing session row: {e}"
                     self.stats.errors.append(error_msg)
 
-        # Write all student sessions
-        if student_sessions and not self.dry_run:
-            self.csv_manager.write("student_sessions", student_sessions, mode='append', validate=True)
+        print(f"  ✓ Migrated {self.stats.student_sessions_migrated} student sessions\n")
+        return attempts_by_session
 
-        print(f"  ✓ Migrated {len(student_sessions)} student sessions\n")
-        return student_sessions
-
-    def migrate_answers(self, student_sessions: List[Dict]):
+    def migrate_answers(self, attempts_by_session: Dict[str, Dict[str, str]]):
         """Migrate individual answers from answers/*.csv to transactions/answers.csv"""
         print("Migrating student answers...")
 
@@ -275,128 +571,174 @@ class Migrator:
             print("  No answers/ directory found, skipping...\n")
             return
 
-        # Create lookup: (student_id, session_id) → attempt_id
-        attempt_lookup = {}
-        for session in student_sessions:
-            key = (session["student_id"], session["session_id"])
-            attempt_lookup[key] = session["attempt_id"]
-
-        all_answers = []
+        # Attempts created below are numbered after all the migrated ones
+        attempt_count = sum(map(len, attempts_by_session.values()))
         answer_id_counter = 1
 
-        for answers_file in answers_dir.glob("answers_*.csv"):
-            try:
-                # Extract session_id from filename
-                session_id = answers_file.stem.replace("answers_", "")
-
-                with open(answers_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        student_id = row.get("Student_ID", "").strip()
-                        timestamp = row.get("Timestamp", "").strip()
-
-                        # Find attempt_id
-                        attempt_id = attempt_lookup.get((student_id, session_id))
-                        if not attempt_id:
-                            # Create a new attempt if not found
-                            attempt_id = f"ATT{len(attempt_lookup) + 1:06d}"
-                            attempt_lookup[(student_id, session_id)] = attempt_id
-                            self._register_student(student_id)
-
-                        # Get answer key for validation
-                        answer_key = self._get_answer_key(session_id)
-
-                        # Extract individual answers (Q1, Q2, ...)
-                        question_index = 0
-                        while f"Q{question_index + 1}" in row:
-                            q_col = f"Q{question_index + 1}"
-                            selected_answer = row.get(q_col, "").strip()
-
-                            if selected_answer:
-                                # Map Bengali options to numbers: ক=1, খ=2, গ=3, ঘ=4
-                                option_map = {"ক": "1", "খ": "2", "গ": "3", "ঘ": "4"}
-                                selected_option = option_map.get(selected_answer, "")
-
-                                # Check if correct
-                                is_correct = "false"
-                                marks_awarded = "0"
-                                if answer_key and question_index < len(answer_key):
-                                    if selected_option == answer_key[question_index]:
-                                        is_correct = "true"
-                                        marks_awarded = "1"
-
-                                answer_data = {
-                                    "answer_id": f"ANS{answer_id_counter:08d}",
-                                    "attempt_id": attempt_id,
-                                    "question_index": str(question_index),
-                                    "selected_option": selected_option,
-                                    "is_correct": is_correct,
-                                    "marks_awarded": marks_awarded,
-                                    "answered_at": timestamp,
-                                    "version": "2.0"
-                                }
-
-                                all_answers.append(answer_data)
-                                answer_id_counter += 1
-
-                            question_index += 1
-
-            except Exception as e:
-                error_msg = f"Error processing {answers_file.name}: {e}"
-                print(f"  ⚠ {error_msg}")
-                self.stats.errors.append(error_msg)
-
-        self.stats.answers_migrated = len(all_answers)
-
-        # Write all answers
-        if all_answers and not self.dry_run:
-            # Write in batches to avoid memory issues
-            batch_size = 5000
-            for i in range(0, len(all_answers), batch_size):
-                batch = all_answers[i:i + batch_size]
-                self.csv_manager.write("answers", batch, mode='append', validate=True)
-
-        print(f"  ✓ Migrated {len(all_answers)} individual answers\n")
+        answer_files = list(answers_dir.glob("answers_*.csv"))
+        jobs = [
+            (answers_file, self._get_answer_key(answers_file.stem.replace("answers_", "")))
+            for answers_file in answer_files
+        ]
+
+        # With polars each sheet is graded as one frame (polars already uses
+        # every core); debug runs keep the row path so each row is validated
+        use_polars = POLARS_AVAILABLE and not self.debug
+
+        # Otherwise sheets are parsed in parallel, but consumed in file order
+        # so the answer and attempt numbering doesn't depend on scheduling
+        executor = None
+        if use_polars:
+            results = [partial(_grade_answers_frame, *job) for job in jobs]
+        elif self.workers > 1 and len(jobs) > 1:
+            executor = ProcessPoolExecutor(max_workers=min(self.workers, len(jobs)))
+            # A bounded window of sheets in flight, dropped once written
+            results = _ordered_results(executor, _parse_answers_file, jobs, self.workers * 2)
+        else:
+            results = [partial(_parse_answers_file, *job) for job in jobs]
+
+        session_attempts: Dict[str, str] = {}
+
+        def attempt_for(student_id: str) -> str:
+            """Attempt for a student in the current sheet's session, created if missing"""
+            nonlocal attempt_count
+            attempt_id = session_attempts.get(student_id)
+            if not attempt_id:
+                # Create a new attempt if not found
+                attempt_count += 1
+                attempt_id = "ATT" + str(attempt_count).zfill(6)
+                session_attempts[student_id] = attempt_id
+                self._register_student(student_id)
+            return attempt_id
+
+        def sheet_rows(parsed):
+            """answers.csv rows for one parsed sheet, numbered from answer_id_counter"""
+            nonlocal answer_id_counter
+            for student_id, timestamp, answers in parsed:
+                attempt_id = attempt_for(student_id)
+
+                for question_index, selected_option, is_correct, marks_awarded in answers:
+                    answer_id = "ANS" + str(answer_id_counter).zfill(8)
+                    answer_id_counter += 1
+                    yield {
+                        "answer_id": answer_id,
+                        "attempt_id": attempt_id,
+                        "question_index": question_index,
+                        "selected_option": selected_option,
+                        "is_correct": is_correct,
+                        "marks_awarded": marks_awarded,
+                        "answered_at": timestamp,
+                        "version": "2.0"
+                    }
+
+        # Each answer is written as soon as its sheet is parsed, so memory
+        # stays flat however many session files there are
+        try:
+            with self._row_sink("answers") as emit:
+                for (answers_file, answer_key), get_parsed in zip(jobs, results):
+                    try:
+                        # Extract session_id from filename
+                        session_id = answers_file.stem.replace("answers_", "")
+
+                        # This session's attempts by student, so rows look up one
+                        # string key (copied: new attempts must not leak to the caller)
+                        session_attempts = dict(attempts_by_session.get(session_id, {}))
+
+                        graded = None
+                        if use_polars:
+                            try:
+                                student_ids, graded = get_parsed()
+                            except Exception:
+                                pass  # Left to the csv module parser, which reports real errors
+
+                        if graded is not None:
+                            row_attempts = pl.Series([attempt_for(sid) for sid in student_ids], dtype=pl.Utf8)
+                            emit.write_frame(graded.with_columns(
+                                (pl.lit("ANS") + (pl.int_range(pl.len()) + answer_id_counter)
+                                 .cast(pl.Utf8).str.zfill(8)).alias("answer_id"),
+                                row_attempts.gather(graded["row"]).alias("attempt_id"),
+                                pl.lit("2.0").alias("version"),
+                            ))
+                            answer_id_counter += graded.height
+                            continue
+
+                        parsed = (_parse_answers_file(answers_file, answer_key) if use_polars
+                                  else get_parsed())
+                        emit.write_rows(sheet_rows(parsed))
+                        # Release the written sheet before the next one arrives
+                        parsed = get_parsed = None
+
+                    except CSVValidationError:
+                        raise
+                    except Exception as e:
+                        error_msg = f"Error processing {answers_file.name}: {e}"
+                        print(f"  ⚠ {error_msg}")
+                        self.stats.errors.append(error_msg)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        self.stats.answers_migrated = answer_id_counter - 1
+
+        print(f"  ✓ Migrated {self.stats.answers_migrated} individual answers\n")
 
     def _register_student(self, student_id: str):
         """Register a student if not already registered"""
-        if student_id in self.students_map:
+        if student_id in self._seen_students:
             return
 
-        student_data = {
+        self._seen_students[student_id] = None
+        self.stats.students_created += 1
+
+    def _student_record(self, student_id: str) -> Dict[str, str]:
+        """Placeholder students.csv record for a migrated student"""
+        return {
             "student_id": student_id,
             "name": f"Student {student_id}",  # Placeholder
             "email": f"{student_id}@placeholder.com",
             "institution": "Unknown",
             "batch": "Unknown",
-            "registration_date": datetime.now().strftime("%Y-%m-%d"),
+            "registration_date": self._today_str,
             "status": "active",
             "version": "2.0"
         }
 
-        self.students_map[student_id] = student_data
-        self.stats.students_created += 1
-
     def _get_answer_key(self, session_id: str) -> str:
-        """Get answer key string for a session from old format"""
+        """Get answer key string for a session from old format (cached)"""
+        answer_key = self._answer_key_cache.get(session_id)
+        if answer_key is None:
+            answer_key = self._read_answer_key(session_id)
+            self._answer_key_cache[session_id] = answer_key
+        return answer_key
+
+    def _read_answer_key(self, session_id: str) -> str:
+        """Read answer key string for a session from answer_keys/"""
         answer_key_file = self.source_dir / "answer_keys" / f"answer_key_{session_id}.csv"
         if not answer_key_file.exists():
             return ""
 
         try:
-            with open(answer_key_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    return row.get("Answer_Key", "").strip()
+            with open(answer_key_file, 'r', newline='', encoding='utf-8') as f:
+                # Header plus the first data row; no DictReader needed for one value
+                reader = csv.reader(f)
+                header = next(reader, [])
+                if "Answer_Key" not in header:
+                    return ""
+                idx = header.index("Answer_Key")
+                for values in reader:
+                    if values:  # Skip blank lines, like DictReader
+                        return values[idx].strip() if idx < len(values) else ""
         except:
-            return ""
+            pass
+        return ""
 
     def write_students(self):
         """Write all registered students to CSV"""
-        if self.students_map and not self.dry_run:
-            students_list = list(self.students_map.values())
-            self.csv_manager.write("students", students_list, mode='append', validate=True)
-            print(f"✓ Created {len(students_list)} student records\n")
+        if self._seen_students and not self.dry_run:
+            with self._row_sink("students") as emit:
+                for student_id in self._seen_students:
+                    emit(self._student_record(student_id))
+            print(f"✓ Created {emit.count} student records\n")
 
     def validate_migration(self):
         """Validate migrated data"""
@@ -422,9 +764,11 @@ class Migrator:
                     print(f"  ✗ Missing file: {file_path}")
                     return False
                 else:
-                    # Count rows
-                    with open(full_path, 'r', encoding='utf-8') as f:
-                        row_count = sum(1 for _ in csv.reader(f)) - 1  # Exclude header
+                    # Count rows by counting newlines in buffer-sized blocks (no CSV
+                    # parsing; migrated values never contain line breaks)
+                    with open(full_path, 'rb') as f:
+                        row_count = sum(block.count(b"\n")
+                                        for block in iter(lambda: f.read(IO_BUFFER_SIZE), b"")) - 1  # Exclude header
                     print(f"  ✓ {file_path}: {row_count} rows")
 
             print("\n✓ Validation passed!\n")
@@ -468,6 +812,7 @@ echo "Old structure restored from: {backup_dir}"
         print(f"Source: {self.source_dir}")
         print(f"Destination: {self.dest_dir}")
         print(f"Dry run: {self.dry_run}")
+        print(f"Debug (validate rows): {self.debug}")
         print("=" * 60 + "\n")
 
         if self.dry_run:
@@ -483,11 +828,11 @@ echo "Old structure restored from: {backup_dir}"
         self.migrate_answer_keys()
 
         # Step 4: Migrate student sessions
-        student_sessions = self.migrate_student_sessions()
+        attempts_by_session = self.migrate_student_sessions()
 
         # Step 5: Migrate answers
-        if student_sessions:
-            self.migrate_answers(student_sessions)
+        if attempts_by_session:
+            self.migrate_answers(attempts_by_session)
 
         # Step 6: Write students
         self.write_students()
@@ -533,6 +878,17 @@ def main():
         action="store_true",
         help="Run migration without writing files (test mode)"
     )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Validate every migrated row against its schema (slower)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes for parsing answer sheets (default: CPU count, 1 = no pool)"
+    )
 
     args = parser.parse_args()
 
@@ -540,7 +896,9 @@ def main():
     migrator = Migrator(
         source_dir=Path(args.source),
         dest_dir=Path(args.dest),
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        debug=args.debug,
+        workers=args.workers
     )
 
     success = migrator.run()
@@ -12,29 +12,287 @@ Features:
 - Better user feedback
 """
 
+import atexit
+import functools
+import hashlib
+import multiprocessing.util
+import os
 import re
+import shutil
 import subprocess
 import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
-import signal
-from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+# Optional vectorized multi-pattern scanning of compiler logs
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+
+# Compiled PDFs keyed by source hash, shared across compiler instances and
+# processes so repeat compiles of the same snippet skip the TeX run
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "robust_latex"
+DEFAULT_CACHE_ENTRIES = 512
+
+# Engine output is streamed and only its tail kept: the error context is at
+# the end, and nonstopmode logs of broken documents can run to megabytes
+LOG_TAIL_LINES = 4000
+LOG_READ_SIZE = 64 * 1024
+
+# How often a running engine checks whether a raced strategy has already won
+CANCEL_POLL_SECONDS = 0.1
+
+# Per-process parents for build directories, created on first use. Builds
+# go to tmpfs when it has room, since engines rewrite .aux/.log every pass.
+SHM_DIR = Path('/dev/shm')
+SHM_MIN_FREE = 64 * 1024 * 1024
+_scratch: Dict[Tuple[int, bool], Path] = {}
+_scratch_lock = threading.Lock()
+
+
+# Log-parsing patterns, compiled once at import (every strategy retry scans
+# the log with all of them). Missing .sty/.cls files and package errors share
+# one alternation so the log is walked once.
+_MISSING_PATTERNS = [
+    r"! LaTeX Error: File `(?P<sty>[^']+)\.sty' not found",
+    r"! LaTeX Error: File `(?P<cls>[^']+)\.cls' not found",
+    r"Package (?P<pkg>\w+) Error:",
+    r"! Package (?P<pkg2>\w+) not found",
+]
+_MISSING_RE = re.compile('|'.join(_MISSING_PATTERNS))
+
+# Error messages from most to least specific: (group, pattern, template,
+# prefix every match starts with). As one alternation the group that matched
+# picks the template.
+_ERROR_PATTERNS = [
+    ('latex', r'! LaTeX Error: (?P<latex>.+)', 'LaTeX Error: {}', r'! LaTeX Error: '),
+    ('bang', r'! (?P<bang>.+)', 'Error: {}', r'! '),
+    ('error', r'ERROR: (?P<error>.+)', 'Compilation Error: {}', r'ERROR: '),
+    ('fatal', r'Fatal error: (?P<fatal>.+)', 'Fatal Error: {}', r'Fatal error: '),
+    ('runaway', r'Runaway argument\?(?P<runaway>.+)', 'Runaway Argument: {}', r'Runaway argument\?'),
+    ('undefined', r'Undefined control sequence(?P<undefined>.+)', 'Undefined Command: {}',
+     r'Undefined control sequence'),
+    ('missing', r'Missing (?P<missing>.+)', 'Missing: {}', r'Missing '),
+    # "l.XXX" line number with context
+    ('line', r'l\.(?P<line_num>\d+)\s+(?P<line>.+)', None, r'l\.\d+\s'),
+]
+_ERROR_RE = re.compile('|'.join(pattern for _, pattern, _, _ in _ERROR_PATTERNS))
+_ERROR_TEMPLATES = {name: template for name, _, template, _ in _ERROR_PATTERNS}
+_ERROR_RANK = {name: rank for rank, (name, _, _, _) in enumerate(_ERROR_PATTERNS)}
+# Each branch on its own, by rank: finditer never overlaps matches, so a
+# match can hide a more specific one that starts later on the same line
+_ERROR_BRANCHES = [re.compile(pattern) for _, pattern, _, _ in _ERROR_PATTERNS]
+
+if HYPERSCAN_AVAILABLE:
+    # One database holds the missing-package patterns followed by the error
+    # prefixes; hits are confirmed and captured with the matching bytes regex
+    _HS_PATTERNS = _MISSING_PATTERNS + [prefix for _, _, _, prefix in _ERROR_PATTERNS]
+    _HS_MATCHERS = [re.compile(pattern.encode()) for pattern in _MISSING_PATTERNS] + [
+        re.compile(pattern.encode()) for _, pattern, _, _ in _ERROR_PATTERNS
+    ]
+    _HS_DB = hyperscan.Database()
+    _HS_DB.compile(
+        expressions=[pattern.encode() for pattern in _HS_PATTERNS],
+        ids=list(range(len(_HS_PATTERNS))),
+        elements=len(_HS_PATTERNS),
+        flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(_HS_PATTERNS),
+    )
+    _hs_local = threading.local()  # Scratch space is per thread
+
+# Box warnings are only checked near the end of the log
+_BOX_WARNING_TAIL = 16 * 1024
+
+_WARNING_RE = re.compile(r'(?:LaTeX Warning|Package \w+ Warning|Warning): (.+)')
+MAX_WARNINGS = 10
+
+_DOCCLASS_RE = re.compile(r'\\documentclass(\[.*?\])?\{.*?\}')
+_USEPACKAGE_RE = re.compile(r'\\usepackage(?:\[[^\]]*\])?\{([^}]+)\}')
+
+# Distinct documents whose syntax check result is memoized (validation is
+# pure, and the same snippet is validated again on every recompile)
+VALIDATION_CACHE_SIZE = 512
+
+# Distinct documents whose enhanced form is memoized (the same templates are
+# enhanced over and over)
+ENHANCE_CACHE_SIZE = 256
+
+
+def _remove_scratch(path: Path, owner_pid: int) -> None:
+    # Forked workers inherit the atexit hook; only the creator cleans up
+    if os.getpid() == owner_pid:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _remove_own_scratch() -> None:
+    """Remove every scratch directory this process created"""
+    pid = os.getpid()
+    with _scratch_lock:
+        paths = [path for (owner_pid, _), path in _scratch.items() if owner_pid == pid]
+    for path in paths:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _init_pool_worker() -> None:
+    """
+    ProcessPoolExecutor initializer for compile_many
+
+    Pool workers leave through os._exit(), so the atexit hook registered by
+    _scratch_root never runs in them; a multiprocessing finalizer does.
+    """
+    multiprocessing.util.Finalize(None, _remove_own_scratch, exitpriority=0)
+
+
+def _shm_usable() -> bool:
+    """True if /dev/shm is writable and has SHM_MIN_FREE bytes free"""
+    try:
+        stats = os.statvfs(SHM_DIR)
+    except (OSError, AttributeError):  # No /dev/shm, or no statvfs (Windows)
+        return False
+    return (os.access(SHM_DIR, os.W_OK)
+            and stats.f_bavail * stats.f_frsize >= SHM_MIN_FREE)
+
+
+def _scratch_root() -> Path:
+    """Return this process's scratch directory for LaTeX builds"""
+    on_shm = _shm_usable()
+    key = (os.getpid(), on_shm)
+    with _scratch_lock:
+        path = _scratch.get(key)
+        if path is None or not path.is_dir():
+            path = Path(tempfile.mkdtemp(prefix='rlc-', dir=SHM_DIR if on_shm else None))
+            _scratch[key] = path
+            atexit.register(_remove_scratch, path, os.getpid())
+        return path
+
+
+def _join_log(log_lines: deque) -> str:
+    """Decode the retained log tail once (TeX logs mix encodings)"""
+    return b''.join(log_lines).decode('utf-8', errors='replace')
+
+
+def _hs_scan(log_bytes: bytes) -> List[List[int]]:
+    """Return candidate start offsets per _HS_PATTERNS entry, in log order"""
+    scratch = getattr(_hs_local, 'scratch', None)
+    if scratch is None:
+        scratch = _hs_local.scratch = hyperscan.Scratch(_HS_DB)
+
+    starts = [[] for _ in _HS_PATTERNS]
+
+    def on_match(pattern_id, start, end, flags, context):
+        starts[pattern_id].append(start)
+
+    _HS_DB.scan(log_bytes, match_event_handler=on_match, scratch=scratch)
+    return starts
+
+
+def _hs_missing_packages(log_bytes: bytes, starts: List[List[int]]) -> List[str]:
+    """Package names from a _hs_scan result, deduplicated in log order"""
+    hits = sorted(
+        (start, pattern_id)
+        for pattern_id in range(len(_MISSING_PATTERNS))
+        for start in starts[pattern_id]
+    )
+    missing_packages = []
+    seen = set()
+    for start, pattern_id in hits:
+        match = _HS_MATCHERS[pattern_id].match(log_bytes, start)
+        if match:
+            pkg = match.group(match.lastgroup).decode('utf-8', errors='replace')
+            if pkg not in seen:
+                seen.add(pkg)
+                missing_packages.append(pkg)
+    return missing_packages
+
+
+def _hs_first_error(log_bytes: bytes, starts: List[List[int]]):
+    """First match of the most specific error pattern found, or None"""
+    offset = len(_MISSING_PATTERNS)
+    for rank in range(len(_ERROR_PATTERNS)):
+        for start in starts[offset + rank]:
+            match = _HS_MATCHERS[offset + rank].match(log_bytes, start)
+            if match:
+                return match
+    return None
+
+
+def _format_error(match) -> str:
+    """Render an _ERROR_RE (str) or _HS_MATCHERS (bytes) match"""
+    def text(group: str) -> str:
+        value = match.group(group)
+        if isinstance(value, bytes):
+            value = value.decode('utf-8', errors='replace')
+        return value
+
+    if match.lastgroup == 'line':
+        return f"Error at line {text('line_num')}: {text('line')[:100]}"
+    return _ERROR_TEMPLATES[match.lastgroup].format(text(match.lastgroup).strip()[:200])
 
 
 @dataclass
 class CompilationResult:
-    """Result of a LaTeX compilation"""
+    """
+    Result of a LaTeX compilation
+
+    Built with a _log_parser, warnings (on success) and error_message (on
+    failure, after _error_prefix) are parsed from log_content on first
+    access, so results nobody inspects never pay for the log scans.
+    """
     success: bool
     pdf_path: Optional[Path] = None
     error_message: Optional[str] = None
     warnings: List[str] = None
     log_content: Optional[str] = None
     compilation_time: float = 0.0
+    _log_parser: Optional['RobustLaTeXCompiler'] = field(default=None, repr=False, compare=False)
+    _error_prefix: str = field(default='', repr=False, compare=False)
+    # Warnings added before the log was parsed
+    _extra_warnings: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+
+    def _get_warnings(self) -> List[str]:
+        if self._warnings is None:
+            if self.success and self._log_parser is not None and self.log_content:
+                self._warnings = self._log_parser._extract_warnings_from_log(self.log_content)
+            else:
+                self._warnings = []
+            self._warnings.extend(self._extra_warnings)
+            self._extra_warnings = []
+        return self._warnings
+
+    def _set_warnings(self, value: Optional[List[str]]) -> None:
+        self._warnings = value
+        self._extra_warnings = []
+
+    def add_warnings(self, warnings: List[str]) -> None:
+        """Append warnings without forcing the log to be parsed"""
+        if self._warnings is None:
+            self._extra_warnings.extend(warnings)
+        else:
+            self._warnings.extend(warnings)
+
+    def _get_error_message(self) -> Optional[str]:
+        if (self._error_message is None and not self.success
+                and self._log_parser is not None and self.log_content is not None):
+            self._error_message = (
+                self._error_prefix + self._log_parser._extract_error_from_log(self.log_content)
+            )
+        return self._error_message
+
+    def _set_error_message(self, value: Optional[str]) -> None:
+        self._error_message = value
+
 
-    def __post_init__(self):
-        if self.warnings is None:
-            self.warnings = []
+# Installed after @dataclass has taken the field defaults from the class body
+CompilationResult.warnings = property(CompilationResult._get_warnings,
+                                      CompilationResult._set_warnings)
+CompilationResult.error_message = property(CompilationResult._get_error_message,
+                                           CompilationResult._set_error_message)
 
 
 class LaTeXValidator:
@@ -42,9 +300,16 @@ class LaTeXValidator:
 
     # Common LaTeX errors to catch early
     # Note: Complex environment matching is done separately
+    # Patterns start with a literal run so the engine can skip ahead to
+    # candidates instead of trying a match at every position
     VALIDATION_RULES = [
-        (r'\${3,}', 'Too many $ signs (use \\[ \\] or \\begin{{equation}})'),
-        (r'\\textbf\{[^}]*\\textbf', 'Nested \\textbf commands'),
+        (re.compile(r'\$\$\$+', re.MULTILINE | re.DOTALL),
+         'Too many $ signs (use \\[ \\] or \\begin{{equation}})'),
+        # Linear despite the backtracking: a start either matches (and the
+        # scan resumes past it) or fails within a brace group holding no
+        # other \textbf, so failed scans never overlap
+        (re.compile(r'\\textbf\{[^}]*\\textbf', re.MULTILINE | re.DOTALL),
+         'Nested \\textbf commands'),
     ]
 
     # Required packages for Bengali/Polyglossia
@@ -56,11 +321,18 @@ class LaTeXValidator:
         Validate LaTeX syntax before compilation
         Returns: (is_valid, list_of_errors)
         """
+        is_valid, errors = cls._check_syntax(latex_content)
+        return (is_valid, list(errors))
+
+    @classmethod
+    @functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+    def _check_syntax(cls, latex_content: str) -> Tuple[bool, Tuple[str, ...]]:
+        """Memoized validate_syntax; errors come back as a tuple"""
         errors = []
 
         # Check for basic syntax errors
         for pattern, error_template in cls.VALIDATION_RULES:
-            matches = re.finditer(pattern, latex_content, re.MULTILINE | re.DOTALL)
+            matches = pattern.finditer(latex_content)
             for match in matches:
                 try:
                     error_msg = error_template.format(match=match.group(0)[:50])
@@ -68,7 +340,9 @@ class LaTeXValidator:
                     error_msg = error_template
                 errors.append(error_msg)
 
-        # Check for balanced braces
+        # Check for balanced braces (str.count is a C-level scan; it beats a
+        # Python per-character loop, and encoding to bytes for numpy or a
+        # numba-compiled loop costs more than the three counts together)
         brace_count = latex_content.count('{') - latex_content.count('}')
         if brace_count != 0:
             errors.append(f"Unbalanced braces: {abs(brace_count)} {'extra {' if brace_count > 0 else 'extra }'}")
@@ -78,7 +352,7 @@ class LaTeXValidator:
         if dollar_count % 2 != 0:
             errors.append("Unbalanced math delimiters ($)")
 
-        return (len(errors) == 0, errors)
+        return (len(errors) == 0, tuple(errors))
 
     @classmethod
     def validate_packages(cls, latex_content: str) -> Tuple[bool, List[str]]:
@@ -97,23 +371,6 @@ class TimeoutError(Exception):
     pass
 
 
-@contextmanager
-def timeout(seconds: int):
-    """Context manager for timeout"""
-    def timeout_handler(signum, frame):
-        raise TimeoutError(f"Operation timed out after {seconds} seconds")
-
-    # Set up signal handler
-    old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-    signal.alarm(seconds)
-
-    try:
-        yield
-    finally:
-        signal.alarm(0)
-        signal.signal(signal.SIGALRM, old_handler)
-
-
 class RobustLaTeXCompiler:
     """
     Production-grade LaTeX compiler with Overleaf-like robustness
@@ -172,8 +429,18 @@ class RobustLaTeXCompiler:
         },
     ]
 
-    def __init__(self, validate_before_compile: bool = True):
+    def __init__(
+        self,
+        validate_before_compile: bool = True,
+        cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+        max_cache_entries: int = DEFAULT_CACHE_ENTRIES,
+        parallel_strategies: int = 1
+    ):
         self.validate_before_compile = validate_before_compile
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_cache_entries = max_cache_entries
+        # Strategies raced at once; 1 keeps the strict one-at-a-time fallback
+        self.parallel_strategies = max(1, parallel_strategies)
 
     @staticmethod
     def detect_missing_packages(log_content: str) -> List[str]:
@@ -181,22 +448,18 @@ class RobustLaTeXCompiler:
         Detect missing packages from LaTeX error log
         Returns list of missing package names
         """
-        missing_packages = []
+        if HYPERSCAN_AVAILABLE:
+            log_bytes = log_content.encode('utf-8')
+            return _hs_missing_packages(log_bytes, _hs_scan(log_bytes))
 
-        # Common patterns for missing packages
-        patterns = [
-            r"! LaTeX Error: File `([^']+)\.sty' not found",
-            r"! LaTeX Error: File `([^']+)\.cls' not found",
-            r"Package (\w+) Error:",
-            r"! Package (\w+) not found",
-        ]
+        missing_packages = []
+        seen = set()
 
-        for pattern in patterns:
-            matches = re.finditer(pattern, log_content)
-            for match in matches:
-                pkg = match.group(1)
-                if pkg not in missing_packages:
-                    missing_packages.append(pkg)
+        for match in _MISSING_RE.finditer(log_content):
+            pkg = match.group(match.lastgroup)
+            if pkg not in seen:
+                seen.add(pkg)
+                missing_packages.append(pkg)
 
         return missing_packages
 
@@ -209,6 +472,12 @@ class RobustLaTeXCompiler:
         if not add_packages or '\\documentclass' not in latex_content:
             return latex_content
 
+        return RobustLaTeXCompiler._add_recommended_packages(latex_content)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=ENHANCE_CACHE_SIZE)
+    def _add_recommended_packages(latex_content: str) -> str:
+        """Insert missing recommended packages after \\documentclass"""
         # Packages to add if not present (Overleaf-like defaults)
         recommended_packages = [
             # Math and symbols
@@ -235,38 +504,38 @@ class RobustLaTeXCompiler:
             ('natbib', 'Natural science citations'),
         ]
 
-        # Check which packages are already included
-        packages_to_add = []
-        for package, description in recommended_packages:
-            if f'\\usepackage{{{package}}}' not in latex_content and \
-               f'\\usepackage[' not in latex_content or \
-               f'{package}' not in latex_content:
-                packages_to_add.append(package)
+        # Collect already-included packages in one scan (handles options and
+        # comma lists such as \usepackage[utf8]{inputenc,amsmath})
+        present = {
+            name.strip()
+            for match in _USEPACKAGE_RE.finditer(latex_content)
+            for name in match.group(1).split(',')
+        }
+        packages_to_add = [
+            package for package, description in recommended_packages
+            if package not in present
+        ]
 
         # Only add if there are packages to add
         if not packages_to_add:
             return latex_content
 
         # Find the documentclass line
-        doc_class_match = re.search(r'\\documentclass(\[.*?\])?\{.*?\}', latex_content)
+        doc_class_match = _DOCCLASS_RE.search(latex_content)
         if not doc_class_match:
             return latex_content
 
         # Insert packages after documentclass
         insert_pos = doc_class_match.end()
 
-        # Build package inclusion string
-        package_block = '\n% Auto-added packages for better compatibility\n'
+        # Build the package block and splice it in with a single join, so the
+        # document is copied once rather than once per concatenation
+        parts = [latex_content[:insert_pos], '\n% Auto-added packages for better compatibility\n']
         for pkg in packages_to_add[:5]:  # Limit to 5 most important
-            package_block += f'\\usepackage{{{pkg}}}\n'
+            parts.append(f'\\usepackage{{{pkg}}}\n')
+        parts.append(latex_content[insert_pos:])
 
-        enhanced_content = (
-            latex_content[:insert_pos] +
-            package_block +
-            latex_content[insert_pos:]
-        )
-
-        return enhanced_content
+        return ''.join(parts)
 
     def compile(
         self,
@@ -305,17 +574,37 @@ class RobustLaTeXCompiler:
         else:
             warnings = []
 
+        # Identical source already compiled: reuse the cached PDF
+        cache_key = self._cache_key(latex_content, strategy_name)
+        cached_pdf = self._load_cached_pdf(cache_key, output_dir, filename)
+        if cached_pdf:
+            return CompilationResult(
+                success=True,
+                pdf_path=cached_pdf,
+                warnings=warnings,
+                compilation_time=time.time() - start_time
+            )
+
         # Try compilation strategies
         strategies = self.STRATEGIES if not strategy_name else [
             s for s in self.STRATEGIES if s['name'] == strategy_name
         ]
 
-        for strategy in strategies:
-            result = self._try_strategy(latex_content, output_dir, filename, strategy)
+        if self.parallel_strategies > 1 and len(strategies) > 1:
+            result = self._race_strategies(latex_content, output_dir, filename, strategies)
             if result.success:
-                result.warnings.extend(warnings)
+                self._store_cached_pdf(cache_key, result.pdf_path)
+                result.add_warnings(warnings)
                 result.compilation_time = time.time() - start_time
                 return result
+        else:
+            for strategy in strategies:
+                result = self._try_strategy(latex_content, output_dir, filename, strategy)
+                if result.success:
+                    self._store_cached_pdf(cache_key, result.pdf_path)
+                    result.add_warnings(warnings)
+                    result.compilation_time = time.time() - start_time
+                    return result
 
         # All strategies failed
         return CompilationResult(
@@ -324,83 +613,159 @@ class RobustLaTeXCompiler:
             compilation_time=time.time() - start_time
         )
 
+    def compile_many(
+        self,
+        items: List[Tuple[str, Path, str]],
+        max_workers: Optional[int] = None
+    ) -> List[CompilationResult]:
+        """
+        Compile many documents across a process pool
+
+        Each worker process keeps its scratch directory (and the PDF cache)
+        between documents, so only the engine runs are paid per item.
+
+        Args:
+            items: (latex_content, output_dir, filename) per document
+            max_workers: Worker processes (default: CPU count)
+
+        Returns:
+            One CompilationResult per item, in the order given
+        """
+        if not items:
+            return []
+
+        workers = min(max_workers or os.cpu_count() or 1, len(items))
+        contents, output_dirs, filenames = zip(*items)
+        if workers == 1:
+            return list(map(self.compile, contents, output_dirs, filenames))
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_pool_worker) as executor:
+            return list(executor.map(self.compile, contents, output_dirs, filenames))
+
+    def _race_strategies(
+        self,
+        latex_content: str,
+        output_dir: Path,
+        filename: str,
+        strategies: List[Dict]
+    ) -> CompilationResult:
+        """
+        Run up to parallel_strategies strategies at once; the first PDF wins
+
+        Each strategy builds into its own staging directory so a slower
+        loser can never overwrite the winner's PDF in output_dir.
+
+        Returns:
+            The winning CompilationResult, or a failed one if none succeeded
+        """
+        won = threading.Event()
+        claim_lock = threading.Lock()
+
+        def run(strategy: Dict) -> Optional[CompilationResult]:
+            if won.is_set():
+                return None
+            with tempfile.TemporaryDirectory(dir=_scratch_root()) as stage:
+                result = self._try_strategy(
+                    latex_content, Path(stage), filename, strategy, cancel=won
+                )
+                if not result.success:
+                    return result
+                with claim_lock:
+                    if won.is_set():
+                        return None
+                    won.set()
+                    output_pdf = output_dir / f"{filename}.pdf"
+                    shutil.move(str(result.pdf_path), str(output_pdf))
+                    result.pdf_path = output_pdf
+                return result
+
+        executor = ThreadPoolExecutor(max_workers=self.parallel_strategies)
+        futures = [executor.submit(run, strategy) for strategy in strategies]
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                if result is not None and result.success:
+                    return result
+        finally:
+            # Queued strategies are dropped; running engines are killed
+            # through `won` and not waited for
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+        return CompilationResult(success=False)
+
     def _try_strategy(
         self,
         latex_content: str,
         output_dir: Path,
         filename: str,
-        strategy: Dict
+        strategy: Dict,
+        cancel: Optional[threading.Event] = None
     ) -> CompilationResult:
         """Try a specific compilation strategy"""
         try:
-            with tempfile.TemporaryDirectory() as td:
+            with tempfile.TemporaryDirectory(dir=_scratch_root()) as td:
                 temp_dir = Path(td)
                 tex_file = temp_dir / f"{filename}.tex"
 
                 # Write LaTeX file
                 tex_file.write_text(latex_content, encoding='utf-8')
 
-                # Compile with timeout
-                log_content = ""
+                # Compile, streaming output into a bounded tail shared by
+                # all passes
+                log_lines = deque(maxlen=LOG_TAIL_LINES)
+                cmd = [
+                    strategy['command'],
+                    *strategy['args'],
+                    f"{filename}.tex"
+                ]
                 for pass_num in range(strategy['passes']):
-                    try:
-                        with timeout(strategy['timeout']):
-                            cmd = [
-                                strategy['command'],
-                                *strategy['args'],
-                                f"{filename}.tex"
-                            ]
-
-                            result = subprocess.run(
-                                cmd,
-                                cwd=temp_dir,
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.STDOUT,
-                                text=True,
-                                timeout=strategy['timeout']
-                            )
-
-                            log_content += result.stdout
-
-                            # Check if PDF was created
-                            pdf_file = temp_dir / f"{filename}.pdf"
-                            if not pdf_file.exists():
-                                # Compilation failed, extract error
-                                error_msg = self._extract_error_from_log(log_content)
-                                return CompilationResult(
-                                    success=False,
-                                    error_message=f"Strategy '{strategy['name']}' failed: {error_msg}",
-                                    log_content=log_content
-                                )
-
-                    except subprocess.TimeoutExpired:
+                    finished = self._run_pass(
+                        cmd, temp_dir, strategy['timeout'], log_lines, cancel
+                    )
+                    if cancel is not None and cancel.is_set():
+                        return CompilationResult(
+                            success=False,
+                            error_message=f"Strategy '{strategy['name']}' cancelled"
+                        )
+
+                    if not finished:
                         return CompilationResult(
                             success=False,
                             error_message=f"Compilation timed out after {strategy['timeout']}s (possible infinite loop)",
-                            log_content=log_content
+                            log_content=_join_log(log_lines)
                         )
-                    except TimeoutError as e:
+
+                    # Check if PDF was created
+                    pdf_file = temp_dir / f"{filename}.pdf"
+                    if not pdf_file.exists():
+                        # Compilation failed; the error is extracted from the
+                        # log only if someone reads it
                         return CompilationResult(
                             success=False,
-                            error_message=str(e),
-                            log_content=log_content
+                            log_content=_join_log(log_lines),
+                            _log_parser=self,
+                            _error_prefix=f"Strategy '{strategy['name']}' failed: "
                         )
 
+                log_content = _join_log(log_lines)
+
                 # Success! Copy PDF to output directory
                 pdf_file = temp_dir / f"{filename}.pdf"
                 if pdf_file.exists():
                     output_pdf = output_dir / f"{filename}.pdf"
-                    import shutil
-                    shutil.copy2(pdf_file, output_pdf)
-
-                    # Extract warnings from log
-                    warnings = self._extract_warnings_from_log(log_content)
+                    try:
+                        os.replace(pdf_file, output_pdf)  # Rename on the same filesystem
+                    except OSError:
+                        shutil.copy2(pdf_file, output_pdf)
 
+                    # Warnings are extracted from the log on first access
                     return CompilationResult(
                         success=True,
                         pdf_path=output_pdf,
-                        warnings=warnings,
-                        log_content=log_content
+                        log_content=log_content,
+                        _log_parser=self
                     )
                 else:
                     return CompilationResult(
@@ -415,40 +780,148 @@ class RobustLaTeXCompiler:
                 error_message=f"Unexpected error in strategy '{strategy['name']}': {str(e)}"
             )
 
+    @staticmethod
+    def _run_pass(
+        cmd: List[str],
+        cwd: Path,
+        timeout_seconds: int,
+        log_lines: deque,
+        cancel: Optional[threading.Event] = None
+    ) -> bool:
+        """
+        Run one engine pass, appending its output lines to log_lines
+
+        The engine is killed as soon as cancel is set, so a strategy that
+        lost a race doesn't keep running to its timeout.
+
+        Returns:
+            False if the engine was killed for running past timeout_seconds
+        """
+        if cancel is not None and cancel.is_set():
+            return True
+
+        timed_out = threading.Event()
+        proc = subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=LOG_READ_SIZE
+        )
+
+        def kill():
+            timed_out.set()
+            proc.kill()
+
+        def kill_on_cancel():
+            while not cancel.wait(CANCEL_POLL_SECONDS):
+                if proc.poll() is not None:
+                    return
+            proc.kill()
+
+        timer = threading.Timer(timeout_seconds, kill)
+        timer.start()
+        if cancel is not None:
+            threading.Thread(target=kill_on_cancel, daemon=True).start()
+        try:
+            log_lines.extend(proc.stdout)
+            proc.wait()
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+
+        return not timed_out.is_set()
+
+    @staticmethod
+    def _cache_key(latex_content: str, strategy_name: Optional[str]) -> str:
+        """Hash the source together with the requested strategy"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update((strategy_name or 'auto').encode('utf-8') + b'\0')
+        digest.update(latex_content.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _load_cached_pdf(self, cache_key: str, output_dir: Path, filename: str) -> Optional[Path]:
+        """Copy a cached PDF to output_dir, or return None on a miss"""
+        if not self.cache_dir:
+            return None
+
+        cached = self.cache_dir / f"{cache_key}.pdf"
+        output_pdf = output_dir / f"{filename}.pdf"
+        try:
+            shutil.copyfile(cached, output_pdf)
+            os.utime(cached)  # Mark as recently used for eviction
+        except OSError:
+            return None
+        return output_pdf
+
+    def _store_cached_pdf(self, cache_key: str, pdf_path: Path) -> None:
+        """Save a compiled PDF and evict the least recently used entries"""
+        if not self.cache_dir:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = self.cache_dir / f".{cache_key}.{os.getpid()}.tmp"
+            shutil.copyfile(pdf_path, temp_path)
+            os.replace(temp_path, self.cache_dir / f"{cache_key}.pdf")
+
+            entries = [
+                entry for entry in os.scandir(self.cache_dir)
+                if entry.name.endswith('.pdf')
+            ]
+            if len(entries) > self.max_cache_entries:
+                entries.sort(key=lambda entry: entry.stat().st_mtime)
+                for entry in entries[:len(entries) - self.max_cache_entries]:
+                    os.remove(entry.path)
+        except OSError as e:
+            # The cache is an optimisation; never fail a compile over it
+            print(f"Warning: could not update LaTeX cache: {e}")
+
     def _extract_error_from_log(self, log_content: str) -> str:
         """Extract meaningful error message from LaTeX log"""
+        # With hyperscan, one scan serves both the package and error checks
+        if HYPERSCAN_AVAILABLE:
+            log_bytes = log_content.encode('utf-8')
+            starts = _hs_scan(log_bytes)
+            missing_packages = _hs_missing_packages(log_bytes, starts)
+        else:
+            missing_packages = self.detect_missing_packages(log_content)
+
         # Check for missing packages first
-        missing_packages = self.detect_missing_packages(log_content)
         if missing_packages:
             pkg_list = ", ".join(missing_packages[:3])
             return f"Missing LaTeX packages: {pkg_list}. Please install them or use a different compiler strategy."
 
-        # Look for common error patterns
-        error_patterns = [
-            (r'! LaTeX Error: (.+)', 'LaTeX Error: {}'),
-            (r'! (.+)', 'Error: {}'),
-            (r'ERROR: (.+)', 'Compilation Error: {}'),
-            (r'Fatal error: (.+)', 'Fatal Error: {}'),
-            (r'Runaway argument\?(.+)', 'Runaway Argument: {}'),
-            (r'Undefined control sequence(.+)', 'Undefined Command: {}'),
-            (r'Missing (.+)', 'Missing: {}'),
-        ]
-
-        for pattern, template in error_patterns:
-            match = re.search(pattern, log_content, re.MULTILINE)
-            if match:
-                error_text = match.group(1).strip()[:200]
-                return template.format(error_text)
-
-        # Look for "l.XXX" line numbers with context
-        line_match = re.search(r'l\.(\d+)\s+(.+)', log_content)
-        if line_match:
-            line_num = line_match.group(1)
-            context = line_match.group(2)[:100]
-            return f"Error at line {line_num}: {context}"
+        if HYPERSCAN_AVAILABLE:
+            best = _hs_first_error(log_bytes, starts)
+        else:
+            # Look for common error patterns in one pass, keeping the most
+            # specific kind found (a LaTeX Error cannot be beaten, so stop there)
+            best = None
+            best_rank = len(_ERROR_RANK)
+            for match in _ERROR_RE.finditer(log_content):
+                rank = _ERROR_RANK[match.lastgroup]
+                # A more specific error may start inside this match's span
+                for inner_rank in range(min(rank, best_rank)):
+                    inner = _ERROR_BRANCHES[inner_rank].search(
+                        log_content, match.start() + 1, match.end())
+                    if inner:
+                        match, rank = inner, inner_rank
+                        break
+                if rank < best_rank:
+                    best, best_rank = match, rank
+                    if rank == 0:
+                        break
+
+        if best is not None:
+            return _format_error(best)
 
         # Check for overfull/underfull boxes (warnings that stop compilation)
-        if 'Overfull' in log_content or 'Underfull' in log_content:
+        tail = log_content[-_BOX_WARNING_TAIL:]
+        if 'Overfull' in tail or 'Underfull' in tail:
             return "Formatting issues detected. The document may still be usable."
 
         return "Unknown compilation error. Try a different compiler strategy or check your LaTeX syntax."
@@ -456,22 +929,17 @@ class RobustLaTeXCompiler:
     def _extract_warnings_from_log(self, log_content: str) -> List[str]:
         """Extract warnings from LaTeX log"""
         warnings = []
+        seen = set()
 
-        # Common warning patterns
-        warning_patterns = [
-            r'Warning: (.+)',
-            r'LaTeX Warning: (.+)',
-            r'Package \w+ Warning: (.+)',
-        ]
-
-        for pattern in warning_patterns:
-            matches = re.finditer(pattern, log_content, re.MULTILINE)
-            for match in matches:
-                warning = match.group(1).strip()[:150]
-                if warning not in warnings:  # Avoid duplicates
-                    warnings.append(warning)
+        for match in _WARNING_RE.finditer(log_content):
+            warning = match.group(1).strip()[:150]
+            if warning not in seen:  # Avoid duplicates
+                seen.add(warning)
+                warnings.append(warning)
+                if len(warnings) == MAX_WARNINGS:
+                    break
 
-        return warnings[:10]  # Limit to 10 warnings
+        return warnings
 
 
 # Convenience function for easy usage
@@ -479,7 +947,8 @@ def compile_latex_robust(
     latex_content: str,
     output_dir: Path,
     filename: str = "output",
-    validate: bool = True
+    validate: bool = True,
+    parallel_strategies: int = 1
 ) -> CompilationResult:
     """
     Compile LaTeX with robust error handling
@@ -491,5 +960,8 @@ def compile_latex_robust(
         else:
             print(f"Error: {result.error_message}")
     """
-    compiler = RobustLaTeXCompiler(validate_before_compile=validate)
+    compiler = RobustLaTeXCompiler(
+        validate_before_compile=validate,
+        parallel_strategies=parallel_strategies
+    )
     return compiler.compile(latex_content, output_dir, filename)
@@ -5,33 +5,63 @@ CSV Data Validation Tool
 Validates CSV files against schemas and checks data integrity.
 
 Usage:
-    python3 validate_csv.py --data-dir web/data/
+    python3 validate_csv.py --data-dir web/data/ [--workers N] [--engine pyarrow]
+                            [--max-errors N]
 """
 
 import argparse
 import csv
+import heapq
+import io
+import mmap
+import os
 import sys
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from utils.csv_manager import SCHEMAS, CSVManager
+from utils.csv_manager import READ_BUFFER_SIZE, SCHEMAS, CSVManager
+
+# Optional columnar validation (--engine pyarrow)
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Files at least this large are split into byte ranges validated by
+# several workers (smaller files are one job each)
+CHUNK_MIN_BYTES = 32 * 1024 * 1024
+
+# Marks an attempt missing from student_sessions (its session_id may be None)
+_NO_SESSION = object()
 
 
 class ValidationReport:
     """Track validation results"""
 
-    def __init__(self):
+    def __init__(self, max_errors: Optional[int] = None):
+        # Errors are capped at max_errors (None = unbounded) by add_error,
+        # so a badly corrupt file can't grow the report without limit
+        self.max_errors = max_errors
         self.errors = []
         self.warnings = []
         self.info = []
         self.file_stats = {}
 
     def add_error(self, message: str):
-        self.errors.append(f"ERROR: {message}")
+        # Past the limit new errors are dropped, keeping the earliest ones
+        if not self.error_limit_reached():
+            self.errors.append(f"ERROR: {message}")
 
     def add_warning(self, message: str):
         self.warnings.append(f"WARNING: {message}")
@@ -95,17 +125,453 @@ class ValidationReport:
     def has_errors(self) -> bool:
         return len(self.errors) > 0
 
+    def error_limit_reached(self) -> bool:
+        return self.max_errors is not None and len(self.errors) >= self.max_errors
+
+
+def _validate_file(schema_name: str, file_path: Path, file_size: int,
+                   fk_cols: List[str], max_errors: Optional[int] = None):
+    """
+    Validate one CSV file against its schema.
+
+    Module-level so validate_all can run it in worker processes.
+
+    Args:
+        schema_name: Name of the schema (e.g., 'sessions', 'answers')
+        file_path: CSV file holding the schema's rows
+        file_size: Size of file_path in bytes (already stat'ed by the caller)
+        fk_cols: Columns whose values the foreign key check needs
+        max_errors: Stop reading the file after this many errors
+
+    Returns:
+        (report, pk_set, fk_values): messages and stats for this file, its
+        primary keys (None if the file could not be validated completely)
+        and the values of each fk_cols column in row order
+    """
+    schema = SCHEMAS[schema_name]
+    report = ValidationReport(max_errors)
+    errors = report.errors
+    limit = float("inf") if max_errors is None else max_errors
+    stopped = False
+
+    # Read and validate rows
+    try:
+        pk_set = set()
+        row_num = 0
+
+        with open(file_path, 'r', newline='', encoding='utf-8',
+                  buffering=READ_BUFFER_SIZE) as f:
+            # Plain csv.reader: rows stay lists and are checked by
+            # position, no per-row dict keyed by every column name
+            reader = csv.reader(f)
+
+            # Check headers
+            header = next(reader, None)
+            if header != schema.columns:
+                report.add_error(
+                    f"{schema_name}: Column mismatch. "
+                    f"Expected {schema.columns}, got {header}"
+                )
+                return report, None, {}
+
+            columns = schema.columns
+            n_columns = len(columns)
+            pk_index = columns.index(schema.primary_key)
+            pk_add = pk_set.add
+            pk_len = pk_set.__len__
+
+            fk_values = {col: [] for col in fk_cols if col in columns}
+            fk_columns = [
+                (columns.index(col), values) for col, values in fk_values.items()
+            ]
+
+            # Hot-loop lookups bound once
+            validate_values = schema._validate_compiled
+            add_error = report.add_error
+
+            # Validate each row
+            for row in reader:
+                if not row:
+                    # Blank line (DictReader skipped these too)
+                    continue
+                row_num += 1
+
+                if len(row) == n_columns:
+                    is_valid, error_msg = validate_values(row)
+                    pk_value = row[pk_index]
+                else:
+                    record = _ragged_record(columns, row)
+                    is_valid, error_msg = schema.validate_row(record)
+                    pk_value = record.get(schema.primary_key)
+
+                if not is_valid:
+                    add_error(
+                        f"{schema_name} row {row_num}: {error_msg}"
+                    )
+                    if len(errors) >= limit:
+                        stopped = True
+                        break
+
+                # Check primary key uniqueness
+                # (one hash per row: a duplicate leaves the size unchanged)
+                if pk_value:
+                    seen = pk_len()
+                    pk_add(pk_value)
+                    if pk_len() == seen:
+                        add_error(
+                            f"{schema_name} row {row_num}: Duplicate primary key: {pk_value}"
+                        )
+                        if len(errors) >= limit:
+                            stopped = True
+                            break
+
+                for i, values in fk_columns:
+                    values.append(row[i] if i < len(row) else "")
+
+        # Add stats
+        report.add_file_stats(file_path.name, row_num, file_size)
+
+        if stopped:
+            # Partial keys would show up as foreign key violations
+            report.add_warning(
+                f"{schema_name}: Stopped at row {row_num} after {max_errors} errors"
+            )
+            return report, None, {}
+
+        # Info message
+        report.add_info(f"{schema_name}: Validated {row_num} rows")
+
+    except Exception as e:
+        report.add_error(f"{schema_name}: Failed to read file: {e}")
+        return report, None, {}
+
+    return report, pk_set, fk_values
+
+
+def _validate_file_arrow(schema_name: str, file_path: Path, file_size: int,
+                         fk_cols: List[str], max_errors: Optional[int] = None):
+    """
+    Columnar version of _validate_file using Arrow's C++ CSV parser.
+
+    Required-column, enum and primary-key checks run as Arrow compute
+    kernels over whole columns; other validators are called per value.
+    Files Arrow can't parse as a table (ragged rows, empty file) go
+    through _validate_file so the report is the same either way.
+    """
+    schema = SCHEMAS[schema_name]
+    columns = schema.columns
+
+    try:
+        table = pa_csv.read_csv(
+            file_path,
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={col: pa.string() for col in columns},
+                strings_can_be_null=False,
+            ),
+        )
+    except (pa.ArrowInvalid, UnicodeDecodeError):
+        return _validate_file(schema_name, file_path, file_size, fk_cols, max_errors)
+
+    if table.column_names != columns:
+        return _validate_file(schema_name, file_path, file_size, fk_cols, max_errors)
+
+    report = ValidationReport(max_errors)
+    n_rows = table.num_rows
+
+    # First failing check per row, in validate_row's order
+    row_errors: Dict[int, str] = {}
+    failed = pa.array([False] * n_rows, pa.bool_())
+    for col in schema.required_columns:
+        if col in schema._columns_set:
+            bad = pc.equal(table.column(col), "")
+        else:
+            bad = pa.array([True] * n_rows, pa.bool_())
+        new = pc.and_(bad, pc.invert(failed))
+        for i in pc.indices_nonzero(new).to_pylist():
+            row_errors[i] = f"Missing required column: {col}"
+        failed = pc.or_(failed, bad)
+
+    for col, validator in schema._compiled_validators:
+        if col not in schema._columns_set:
+            continue
+        values = table.column(col)
+        allowed = getattr(validator, "__self__", None)
+        if isinstance(allowed, frozenset):
+            bad = pc.invert(pc.is_in(values, value_set=pa.array(sorted(allowed), pa.string())))
+            new = pc.and_(bad, pc.invert(failed))
+            for i in pc.indices_nonzero(new).to_pylist():
+                row_errors[i] = f"Validation failed for {col}: {values[i].as_py()}"
+            failed = pc.or_(failed, bad)
+        else:
+            pending = pc.indices_nonzero(pc.invert(failed)).to_pylist()
+            for i in pending:
+                value = values[i].as_py()
+                try:
+                    if not validator(value):
+                        row_errors[i] = f"Validation failed for {col}: {value}"
+                except Exception as e:
+                    row_errors[i] = f"Validator error for {col}: {str(e)}"
+            if row_errors:
+                failed = pa.array([i in row_errors for i in range(n_rows)], pa.bool_())
+
+    # Primary keys: only walk them in Python when a duplicate exists
+    pk_values = table.column(schema.primary_key)
+    present = pc.filter(pk_values, pc.not_equal(pk_values, ""))
+    pk_set = set(present.to_pylist())
+    duplicates = []
+    if len(pk_set) != len(present):
+        seen = set()
+        for i, pk_value in enumerate(pk_values.to_pylist()):
+            if pk_value:
+                if pk_value in seen:
+                    duplicates.append((i, f"Duplicate primary key: {pk_value}"))
+                seen.add(pk_value)
+
+    # Report in row order, schema errors first within a row
+    for i, message in heapq.merge(sorted(row_errors.items()), duplicates, key=itemgetter(0)):
+        report.add_error(f"{schema_name} row {i + 1}: {message}")
+        if report.error_limit_reached():
+            report.add_file_stats(file_path.name, i + 1, file_size)
+            report.add_warning(
+                f"{schema_name}: Stopped at row {i + 1} after {max_errors} errors"
+            )
+            return report, None, {}
+
+    fk_values = {col: table.column(col).to_pylist() for col in fk_cols if col in columns}
+
+    report.add_file_stats(file_path.name, n_rows, file_size)
+    report.add_info(f"{schema_name}: Validated {n_rows} rows")
+    return report, pk_set, fk_values
+
+
+def _safe_int(value: Optional[str], default: int) -> int:
+    """int(value), or default when the value is missing or empty"""
+    return int(value) if value else default
+
+
+def _ragged_record(columns: List[str], row: List[str]) -> dict:
+    """
+    Dict for a row whose length doesn't match the header, built the way
+    csv.DictReader would (missing values None, extras listed under None)
+    """
+    record = dict(zip(columns, row))
+    if len(row) < len(columns):
+        for col in columns[len(row):]:
+            record[col] = None
+    else:
+        record[None] = row[len(columns):]
+    return record
+
+
+def _count_quotes(mm: mmap.mmap, start: int, end: int, block: int = 1 << 20) -> int:
+    """Number of '"' bytes in mm[start:end], read a block at a time"""
+    count = 0
+    for pos in range(start, end, block):
+        count += mm[pos:min(pos + block, end)].count(b'"')
+    return count
+
+
+def _split_ranges(file_path: Path, columns: List[str], n: int) -> Optional[List[int]]:
+    """
+    Split a CSV file into about n byte ranges that each start on a row.
+
+    A newline only ends a row when an even number of quote characters
+    precedes it (quoted fields may span lines), so candidate boundaries
+    are moved forward until the quote count is even.
+
+    Returns:
+        Boundaries [header_end, ..., file_size], or None if the header
+        doesn't match columns (the caller validates the file whole)
+    """
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+
+        def row_end(pos: int, odd: bool) -> int:
+            """Offset just past the first row-ending newline at or after pos"""
+            while True:
+                nl = mm.find(b'\n', pos)
+                if nl == -1:
+                    return size
+                odd ^= _count_quotes(mm, pos, nl) & 1
+                pos = nl + 1
+                if not odd:
+                    return pos
+
+        header_end = row_end(0, False)
+        header = next(csv.reader(io.StringIO(mm[:header_end].decode('utf-8'), newline='')), None)
+        if header != columns:
+            return None
+
+        bounds = [header_end]
+        pos, odd = header_end, False
+        for i in range(1, n):
+            target = header_end + (size - header_end) * i // n
+            if target <= pos:
+                continue
+            odd ^= _count_quotes(mm, pos, target) & 1
+            pos = row_end(target, bool(odd))
+            odd = False
+            if pos >= size:
+                break
+            bounds.append(pos)
+        bounds.append(size)
+        return bounds
+
+
+def _validate_range(schema_name: str, file_path: Path, start: int, end: int,
+                    fk_cols: List[str], max_errors: Optional[int] = None):
+    """
+    Validate the rows in bytes [start, end) of a CSV file.
+
+    Primary keys are returned rather than checked, since duplicates can
+    span ranges; _merge_ranges does the uniqueness check. At most
+    max_errors schema errors are kept.
+
+    Returns:
+        (row_count, errors, pk_rows, fk_values) with row numbers local to
+        the range: errors as (row, message), pk_rows as (row, pk)
+    """
+    schema = SCHEMAS[schema_name]
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode('utf-8')
+    reader = csv.reader(io.StringIO(text, newline=''))
+
+    columns = schema.columns
+    n_columns = len(columns)
+    pk_index = columns.index(schema.primary_key)
+    fk_values = {col: [] for col in fk_cols if col in columns}
+    fk_columns = [(columns.index(col), values) for col, values in fk_values.items()]
+
+    errors = []
+    pk_rows = []
+    validate_values = schema._validate_compiled
+    add_error = errors.append
+    add_pk = pk_rows.append
+    limit = float("inf") if max_errors is None else max_errors
+    row_num = 0
+    for row in reader:
+        if not row:
+            continue
+        row_num += 1
+
+        if len(row) == n_columns:
+            is_valid, error_msg = validate_values(row)
+            pk_value = row[pk_index]
+        else:
+            record = _ragged_record(columns, row)
+            is_valid, error_msg = schema.validate_row(record)
+            pk_value = record.get(schema.primary_key)
+
+        if not is_valid and len(errors) < limit:
+            add_error((row_num, error_msg))
+        if pk_value:
+            add_pk((row_num, pk_value))
+
+        for i, values in fk_columns:
+            values.append(row[i] if i < len(row) else "")
+
+    return row_num, errors, pk_rows, fk_values
+
+
+def _merge_ranges(schema_name: str, file_path: Path, file_size: int, futures: list,
+                  max_errors: Optional[int] = None):
+    """Combine _validate_range results into a _validate_file style result"""
+    report = ValidationReport(max_errors)
+    pk_set = set()
+    pk_add = pk_set.add
+    pk_len = pk_set.__len__
+    fk_values: Dict[str, List[str]] = {}
+    offset = 0
+
+    try:
+        for future in futures:
+            row_count, errors, pk_rows, chunk_fk_values = future.result()
+
+            duplicates = []
+            for row, pk_value in pk_rows:
+                seen = pk_len()
+                pk_add(pk_value)
+                if pk_len() == seen:
+                    duplicates.append((row, f"Duplicate primary key: {pk_value}"))
+
+            # Report in row order, schema errors first within a row
+            for row, message in heapq.merge(errors, duplicates, key=itemgetter(0)):
+                report.add_error(f"{schema_name} row {offset + row}: {message}")
+                if report.error_limit_reached():
+                    report.add_file_stats(file_path.name, offset + row, file_size)
+                    report.add_warning(
+                        f"{schema_name}: Stopped at row {offset + row} after {max_errors} errors"
+                    )
+                    return report, None, {}
+
+            for col, values in chunk_fk_values.items():
+                fk_values.setdefault(col, []).extend(values)
+            offset += row_count
+
+    except Exception as e:
+        report.add_error(f"{schema_name}: Failed to read file: {e}")
+        return report, None, {}
+
+    report.add_file_stats(file_path.name, offset, file_size)
+    report.add_info(f"{schema_name}: Validated {offset} rows")
+    return report, pk_set, fk_values
+
 
 class CSVValidator:
     """Validates CSV files against schemas and checks referential integrity"""
 
-    def __init__(self, data_dir: Path):
+    # Define relationships: (child_table, child_column) -> (parent_table, parent_column)
+    RELATIONSHIPS = [
+        ("answer_keys", "session_id", "sessions", "session_id"),
+        ("student_sessions", "student_id", "students", "student_id"),
+        ("student_sessions", "session_id", "sessions", "session_id"),
+        ("answers", "attempt_id", "student_sessions", "attempt_id"),
+        ("submissions", "attempt_id", "student_sessions", "attempt_id"),
+    ]
+
+    # Columns validate_data_consistency needs: (table, column)
+    CONSISTENCY_COLUMNS = [
+        ("student_sessions", "attempt_id"),
+        ("student_sessions", "session_id"),
+    ]
+
+    def __init__(self, data_dir: Path, workers: int = None, engine: str = "csv",
+                 max_errors: Optional[int] = None):
         self.data_dir = Path(data_dir)
-        self.report = ValidationReport()
+        # Stop once this many errors are reported (None = check everything)
+        if max_errors is not None and max_errors < 1:
+            raise ValueError(f"max_errors must be at least 1, got {max_errors}")
+        self.max_errors = max_errors
+        # Files are validated in this many processes (1 = in-process)
+        self.workers = workers or os.cpu_count() or 1
+
+        # "csv" parses rows with the csv module, "pyarrow" validates whole
+        # columns (falls back to "csv" when pyarrow isn't installed)
+        if engine not in ("csv", "pyarrow"):
+            raise ValueError(f"Unknown engine: {engine}")
+        if engine == "pyarrow" and not PYARROW_AVAILABLE:
+            print("Warning: pyarrow not installed, using the csv engine")
+            engine = "csv"
+        self.engine = engine
+        self._validate_one = _validate_file_arrow if engine == "pyarrow" else _validate_file
+        self.report = ValidationReport(max_errors)
         self.csv_manager = CSVManager(data_dir)
 
         # Cache for foreign key lookups
-        self.pk_cache: Dict[str, Set[str]] = {}
+        self.pk_cache: Dict[str, FrozenSet[str]] = {}
+
+        # Child-side FK values (and the columns the consistency check
+        # uses) gathered while validating each file, so the later stages
+        # don't parse those tables a second time
+        self.fk_cols_by_table: Dict[str, List[str]] = defaultdict(list)
+        needed = [(child_table, child_col) for child_table, child_col, _, _ in self.RELATIONSHIPS]
+        for table, col in needed + self.CONSISTENCY_COLUMNS:
+            if col not in self.fk_cols_by_table[table]:
+                self.fk_cols_by_table[table].append(col)
+        self.fk_cache: Dict[Tuple[str, str], List[str]] = {}
+        # Schemas with a file that couldn't be validated completely
+        self._incomplete: Set[str] = set()
 
     def validate_schema_version(self):
         """Check schema version file"""
@@ -132,109 +598,147 @@ class CSVValidator:
             "backups"
         ]
 
+        # One directory listing instead of a stat per required directory
+        try:
+            with os.scandir(self.data_dir) as entries:
+                existing = {entry.name for entry in entries if entry.is_dir()}
+        except FileNotFoundError:
+            existing = set()
+
         for dir_name in required_dirs:
-            dir_path = self.data_dir / dir_name
-            if not dir_path.exists():
+            if dir_name not in existing:
                 self.report.add_error(f"Required directory missing: {dir_name}/")
             else:
                 self.report.add_info(f"Directory exists: {dir_name}/")
 
     def validate_csv_file(self, schema_name: str):
-        """Validate a single CSV file"""
+        """Validate every file holding a schema's rows"""
+        for job in self._file_jobs(schema_name):
+            self._merge_file_result(schema_name, self._validate_one(*job))
+
+    def _file_jobs(self, schema_name: str):
+        """Arguments for _validate_file, one tuple per file holding the schema's rows"""
         schema = SCHEMAS.get(schema_name)
         if not schema:
             self.report.add_error(f"Unknown schema: {schema_name}")
-            return
-
-        file_path = self.csv_manager._get_file_path(schema_name)
+            return []
+
+        # Forget results from an earlier run for this schema
+        self.pk_cache.pop(schema_name, None)
+        self._incomplete.discard(schema_name)
+        for col in self.fk_cols_by_table.get(schema_name, ()):
+            self.fk_cache.pop((schema_name, col), None)
+
+        # The same files CSVManager.read goes through (every audit shard),
+        # without creating missing ones
+        paths = self.csv_manager._get_read_paths(schema_name, schema, create=False)
+        if not paths:
+            self.report.add_warning(f"No files for {schema_name} (this is OK if no data yet)")
+            return []
+
+        # Pending delta entries change what CSVManager.read returns, so only
+        # cache FK values when the files are all there is
+        if any(self.csv_manager._delta_path(path).exists() for path in paths):
+            fk_cols = []
+        else:
+            fk_cols = self.fk_cols_by_table.get(schema_name, [])
+
+        jobs = []
+        for file_path in paths:
+            # One stat both checks the file exists and gives its size
+            try:
+                file_size = os.stat(file_path).st_size
+            except FileNotFoundError:
+                self.report.add_warning(f"File does not exist: {file_path.name} (this is OK if no data yet)")
+                continue
 
-        if not file_path.exists():
-            self.report.add_warning(f"File does not exist: {file_path.name} (this is OK if no data yet)")
+            jobs.append((schema_name, file_path, file_size, fk_cols, self.max_errors))
+        return jobs
+
+    def _merge_file_result(self, schema_name: str, result):
+        """Fold one _validate_file result into the report and caches"""
+        report, pk_set, fk_values = result
+        # Keep the earliest errors once the limit is hit
+        room = None
+        if self.max_errors is not None:
+            room = max(self.max_errors - len(self.report.errors), 0)
+        self.report.errors.extend(islice(report.errors, room))
+        self.report.warnings.extend(report.warnings)
+        self.report.info.extend(report.info)
+        self.report.file_stats.update(report.file_stats)
+
+        if schema_name in self._incomplete:
+            return
+        if pk_set is None:
+            # One unreadable file (e.g. an audit shard) leaves the schema's
+            # keys incomplete, which would show up as FK violations
+            self._incomplete.add(schema_name)
+            self.pk_cache.pop(schema_name, None)
+            for col in self.fk_cols_by_table.get(schema_name, ()):
+                self.fk_cache.pop((schema_name, col), None)
             return
 
-        # Check file size
-        file_size = file_path.stat().st_size
-
-        # Read and validate rows
-        try:
-            rows = []
-            pk_set = set()
-            row_num = 0
-
-            with open(file_path, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-
-                # Check headers
-                if reader.fieldnames != schema.columns:
-                    self.report.add_error(
-                        f"{schema_name}: Column mismatch. "
-                        f"Expected {schema.columns}, got {reader.fieldnames}"
-                    )
-                    return
-
-                # Validate each row
-                for row in reader:
-                    row_num += 1
-                    rows.append(row)
-
-                    # Validate row against schema
-                    is_valid, error_msg = schema.validate_row(row)
-                    if not is_valid:
-                        self.report.add_error(
-                            f"{schema_name} row {row_num}: {error_msg}"
-                        )
-
-                    # Check primary key uniqueness
-                    pk_value = row.get(schema.primary_key)
-                    if pk_value:
-                        if pk_value in pk_set:
-                            self.report.add_error(
-                                f"{schema_name} row {row_num}: Duplicate primary key: {pk_value}"
-                            )
-                        pk_set.add(pk_value)
-
-            # Cache primary keys for foreign key validation
-            self.pk_cache[schema_name] = pk_set
-
-            # Add stats
-            self.report.add_file_stats(file_path.name, len(rows), file_size)
-
-            # Info message
-            self.report.add_info(f"{schema_name}: Validated {len(rows)} rows")
+        previous = self.pk_cache.get(schema_name)
+        if previous is None:
+            # Cache primary keys for foreign key validation (read-only from
+            # here on; a frozenset copy is sized exactly to its contents)
+            self.pk_cache[schema_name] = frozenset(pk_set)
+        else:
+            # Another shard of the same schema: keys must be unique across files
+            for pk_value in sorted(previous & pk_set):
+                self.report.add_error(
+                    f"{schema_name}: Duplicate primary key across files: {pk_value}"
+                )
+            self.pk_cache[schema_name] = previous | pk_set
 
-        except Exception as e:
-            self.report.add_error(f"{schema_name}: Failed to read file: {e}")
+        for col, values in fk_values.items():
+            self.fk_cache.setdefault((schema_name, col), []).extend(values)
 
     def validate_foreign_keys(self):
         """Validate foreign key relationships"""
-        # Define relationships: (child_table, child_column) -> (parent_table, parent_column)
-        relationships = [
-            ("answer_keys", "session_id", "sessions", "session_id"),
-            ("student_sessions", "student_id", "students", "student_id"),
-            ("student_sessions", "session_id", "sessions", "session_id"),
-            ("answers", "attempt_id", "student_sessions", "attempt_id"),
-            ("submissions", "attempt_id", "student_sessions", "attempt_id"),
-        ]
-
-        for child_table, child_col, parent_table, parent_col in relationships:
+        padded_keys: Dict[str, Set[str]] = {}
+        read_values: Dict[Tuple[str, str], List[str]] = {}
+        for child_table, child_col, parent_table, parent_col in self.RELATIONSHIPS:
             # Skip if either table not cached
             if child_table not in self.pk_cache or parent_table not in self.pk_cache:
                 continue
 
-            # Get all values from child table
-            child_rows = self.csv_manager.read(child_table)
+            # Get all values from child table (collected by validate_csv_file
+            # when possible). Otherwise one read of the child table serves
+            # all of its relationships
+            child_values = self.fk_cache.get((child_table, child_col))
+            if child_values is None:
+                if (child_table, child_col) not in read_values:
+                    cols = self.fk_cols_by_table[child_table]
+                    lists = [read_values.setdefault((child_table, col), []) for col in cols]
+                    for row in self.csv_manager.read_iter(child_table):
+                        for col, values in zip(cols, lists):
+                            values.append(row.get(col, ""))
+                child_values = read_values[(child_table, child_col)]
             parent_keys = self.pk_cache[parent_table]
 
-            orphaned_count = 0
-            for row in child_rows:
-                fk_value = row.get(child_col, "").strip()
-                if fk_value and fk_value not in parent_keys:
-                    orphaned_count += 1
-                    if orphaned_count <= 5:  # Show first 5
-                        self.report.add_error(
-                            f"Foreign key violation: {child_table}.{child_col}={fk_value} "
-                            f"references non-existent {parent_table}.{parent_col}"
-                        )
+            # Distinct values not among the parent keys (set difference runs
+            # in C). Values are compared stripped, so a value matching a
+            # whitespace-padded parent key is rechecked as well
+            padded = padded_keys.get(parent_table)
+            if padded is None:
+                padded = padded_keys[parent_table] = {
+                    key for key in parent_keys if key != key.strip()
+                }
+            distinct = set(child_values)
+            orphans = {
+                value for value in (distinct - parent_keys) | (distinct & padded)
+                if value.strip() and value.strip() not in parent_keys
+            }
+
+            # Rows are only revisited when something is orphaned
+            is_orphan = orphans.__contains__
+            orphaned_count = sum(map(is_orphan, child_values)) if orphans else 0
+            for value in islice(filter(is_orphan, child_values), 5):  # Show first 5
+                self.report.add_error(
+                    f"Foreign key violation: {child_table}.{child_col}={value.strip()} "
+                    f"references non-existent {parent_table}.{parent_col}"
+                )
 
             if orphaned_count > 0:
                 self.report.add_error(
@@ -248,17 +752,23 @@ class CSVValidator:
     def validate_data_consistency(self):
         """Check for data consistency issues"""
         # Check 1: Answer keys should match session question count
-        sessions = self.csv_manager.read("sessions")
+        # One scan of answer_keys feeds both checks: key counts per session
+        # here and the valid question indices for check 2
+        keys_per_session = Counter()
+        answer_keys_by_session = defaultdict(set)
+        for key in self.csv_manager.read_iter("answer_keys"):
+            get = key.get
+            session_id = get("session_id")
+            question_index = _safe_int(get("question_index"), -1)
+            answer_keys_by_session[session_id].add(question_index)
+            keys_per_session[session_id] += 1
+
+        sessions = self.csv_manager.read_iter("sessions")
         for session in sessions:
             session_id = session.get("session_id")
-            expected_count = int(session.get("question_count", 0))
-
-            answer_keys = self.csv_manager.read(
-                "answer_keys",
-                filter_fn=lambda r: r.get("session_id") == session_id
-            )
+            expected_count = _safe_int(session.get("question_count"), 0)
 
-            actual_count = len(answer_keys)
+            actual_count = keys_per_session[session_id]
 
             if actual_count != expected_count:
                 self.report.add_warning(
@@ -267,26 +777,37 @@ class CSVValidator:
                 )
 
         # Check 2: Answers should reference valid question indices
-        answer_keys_by_session = defaultdict(set)
-        for key in self.csv_manager.read("answer_keys"):
-            session_id = key.get("session_id")
-            question_index = int(key.get("question_index", -1))
-            answer_keys_by_session[session_id].add(question_index)
+        # Map each attempt to its session once, not a lookup per answer
+        # (from the columns validate_csv_file kept, when it could). The
+        # first row of a duplicated attempt_id wins, as in read_by_id
+        attempt_ids = self.fk_cache.get(("student_sessions", "attempt_id"))
+        session_ids = self.fk_cache.get(("student_sessions", "session_id"))
+        if attempt_ids is not None and session_ids is not None:
+            attempt_to_session = dict(zip(reversed(attempt_ids), reversed(session_ids)))
+        else:
+            attempt_to_session = {}
+            for attempt in self.csv_manager.read_iter("student_sessions"):
+                attempt_to_session.setdefault(attempt.get("attempt_id"), attempt.get("session_id"))
 
-        answers = self.csv_manager.read("answers")
+        answers = self.csv_manager.read_iter("answers")
         invalid_answer_count = 0
 
+        # Hot-loop lookups bound once
+        session_of = attempt_to_session.get
+        indices_of = answer_keys_by_session.get
+        no_indices = frozenset()
+
         for answer in answers:
-            attempt_id = answer.get("attempt_id")
-            question_index = int(answer.get("question_index", -1))
+            get = answer.get
+            attempt_id = get("attempt_id")
+            question_index = _safe_int(get("question_index"), -1)
 
             # Find session for this attempt
-            attempt = self.csv_manager.read_by_id("student_sessions", attempt_id)
-            if not attempt:
+            session_id = session_of(attempt_id, _NO_SESSION)
+            if session_id is _NO_SESSION:
                 continue
 
-            session_id = attempt.get("session_id")
-            valid_indices = answer_keys_by_session.get(session_id, set())
+            valid_indices = indices_of(session_id, no_indices)
 
             if question_index not in valid_indices:
                 invalid_answer_count += 1
@@ -311,15 +832,49 @@ class CSVValidator:
         # Step 2: Check file structure
         self.validate_file_structure()
 
-        # Step 3: Validate each CSV file
-        for schema_name in SCHEMAS.keys():
-            self.validate_csv_file(schema_name)
+        # Step 3: Validate each CSV file. Files are independent, so they
+        # are checked in parallel and merged back in schema order; large
+        # files are further split into byte ranges across the workers (the
+        # csv engine only; Arrow already parses one file on several threads)
+        jobs = [job for schema_name in SCHEMAS for job in self._file_jobs(schema_name)]
+        if self.workers > 1 and jobs:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                results = []
+                for schema_name, file_path, file_size, fk_cols, max_errors in jobs:
+                    bounds = None
+                    if self.engine == "csv" and file_size >= CHUNK_MIN_BYTES:
+                        bounds = _split_ranges(file_path, SCHEMAS[schema_name].columns,
+                                               self.workers)
+                    if bounds:
+                        futures = [
+                            executor.submit(_validate_range, schema_name, file_path,
+                                            start, end, fk_cols, max_errors)
+                            for start, end in zip(bounds, bounds[1:])
+                        ]
+                        results.append(partial(_merge_ranges, schema_name, file_path,
+                                               file_size, futures, max_errors))
+                    else:
+                        results.append(executor.submit(
+                            self._validate_one, schema_name, file_path, file_size,
+                            fk_cols, max_errors
+                        ).result)
+                for job, get_result in zip(jobs, results):
+                    self._merge_file_result(job[0], get_result())
+        else:
+            for job in jobs:
+                self._merge_file_result(job[0], self._validate_one(*job))
 
-        # Step 4: Validate foreign keys
-        self.validate_foreign_keys()
+        if self.report.error_limit_reached():
+            self.report.add_warning(
+                f"Error limit ({self.max_errors}) reached, skipped foreign key "
+                f"and consistency checks"
+            )
+        else:
+            # Step 4: Validate foreign keys
+            self.validate_foreign_keys()
 
-        # Step 5: Validate data consistency
-        self.validate_data_consistency()
+            # Step 5: Validate data consistency
+            self.validate_data_consistency()
 
         # Print report
         self.report.print_report()
@@ -327,6 +882,14 @@ class CSVValidator:
         return not self.report.has_errors()
 
 
+def _positive_int(value: str) -> int:
+    """argparse type for options that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Validate CSV data structure and integrity"
@@ -338,9 +901,31 @@ def main():
         help="Data directory to validate (e.g., web/data/)"
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes used to validate files (default: CPU count, 1 = no pool)"
+    )
+
+    parser.add_argument(
+        "--engine",
+        choices=["csv", "pyarrow"],
+        default="csv",
+        help="Row parser: csv module (default) or pyarrow columnar validation"
+    )
+
+    parser.add_argument(
+        "--max-errors",
+        type=_positive_int,
+        default=None,
+        help="Stop after this many errors (default: report all)"
+    )
+
     args = parser.parse_args()
 
-    validator = CSVValidator(Path(args.data_dir))
+    validator = CSVValidator(Path(args.data_dir), workers=args.workers, engine=args.engine,
+                             max_errors=args.max_errors)
     success = validator.validate_all()
 
     sys.exit(0 if success else 1)